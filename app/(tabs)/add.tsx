@@ -3,23 +3,24 @@ import { router, useFocusEffect } from "expo-router";
 import { useCallback } from "react";
 import { View, ActivityIndicator } from "react-native";
 import { SafeAreaView } from "react-native-safe-area-context";
-import { useAnalysis } from "../../context/AnalysisContext";
+import { analysisActions, analysisStore } from "../../context/AnalysisContext";
 
 export default function AddScreen() {
-  const { state, setCurrentRiskIndex } = useAnalysis();
+  const { setCurrentRiskIndex } = analysisActions;
   
   // Utiliser useFocusEffect pour rediriger à chaque fois que le tab est sélectionné
   useFocusEffect(
     useCallback(() => {
-      // Si un projet est en cours, ajouter un risque
+      // Si un projet est en cours, ajouter un risque (état lu au focus, sans abonnement)
+      const state = analysisStore.getState();
       if (state.analysisTitle) {
-        setCurrentRiskIndex(state.risks.length);
+        setCurrentRiskIndex(state.riskIds.length);
         router.push("/risk");
       } else {
         // Sinon, créer un nouveau projet
         router.push("/start");
       }
-    }, [state.analysisTitle, state.risks.length])
+    }, [])
   );
 
   // Afficher un loader pendant la redirection
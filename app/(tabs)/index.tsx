@@ -6,7 +6,6 @@ import { LinearGradient } from "expo-linear-gradient";
 import { useAuthGuard } from "../../lib/guard";
 import { getProfile, listUserAnalyses } from "../../lib/api";
 import type { UserAnalysis, QuestionnaireAnalyzeResponse } from "../../lib/types";
-import { emit, on, last } from "../../lib/events";
 import { router } from "expo-router";
 import { useFocusEffect } from "@react-navigation/native";
 import DashboardScreen from "../dashboard";
@@ -3,6 +3,7 @@ import { View, Text, ActivityIndicator, Pressable, Image, ScrollView, Platform }
 import { router } from "expo-router";
 import { getProfile, type ProfileResponse } from "../../lib/api";
 import { signOut } from "../../lib/auth_client";
+import { confirmDiscardPending } from "../../components/SyncNotice";
 import { SafeAreaView } from "react-native-safe-area-context";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import { LinearGradient } from "expo-linear-gradient";
@@ -32,10 +33,14 @@ export default function ProfileTabScreen() {
 
   const onSignOut = async () => {
     try {
-      await signOut();
-    } finally {
-      router.replace("/login" as any);
-    }
+      const { pending } = await signOut();
+      // Des modifications hors ligne n'ont pas pu être envoyées : rester connecté sauf confirmation
+      if (pending) {
+        if (!(await confirmDiscardPending(pending))) return;
+        await signOut({ discardPending: true });
+      }
+    } catch {}
+    router.replace("/login" as any);
   };
 
   if (loading) {
@@ -1,14 +1,47 @@
-import { Stack } from "expo-router";
+import { Stack, useNavigationContainerRef, usePathname } from "expo-router";
 import { AnalysisProvider } from "../context/AnalysisContext";
 import { SafeAreaProvider } from "react-native-safe-area-context";
 import { StatusBar } from "expo-status-bar";
 import { useFirebaseAuth } from "../lib/useFirebaseAuth";
-import { Platform } from "react-native";
+import { InteractionManager, Platform } from "react-native";
+import { useEffect } from "react";
+import { startSyncWorker } from "../lib/api";
+import { markInteractive, markNavigation } from "../lib/telemetry";
+import { DebugOverlay } from "../components/AuthDebug";
+import { SyncNotice } from "../components/SyncNotice";
+
+/**
+ * Temps jusqu'à l'interactivité de chaque écran : de l'action de navigation
+ * (ou du chargement du bundle pour le premier écran) jusqu'à la fin des
+ * interactions en cours (transition, effets de montage) et la frame suivante.
+ */
+function useScreenTiming() {
+  const navigation = useNavigationContainerRef();
+  const pathname = usePathname();
+
+  useEffect(() => navigation.addListener("__unsafe_action__", () => markNavigation()), [navigation]);
+
+  useEffect(() => {
+    let frame: number | undefined;
+    const task = InteractionManager.runAfterInteractions(() => {
+      frame = requestAnimationFrame(() => markInteractive(pathname));
+    });
+    return () => {
+      task.cancel();
+      if (frame !== undefined) cancelAnimationFrame(frame);
+    };
+  }, [pathname]);
+}
 
 function RootLayoutContent() {
   // Initialize Firebase auth listener to keep token cache in sync
   useFirebaseAuth();
-  
+
+  // Rejouer les modifications faites hors ligne dès que possible
+  useEffect(() => startSyncWorker(), []);
+
+  useScreenTiming();
+
   const isMobile = Platform.OS === "ios" || Platform.OS === "android";
   
   return (
@@ -31,6 +64,8 @@ export default function RootLayout() {
       <AnalysisProvider>
         <RootLayoutContent />
       </AnalysisProvider>
+      <SyncNotice />
+      {(__DEV__ || process.env.EXPO_PUBLIC_PERF_OVERLAY === "1") && <DebugOverlay />}
     </SafeAreaProvider>
   );
 }
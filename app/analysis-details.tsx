@@ -7,6 +7,7 @@ import { LinearGradient } from "expo-linear-gradient";
 import { getUserAnalysis, getReportUrl, deleteUserAnalysis } from "../lib/api";
 import type { QuestionnaireAnalyzeResponse } from "../lib/types";
 import { useAuthGuard } from "../lib/guard";
+import { to100 } from "../lib/scoring";
 
 function Badge({ label, bg, color }: { label: string; bg: string; color: string }) {
   return (
@@ -110,7 +111,7 @@ export default function AnalysisDetailsScreen() {
   }
 
   const badge = classBadge(analysis.classification);
-  const scoreNormalized = (analysis as any).normalized_score_100 ?? Math.round((analysis.score / 125) * 100);
+  const scoreNormalized = (analysis as any).normalized_score_100 ?? to100(analysis.score);
 
   return (
     <SafeAreaView style={{ flex: 1, backgroundColor: "#f9fafb" }}>
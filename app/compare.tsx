@@ -1,14 +1,16 @@
 import React, { useEffect, useState } from "react";
 import { View, Text, ActivityIndicator, ScrollView, Pressable, useWindowDimensions, Platform } from "react-native";
-import { useAnalysis } from "../context/AnalysisContext";
+import { analysisActions, analysisStore } from "../context/AnalysisContext";
 import { compareAnalyses, exportCompareReport } from "../lib/api";
 import { SafeAreaView } from "react-native-safe-area-context";
 import { useAuthGuard } from "../lib/guard";
+import { to100 } from "../lib/scoring";
 import { useLocalSearchParams } from "expo-router";
+import { isAbortError } from "../lib/aiStream";
 
 export default function CompareScreen() {
   useAuthGuard();
-  const { state, setCompareResult } = useAnalysis();
+  const { setCompareResult } = analysisActions;
   const params = useLocalSearchParams();
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
@@ -29,6 +31,8 @@ export default function CompareScreen() {
   };
 
   useEffect(() => {
+    // Une saisie déjà comparée sort du cache local ; sinon la requête est annulée si l'écran est quitté
+    const controller = new AbortController();
     (async () => {
       try {
         // Source 1: Query params (autonome)
@@ -42,7 +46,7 @@ export default function CompareScreen() {
         const pClass = normalizeClassification(params.user_classification as string);
 
         if (pDesc && pCat && pType && pG !== undefined && pF !== undefined && pP !== undefined) {
-          setLocalHuman({ G: pG, F: pF, P: pP, classification: pClass ?? "" , score: Math.round(((pG*pF*pP)/125)*100)});
+          setLocalHuman({ G: pG, F: pF, P: pP, classification: pClass ?? "" , score: to100(pG*pF*pP)});
           setLocalMeta({ description: pDesc, category: pCat, type: pType, sector: pSector });
           const resp = await compareAnalyses({
             description: pDesc,
@@ -53,13 +57,14 @@ export default function CompareScreen() {
             user_F: pF,
             user_P: pP,
             user_classification: pClass,
-          });
+          }, controller.signal);
           setLocalCompareResult(resp);
           setCompareResult && setCompareResult(resp);
           return;
         }
 
-        // Source 2: Contexte (flux questionnaire)
+        // Source 2: Contexte (flux questionnaire), lu une fois au montage
+        const state = analysisStore.getState();
         if (state.userResult && state.description && state.category && state.type) {
           setLocalHuman(state.userResult);
           setLocalMeta({ description: state.description, category: state.category, type: state.type, sector: state.sector });
@@ -73,7 +78,7 @@ export default function CompareScreen() {
             user_F: r.F,
             user_P: r.P,
             user_classification: normalizeClassification(r.classification),
-          });
+          }, controller.signal);
           setLocalCompareResult(resp);
           setCompareResult && setCompareResult(resp);
           return;
@@ -81,11 +86,13 @@ export default function CompareScreen() {
 
         setError("Aucune donnée fournie. Indiquez description, category, type, user_G, user_F, user_P (params) ou passez par le flux d'analyse.");
       } catch (e: any) {
+        if (isAbortError(e)) return;
         setError(e?.message || "Analyse IA indisponible");
       } finally {
-        setLoading(false);
+        if (!controller.signal.aborted) setLoading(false);
       }
     })();
+    return () => controller.abort();
   }, []);
 
   if (loading) return <View style={{ flex:1, justifyContent:"center", alignItems:"center", backgroundColor:"#f9fafb"}}><ActivityIndicator size="large" color="#3b82f6" /></View>;
@@ -1,12 +1,15 @@
-import React, { useCallback, useEffect, useMemo, useState } from "react";
-import { View, Text, ActivityIndicator, Pressable, ScrollView, RefreshControl, TextInput, Platform } from "react-native";
+import React, { memo, useCallback, useDeferredValue, useEffect, useMemo, useRef, useState } from "react";
+import { View, Text, ActivityIndicator, Pressable, FlatList, RefreshControl, TextInput, Platform } from "react-native";
 import { SafeAreaView } from "react-native-safe-area-context";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import { LinearGradient } from "expo-linear-gradient";
 import { useAuthGuard } from "../lib/guard";
-import { getProfile, getExtendedProfile, listUserAnalyses, listProjects } from "../lib/api";
+import { getProfile, getExtendedProfile, pageUserAnalyses, pageProjects, iterateProjects } from "../lib/api";
+import { generatePortfolioExcel } from "../lib/excelExport";
 import type { UserAnalysis, QuestionnaireAnalyzeResponse, ProjectSummary } from "../lib/types";
-import { emit, on, last } from "../lib/events";
+import { on, takePending } from "../lib/events";
+import { createAnalysisIndex, type IndexedAnalysis, type Period } from "../lib/analysisIndex";
+import { usePaginatedList } from "../lib/usePaginatedList";
 import { router } from "expo-router";
 import { useFocusEffect } from "@react-navigation/native";
 
@@ -16,13 +19,14 @@ function SkeletonCard() {
   );
 }
 
-function StatCard({ title, value, icon, colors }: { title: string; value: string | number; icon: React.ReactNode; colors: readonly [string, string] | readonly [string, string, ...string[]]; }) {
+function StatCard({ title, value, icon, colors, note }: { title: string; value: string | number; icon: React.ReactNode; colors: readonly [string, string] | readonly [string, string, ...string[]]; note?: string; }) {
   return (
     <LinearGradient colors={colors} start={{x:0, y:0}} end={{x:1, y:1}} style={{ padding: 16, borderRadius: 16 }}>
       <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "center" }}>
         <View>
           <Text style={{ color: "#e5e7eb", fontSize: 12 }}>{title}</Text>
           <Text style={{ color: "#fff", fontSize: 28, fontWeight: "800" }}>{value}</Text>
+          {note && <Text style={{ color: "#e5e7eb", fontSize: 11 }}>{note}</Text>}
         </View>
         <View style={{ backgroundColor: "rgba(255,255,255,0.15)", width: 44, height: 44, borderRadius: 12, alignItems: "center", justifyContent: "center" }}>
           {icon}
@@ -53,24 +57,158 @@ function ScorePill({ score }: { score: number }) {
   );
 }
 
+const CLASS_BADGES = {
+  eleve: { bg: "#fef3c7", color: "#92400e", label: "Élevé" },
+  modere: { bg: "#dbeafe", color: "#1e40af", label: "Modéré" },
+  faible: { bg: "#d1fae5", color: "#065f46", label: "Faible" },
+} as const;
+
+// Map payload (QuestionnaireAnalyzeResponse) to UserAnalysis for optimistic update
+function toUserAnalysis(p: QuestionnaireAnalyzeResponse): UserAnalysis {
+  return {
+    id: p.id,
+    timestamp: p.timestamp,
+    description: p.description,
+    category: p.category,
+    type: p.type,
+    G: p.G,
+    F: p.F,
+    P: p.P,
+    score: (p as any).normalized_score_100 ?? p.score,
+    computed_classification: p.classification,
+    sector: p.sector,
+  };
+}
+
+const ProjectRow = memo(function ProjectRow({ proj }: { proj: ProjectSummary }) {
+  return (
+    <Pressable
+      onPress={() => router.push({ pathname: "/saved-project-view", params: { projectId: proj.id } } as any)}
+      style={{ marginTop: 12, padding: 14, borderRadius: 12, borderWidth: 1, borderColor: "#e5e7eb", backgroundColor: "#fafafa" }}
+    >
+      <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "flex-start", marginBottom: 8 }}>
+        <View style={{ flex: 1 }}>
+          <Text style={{ fontSize: 16, fontWeight: "700", color: "#111827", marginBottom: 4 }}>
+            {proj.analysis_title}
+          </Text>
+          <Text style={{ fontSize: 12, color: "#6b7280" }}>
+            {new Date(proj.updated_at).toLocaleDateString()}
+          </Text>
+        </View>
+        <View style={{ paddingHorizontal: 10, paddingVertical: 4, borderRadius: 999, backgroundColor: proj.status === "completed" ? "#d1fae5" : "#fef3c7" }}>
+          <Text style={{ fontSize: 12, fontWeight: "700", color: proj.status === "completed" ? "#065f46" : "#92400e" }}>
+            {proj.status === "completed" ? "Complété" : "En cours"}
+          </Text>
+        </View>
+      </View>
+
+      <View style={{ flexDirection: "row", gap: 8, flexWrap: "wrap", marginBottom: 8 }}>
+        <View style={{ flexDirection: "row", alignItems: "center", gap: 4 }}>
+          <Ionicons name={proj.project_type === "project" ? "briefcase" : "business"} size={14} color="#6b7280" />
+          <Text style={{ fontSize: 12, color: "#6b7280" }}>
+            {proj.project_type === "project" ? "Projet" : "Entité"}
+          </Text>
+        </View>
+        {proj.entity_type && (
+          <View style={{ paddingHorizontal: 8, paddingVertical: 2, borderRadius: 999, backgroundColor: "#eef2ff" }}>
+            <Text style={{ fontSize: 11, fontWeight: "600", color: "#3730a3" }}>{proj.entity_type}</Text>
+          </View>
+        )}
+        {proj.sector && (
+          <View style={{ paddingHorizontal: 8, paddingVertical: 2, borderRadius: 999, backgroundColor: "#f3f4f6" }}>
+            <Text style={{ fontSize: 11, fontWeight: "600", color: "#374151" }}>{proj.sector}</Text>
+          </View>
+        )}
+      </View>
+
+      <View style={{ flexDirection: "row", alignItems: "center", gap: 12 }}>
+        <View style={{ flexDirection: "row", alignItems: "center", gap: 4 }}>
+          <Ionicons name="warning" size={16} color="#f59e0b" />
+          <Text style={{ fontSize: 12, fontWeight: "600", color: "#374151" }}>
+            {proj.risks_count} risques
+          </Text>
+        </View>
+        <View style={{ flexDirection: "row", alignItems: "center", gap: 4 }}>
+          <Ionicons name="checkmark-circle" size={16} color="#10b981" />
+          <Text style={{ fontSize: 12, fontWeight: "600", color: "#374151" }}>
+            {proj.completed_risks_count} traités
+          </Text>
+        </View>
+      </View>
+    </Pressable>
+  );
+});
+
+const AnalysisRow = memo(function AnalysisRow({ entry }: { entry: IndexedAnalysis }) {
+  const it = entry.item;
+  const b = CLASS_BADGES[entry.klass];
+  const desc = it.description?.length > 90 ? it.description.slice(0, 90) + "…" : it.description;
+  return (
+    <View style={{ marginTop: 10, padding: 12, borderRadius: 12, borderWidth: 1, borderColor: "#e5e7eb", backgroundColor: "#fff" }}>
+      <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "flex-start", gap: 10 }}>
+        <View style={{ flex: 1 }}>
+          <Text style={{ color: "#6b7280", fontSize: 12 }}>{new Date(entry.ts).toLocaleString()}</Text>
+          <Text style={{ fontSize: 16, fontWeight: "700", color: "#111827", marginTop: 2 }}>{desc}</Text>
+          <View style={{ marginTop: 8, flexDirection: "row", alignItems: "center", gap: 10, flexWrap: "wrap" }}>
+            <Badge label={it.category} bg="#eef2ff" color="#3730a3" />
+            <Badge label={(b.label)} bg={b.bg} color={b.color} />
+            <ScorePill score={it.score} />
+          </View>
+        </View>
+        <Pressable onPress={() => router.push({ pathname: "/analysis-details", params: { id: it.id } } as any)} style={{ paddingHorizontal: 12, paddingVertical: 8, borderRadius: 8, backgroundColor: "#f3f4f6" }}>
+          <Text style={{ color: "#374151", fontWeight: "600" }}>Voir détails</Text>
+        </Pressable>
+      </View>
+    </View>
+  );
+});
+
 export default function DashboardScreen() {
   const { loading: authLoading, authenticated } = useAuthGuard();
   const [profileName, setProfileName] = useState<string | undefined>(undefined);
-  const [items, setItems] = useState<UserAnalysis[]>([]);
-  const [projects, setProjects] = useState<ProjectSummary[]>([]);
-  const [loading, setLoading] = useState(true);
-  const [error, setError] = useState<string | null>(null);
+  const [loaded, setLoaded] = useState(false);
   const [refreshing, setRefreshing] = useState(false);
-  const [filter, setFilter] = useState<"today"|"week"|"month"|"all">("all");
+  const [filter, setFilter] = useState<Period>("all");
   const [q, setQ] = useState("");
+  // Le filtrage suit la saisie en différé : le champ de recherche reste fluide
+  const deferredQ = useDeferredValue(q);
   const [showToast, setShowToast] = useState<string | null>(null);
+  // Lignes écrites pendant l'export du portefeuille (null hors export)
+  const [portfolioRows, setPortfolioRows] = useState<number | null>(null);
   const [viewMode, setViewMode] = useState<"analyses"|"projects">("projects");
 
+  // Index des analyses chargées : dates, texte de recherche et statistiques précalculés
+  const index = useRef(createAnalysisIndex()).current;
+  const [indexVersion, setIndexVersion] = useState(0);
+
+  const onAnalysesPage = useCallback((page: UserAnalysis[], reset: boolean) => {
+    if (reset) index.reset(page);
+    else index.upsert(page);
+    setIndexVersion(index.version);
+  }, [index]);
+
+  const analyses = usePaginatedList(pageUserAnalyses, onAnalysesPage);
+  const projects = usePaginatedList(pageProjects);
+  const refreshAnalyses = analyses.refresh;
+  const refreshProjects = projects.refresh;
+  const loading = !loaded;
+
+  const exportPortfolio = useCallback(async () => {
+    setPortfolioRows(0);
+    try {
+      const result = await generatePortfolioExcel(iterateProjects(), { onProgress: setPortfolioRows });
+      if (result) setShowToast(`Portefeuille exporté (${result.rows} lignes) ✓`);
+    } catch (e: any) {
+      setShowToast(e?.message || "Impossible d'exporter le portefeuille");
+    } finally {
+      setPortfolioRows(null);
+      setTimeout(() => setShowToast(null), 2500);
+    }
+  }, []);
 
   const load = useCallback(async () => {
     if (!authenticated) return;
     
-    setError(null);
     try {
       // Essayer d'abord de récupérer le profil étendu avec prénom
       try {
@@ -81,22 +219,16 @@ export default function DashboardScreen() {
         const p = await getProfile();
         setProfileName(p?.profile?.name || p?.profile?.email || undefined);
       }
-      
-      const [analysesResp, projectsResp] = await Promise.all([
-        listUserAnalyses(100, 0),
-        listProjects(100, 0),
-      ]);
-      setItems(analysesResp.analyses || []);
-      setProjects(projectsResp.projects || []);
-    } catch (e: any) {
-      setError(e?.message || "Erreur de chargement du dashboard");
-      setItems([]);
-      setProjects([]);
+    } catch {}
+
+    try {
+      // Première page uniquement : la suite est chargée au défilement
+      await Promise.all([refreshAnalyses(), refreshProjects()]);
     } finally {
-      setLoading(false);
+      setLoaded(true);
       setRefreshing(false);
     }
-  }, [authenticated]);
+  }, [authenticated, refreshAnalyses, refreshProjects]);
 
   // Reload on screen focus to keep dashboard dynamic after navigation
   useFocusEffect(
@@ -105,56 +237,26 @@ export default function DashboardScreen() {
     }, [load])
   );
 
+  const addOptimistic = useCallback((p?: QuestionnaireAnalyzeResponse) => {
+    if (!p || !p.id || index.has(p.id)) return;
+    index.upsert([toUserAnalysis(p)]);
+    setIndexVersion(index.version);
+  }, [index]);
+
   useEffect(() => {
     load();
-    // Consume any pending created-analysis event (e.g., user just came from Result screen)
+    // Consume created-analysis events emitted before mount (e.g., user just came from Result screen)
     try {
-      const pending = last("analysis:created", true) as QuestionnaireAnalyzeResponse | undefined;
-      if (pending && pending.id) {
-        const optimistic: UserAnalysis = {
-          id: pending.id,
-          timestamp: pending.timestamp,
-          description: pending.description,
-          category: pending.category,
-          type: pending.type,
-          G: pending.G,
-          F: pending.F,
-          P: pending.P,
-          score: (pending as any).normalized_score_100 ?? pending.score,
-          computed_classification: pending.classification,
-          sector: pending.sector,
-        };
-        setItems((prev) => {
-          if (prev.find((x) => x.id === optimistic.id)) return prev;
-          return [optimistic, ...prev];
-        });
+      const pending = takePending("analysis:created").filter((p) => p.id);
+      pending.forEach(addOptimistic);
+      if (pending.length) {
         setShowToast("Analyse enregistrée avec succès ✓");
         setTimeout(() => setShowToast(null), 2000);
       }
     } catch {}
-    const off = on("analysis:created", (payload?: any) => {
+    const off = on("analysis:created", (payload) => {
       try {
-        // Map payload (QuestionnaireAnalyzeResponse) to UserAnalysis for optimistic update
-        const p = payload as QuestionnaireAnalyzeResponse | undefined;
-        if (p && p.id) {
-          const optimistic: UserAnalysis = {
-            id: p.id,
-            timestamp: p.timestamp,
-            description: p.description,
-            category: p.category,
-            type: p.type,
-            G: p.G,
-            F: p.F,
-            P: p.P,
-            score: (p as any).normalized_score_100 ?? p.score,
-            computed_classification: p.classification,
-            sector: p.sector,
-          };
-          setItems((prev) => {
-            if (prev.find((x) => x.id === optimistic.id)) return prev;
-            return [optimistic, ...prev];
-          });
-        }
+        addOptimistic(payload);
       } catch {}
       setShowToast("Analyse enregistrée avec succès ✓");
       setTimeout(() => setShowToast(null), 2500);
@@ -162,61 +264,36 @@ export default function DashboardScreen() {
       setTimeout(() => load(), 1200);
     });
     return () => { off(); };
-  }, [load]);
+  }, [load, addOptimistic]);
 
   const now = useMemo(() => new Date(), []);
 
-  // derive stats
-  const filtered = useMemo(() => {
-    const base = items.slice().sort((a, b) => +new Date(b.timestamp) - +new Date(a.timestamp));
-    const byPeriod = base.filter((it) => {
-      const d = new Date(it.timestamp);
-      const diffDays = (now.getTime() - d.getTime()) / (1000*60*60*24);
-      if (filter === "today") return diffDays < 1;
-      if (filter === "week") return diffDays < 7;
-      if (filter === "month") return d.getFullYear() === now.getFullYear() && d.getMonth() === now.getMonth();
-      return true;
-    });
-    // Recherche améliorée : description, catégorie, type, classification
-    const byQuery = q.trim() ? byPeriod.filter((it) => {
-      const query = q.trim().toLowerCase();
-      const classification = ((it as any).computed_classification || (it as any).classification || "").toLowerCase();
-      return (
-        it.description?.toLowerCase().includes(query) ||
-        it.category?.toLowerCase().includes(query) ||
-        it.type?.toLowerCase().includes(query) ||
-        classification.includes(query) ||
-        it.sector?.toLowerCase().includes(query)
-      );
-    }) : byPeriod;
-    return byQuery;
-  }, [items, filter, q, now]);
-
-  const totalAnalyses = items.length;
-  const monthAnalyses = items.filter((it) => {
-    const d = new Date(it.timestamp);
-    return d.getFullYear() === now.getFullYear() && d.getMonth() === now.getMonth();
-  }).length;
-  const avgScore = items.length ? Math.round(items.reduce((a, b) => a + (b.score || 0), 0) / items.length) : 0;
-  const highRiskCount = items.filter((it) => {
-    const classification = (it as any).computed_classification || (it as any).classification || "";
-    return classification.toLowerCase().includes("élev");
-  }).length;
-
-  const recent = filtered.slice(0, 10);
-
-  const classBadge = (cls?: string) => {
-    const s = (cls || "").toLowerCase();
-    if (s.includes("élev") || s.includes("eleve")) return { bg: "#fef3c7", color: "#92400e", label: "Élevé" };
-    if (s.includes("mod")) return { bg: "#dbeafe", color: "#1e40af", label: "Modéré" };
-    return { bg: "#d1fae5", color: "#065f46", label: "Faible" };
-  };
+  // Filtrage sur l'index : pas de tri ni de parsing de dates à chaque frappe
+  const filtered = useMemo(
+    () => index.query(filter, deferredQ, now),
+    // indexVersion: l'index est muté en place
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+    [index, indexVersion, filter, deferredQ, now]
+  );
+
+  // Statistiques tenues à jour incrémentalement par l'index
+  const stats = index.stats;
+  const totalAnalyses = Math.max(analyses.total ?? 0, index.size);
+  const monthAnalyses = index.countInMonth(now);
+  const avgScore = index.averageScore();
+  const highRiskCount = stats.byClass.eleve;
+  // Statistiques et filtres ne portent que sur les pages déjà chargées
+  const partial = index.size < totalAnalyses;
+  const partialNote = partial ? `sur ${index.size} analyses chargées` : undefined;
 
   const onRefresh = useCallback(() => {
     setRefreshing(true);
     load();
   }, [load]);
 
+  const renderProject = useCallback(({ item }: { item: ProjectSummary }) => <ProjectRow proj={item} />, []);
+  const renderAnalysis = useCallback(({ item }: { item: IndexedAnalysis }) => <AnalysisRow entry={item} />, []);
+
   // Show loading screen while checking authentication
   if (authLoading) {
     return (
@@ -227,355 +304,305 @@ export default function DashboardScreen() {
     );
   }
 
-  return (
-    <SafeAreaView style={{ flex:1, backgroundColor: "#f9fafb" }}>
-      <ScrollView style={{ flex:1 }} contentContainerStyle={{ padding: 20, paddingBottom: Platform.OS === "android" ? 90 : 70 }} refreshControl={<RefreshControl refreshing={refreshing} onRefresh={onRefresh} />}>
-        {/* Header */}
-        <View style={{ marginBottom: 20 }}>
-          <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "flex-start", marginBottom: 12 }}>
-            <View style={{ flex: 1 }}>
-              <Text style={{ fontSize: 14, color: "#6b7280" }}>Bonjour{profileName ? `, ${profileName}` : ""} 👋</Text>
-              <Text style={{ fontSize: 28, fontWeight: "800", color: "#111827", marginTop: 4 }}>Tableau de bord</Text>
-              <Text style={{ fontSize: 12, color: "#9ca3af", marginTop: 4 }}>{now.toLocaleDateString("fr-FR", { weekday: "long", year: "numeric", month: "long", day: "numeric" })}</Text>
-            </View>
-            <View style={{ flexDirection: "row", alignItems: "center", gap: 8 }}>
-              <Pressable onPress={() => router.push("/start")} style={{ borderRadius: 10, overflow: "hidden" }}>
-                <LinearGradient colors={["#7C3AED", "#2563EB"]} start={{x:0, y:0}} end={{x:1, y:1}} style={{ paddingVertical: 8, paddingHorizontal: 12, flexDirection: "row", alignItems: "center", gap: 6 }}>
-                  <Ionicons name="add-circle" size={18} color="#fff" />
-                  <Text style={{ color: "#fff", fontWeight: "800", fontSize: 12 }}>Créer une analyse</Text>
-                </LinearGradient>
-              </Pressable>
-              <Pressable onPress={() => router.push("/profile" as any)} style={{ padding: 10, borderRadius: 12, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
-                <Ionicons name="settings-outline" size={24} color="#374151" />
-              </Pressable>
-            </View>
+  const listHeader = (
+    <View>
+      {/* Header */}
+      <View style={{ marginBottom: 20 }}>
+        <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "flex-start", marginBottom: 12 }}>
+          <View style={{ flex: 1 }}>
+            <Text style={{ fontSize: 14, color: "#6b7280" }}>Bonjour{profileName ? `, ${profileName}` : ""} 👋</Text>
+            <Text style={{ fontSize: 28, fontWeight: "800", color: "#111827", marginTop: 4 }}>Tableau de bord</Text>
+            <Text style={{ fontSize: 12, color: "#9ca3af", marginTop: 4 }}>{now.toLocaleDateString("fr-FR", { weekday: "long", year: "numeric", month: "long", day: "numeric" })}</Text>
+          </View>
+          <View style={{ flexDirection: "row", alignItems: "center", gap: 8 }}>
+            <Pressable onPress={() => router.push("/start")} style={{ borderRadius: 10, overflow: "hidden" }}>
+              <LinearGradient colors={["#7C3AED", "#2563EB"]} start={{x:0, y:0}} end={{x:1, y:1}} style={{ paddingVertical: 8, paddingHorizontal: 12, flexDirection: "row", alignItems: "center", gap: 6 }}>
+                <Ionicons name="add-circle" size={18} color="#fff" />
+                <Text style={{ color: "#fff", fontWeight: "800", fontSize: 12 }}>Créer une analyse</Text>
+              </LinearGradient>
+            </Pressable>
+            <Pressable onPress={() => router.push("/profile" as any)} style={{ padding: 10, borderRadius: 12, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
+              <Ionicons name="settings-outline" size={24} color="#374151" />
+            </Pressable>
           </View>
         </View>
+      </View>
 
-        {showToast && (
-          <View style={{ marginBottom: 12, backgroundColor: "#d1fae5", borderLeftWidth: 4, borderLeftColor: "#10b981", padding: 12, borderRadius: 12, flexDirection: "row", alignItems: "center", gap: 8 }}>
-            <Ionicons name="checkmark-circle" size={20} color="#059669" />
-            <Text style={{ color: "#065f46", fontWeight: "600" }}>{showToast}</Text>
-          </View>
-        )}
+      {showToast && (
+        <View style={{ marginBottom: 12, backgroundColor: "#d1fae5", borderLeftWidth: 4, borderLeftColor: "#10b981", padding: 12, borderRadius: 12, flexDirection: "row", alignItems: "center", gap: 8 }}>
+          <Ionicons name="checkmark-circle" size={20} color="#059669" />
+          <Text style={{ color: "#065f46", fontWeight: "600" }}>{showToast}</Text>
+        </View>
+      )}
+
+      {/* View mode toggle */}
+      <View style={{ flexDirection: "row", gap: 8, marginBottom: 12 }}>
+        <Pressable
+          onPress={() => setViewMode("projects")}
+          style={{
+            flex: 1,
+            paddingVertical: 12,
+            borderRadius: 12,
+            backgroundColor: viewMode === "projects" ? "#7C3AED" : "#fff",
+            borderWidth: 1,
+            borderColor: viewMode === "projects" ? "#7C3AED" : "#e5e7eb",
+            alignItems: "center",
+            flexDirection: "row",
+            justifyContent: "center",
+            gap: 8,
+          }}
+        >
+          <Ionicons name="folder" size={20} color={viewMode === "projects" ? "#fff" : "#374151"} />
+          <Text style={{ fontWeight: "700", color: viewMode === "projects" ? "#fff" : "#374151" }}>
+            Projets ({projects.total ?? projects.items.length})
+          </Text>
+        </Pressable>
+      
+        <Pressable
+          onPress={() => setViewMode("analyses")}
+          style={{
+            flex: 1,
+            paddingVertical: 12,
+            borderRadius: 12,
+            backgroundColor: viewMode === "analyses" ? "#7C3AED" : "#fff",
+            borderWidth: 1,
+            borderColor: viewMode === "analyses" ? "#7C3AED" : "#e5e7eb",
+            alignItems: "center",
+            flexDirection: "row",
+            justifyContent: "center",
+            gap: 8,
+          }}
+        >
+          <Ionicons name="analytics" size={20} color={viewMode === "analyses" ? "#fff" : "#374151"} />
+          <Text style={{ fontWeight: "700", color: viewMode === "analyses" ? "#fff" : "#374151" }}>
+            Analyses ({totalAnalyses})
+          </Text>
+        </Pressable>
+      </View>
 
-        {/* View mode toggle */}
-        <View style={{ flexDirection: "row", gap: 8, marginBottom: 12 }}>
-          <Pressable
-            onPress={() => setViewMode("projects")}
-            style={{
-              flex: 1,
-              paddingVertical: 12,
-              borderRadius: 12,
-              backgroundColor: viewMode === "projects" ? "#7C3AED" : "#fff",
-              borderWidth: 1,
-              borderColor: viewMode === "projects" ? "#7C3AED" : "#e5e7eb",
-              alignItems: "center",
-              flexDirection: "row",
-              justifyContent: "center",
-              gap: 8,
-            }}
-          >
-            <Ionicons name="folder" size={20} color={viewMode === "projects" ? "#fff" : "#374151"} />
-            <Text style={{ fontWeight: "700", color: viewMode === "projects" ? "#fff" : "#374151" }}>
-              Projets ({projects.length})
-            </Text>
-          </Pressable>
-          
-          <Pressable
-            onPress={() => setViewMode("analyses")}
-            style={{
-              flex: 1,
-              paddingVertical: 12,
-              borderRadius: 12,
-              backgroundColor: viewMode === "analyses" ? "#7C3AED" : "#fff",
-              borderWidth: 1,
-              borderColor: viewMode === "analyses" ? "#7C3AED" : "#e5e7eb",
-              alignItems: "center",
-              flexDirection: "row",
-              justifyContent: "center",
-              gap: 8,
-            }}
-          >
-            <Ionicons name="analytics" size={20} color={viewMode === "analyses" ? "#fff" : "#374151"} />
-            <Text style={{ fontWeight: "700", color: viewMode === "analyses" ? "#fff" : "#374151" }}>
-              Analyses ({items.length})
+      {/* Filters + Search */}
+      <View style={{ flexDirection: "row", gap: 8, alignItems: "center", marginBottom: 12, flexWrap: "wrap" }}>
+        <Pressable onPress={() => setFilter("all")} style={{ paddingHorizontal: 12, paddingVertical: 8, borderRadius: 999, backgroundColor: filter === "all" ? "#dbeafe" : "#fff", borderWidth: 1, borderColor: filter === "all" ? "#60a5fa" : "#e5e7eb" }}>
+          <Text style={{ color: filter === "all" ? "#1e40af" : "#374151", fontWeight: "600" }}>Tout</Text>
+        </Pressable>
+
+        <View style={{ flex: 1, minWidth: 180, position: "relative" }}>
+          <Ionicons name="search" size={18} color="#9ca3af" style={{ position: "absolute", left: 10, top: 10 }} />
+          <TextInput value={q} onChangeText={setQ} placeholder="Rechercher..." placeholderTextColor="#9ca3af" style={{ paddingLeft: 34, paddingRight: 12, paddingVertical: 8, borderRadius: 999, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }} />
+        </View>
+      </View>
+      {partial && (filter !== "all" || deferredQ.trim() !== "") && (
+        <View style={{ flexDirection: "row", alignItems: "center", gap: 8, marginBottom: 12, flexWrap: "wrap" }}>
+          <Text style={{ color: "#6b7280", fontSize: 12 }}>
+            Résultats parmi les {index.size} analyses chargées sur {totalAnalyses}.
+          </Text>
+          <Pressable onPress={analyses.loadMore} disabled={analyses.loadingMore}>
+            <Text style={{ color: "#2563EB", fontSize: 12, fontWeight: "700" }}>
+              {analyses.loadingMore ? "Chargement..." : "Charger la suite"}
             </Text>
           </Pressable>
         </View>
-
-        {/* Filters + Search */}
-        <View style={{ flexDirection: "row", gap: 8, alignItems: "center", marginBottom: 12, flexWrap: "wrap" }}>
-          <Pressable onPress={() => setFilter("all")} style={{ paddingHorizontal: 12, paddingVertical: 8, borderRadius: 999, backgroundColor: filter === "all" ? "#dbeafe" : "#fff", borderWidth: 1, borderColor: filter === "all" ? "#60a5fa" : "#e5e7eb" }}>
-            <Text style={{ color: filter === "all" ? "#1e40af" : "#374151", fontWeight: "600" }}>Tout</Text>
-          </Pressable>
-
-          <View style={{ flex: 1, minWidth: 180, position: "relative" }}>
-            <Ionicons name="search" size={18} color="#9ca3af" style={{ position: "absolute", left: 10, top: 10 }} />
-            <TextInput value={q} onChangeText={setQ} placeholder="Rechercher..." placeholderTextColor="#9ca3af" style={{ paddingLeft: 34, paddingRight: 12, paddingVertical: 8, borderRadius: 999, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }} />
-          </View>
+      )}
+      {/* Stats grid */}
+      {loading ? (
+        <View style={{ gap: 12 }}>
+          <SkeletonCard />
+          <SkeletonCard />
+          <SkeletonCard />
+          <SkeletonCard />
         </View>
-
-        {/* Stats grid */}
-        {loading ? (
-          <View style={{ gap: 12 }}>
-            <SkeletonCard />
-            <SkeletonCard />
-            <SkeletonCard />
-            <SkeletonCard />
-          </View>
-        ) : (
-          <View style={{ gap: 12 }}>
-            <View style={{ flexDirection: Platform.OS === "web" ? "row" : "column", flexWrap: "wrap", gap: 12 }}>
-              <View style={{ flex: 1, minWidth: 200 }}>
-                <StatCard title="Total des analyses" value={totalAnalyses} icon={<Ionicons name="bar-chart" size={20} color="#fff" />} colors={["#7C3AED", "#2563EB"] as const} />
-              </View>
-              <View style={{ flex: 1, minWidth: 200 }}>
-                <StatCard title="Analyses ce mois" value={monthAnalyses} icon={<Ionicons name="calendar" size={20} color="#fff" />} colors={["#2563EB", "#60a5fa"] as const} />
-              </View>
-              <View style={{ flex: 1, minWidth: 200 }}>
-                <StatCard title="Score moyen" value={`${avgScore}/100`} icon={<Ionicons name="speedometer" size={20} color="#fff" />} colors={["#3b82f6", "#10b981"] as const} />
-              </View>
-              <View style={{ flex: 1, minWidth: 200 }}>
-                <StatCard title="Risque élevé" value={highRiskCount} icon={<Ionicons name="warning" size={20} color="#fff" />} colors={["#f59e0b", "#ef4444"] as const} />
-              </View>
+      ) : (
+        <View style={{ gap: 12 }}>
+          <View style={{ flexDirection: Platform.OS === "web" ? "row" : "column", flexWrap: "wrap", gap: 12 }}>
+            <View style={{ flex: 1, minWidth: 200 }}>
+              <StatCard title="Total des analyses" value={totalAnalyses} icon={<Ionicons name="bar-chart" size={20} color="#fff" />} colors={["#7C3AED", "#2563EB"] as const} />
             </View>
-          </View>
-        )}
-
-        {/* Empty state */}
-        {!loading && viewMode === "projects" && projects.length === 0 && items.length === 0 && (
-          <View style={{ marginTop: 16, padding: 24, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb", alignItems: "center" }}>
-            <View style={{ width: 80, height: 80, borderRadius: 40, backgroundColor: "#f3f4f6", alignItems: "center", justifyContent: "center" }}>
-              <Ionicons name="analytics" size={36} color="#7C3AED" />
+            <View style={{ flex: 1, minWidth: 200 }}>
+              <StatCard title="Analyses ce mois" value={monthAnalyses} note={partialNote} icon={<Ionicons name="calendar" size={20} color="#fff" />} colors={["#2563EB", "#60a5fa"] as const} />
             </View>
-            <Text style={{ marginTop: 12, fontSize: 18, fontWeight: "800", color: "#111827" }}>Commencez votre première analyse de risque</Text>
-            <Text style={{ marginTop: 4, color: "#6b7280", textAlign: "center" }}>Identifiez et évaluez les risques professionnels en quelques minutes</Text>
-            <Pressable onPress={() => router.push("/start")} style={{ marginTop: 16, borderRadius: 12, overflow: "hidden" }}>
-              <LinearGradient colors={["#7C3AED", "#2563EB"]} start={{x:0, y:0}} end={{x:1, y:1}} style={{ paddingVertical: 14, paddingHorizontal: 20 }}>
-                <Text style={{ color: "white", fontWeight: "800" }}>Nouvelle analyse</Text>
-              </LinearGradient>
-            </Pressable>
-          </View>
-        )}
-
-        {!loading && viewMode === "analyses" && items.length === 0 && (
-          <View style={{ marginTop: 16, padding: 24, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb", alignItems: "center" }}>
-            <View style={{ width: 80, height: 80, borderRadius: 40, backgroundColor: "#f3f4f6", alignItems: "center", justifyContent: "center" }}>
-              <Ionicons name="analytics" size={36} color="#7C3AED" />
+            <View style={{ flex: 1, minWidth: 200 }}>
+              <StatCard title="Score moyen" value={`${avgScore}/100`} note={partialNote} icon={<Ionicons name="speedometer" size={20} color="#fff" />} colors={["#3b82f6", "#10b981"] as const} />
+            </View>
+            <View style={{ flex: 1, minWidth: 200 }}>
+              <StatCard title="Risque élevé" value={highRiskCount} note={partialNote} icon={<Ionicons name="warning" size={20} color="#fff" />} colors={["#f59e0b", "#ef4444"] as const} />
             </View>
-            <Text style={{ marginTop: 12, fontSize: 18, fontWeight: "800", color: "#111827" }}>Aucune analyse rapide</Text>
-            <Text style={{ marginTop: 4, color: "#6b7280", textAlign: "center" }}>Les analyses rapides apparaîtront ici</Text>
           </View>
-        )}
+        </View>
+      )}
+      {/* Empty state */}
+      {!loading && viewMode === "projects" && projects.items.length === 0 && index.size === 0 && (
+        <View style={{ marginTop: 16, padding: 24, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb", alignItems: "center" }}>
+          <View style={{ width: 80, height: 80, borderRadius: 40, backgroundColor: "#f3f4f6", alignItems: "center", justifyContent: "center" }}>
+            <Ionicons name="analytics" size={36} color="#7C3AED" />
+          </View>
+          <Text style={{ marginTop: 12, fontSize: 18, fontWeight: "800", color: "#111827" }}>Commencez votre première analyse de risque</Text>
+          <Text style={{ marginTop: 4, color: "#6b7280", textAlign: "center" }}>Identifiez et évaluez les risques professionnels en quelques minutes</Text>
+          <Pressable onPress={() => router.push("/start")} style={{ marginTop: 16, borderRadius: 12, overflow: "hidden" }}>
+            <LinearGradient colors={["#7C3AED", "#2563EB"]} start={{x:0, y:0}} end={{x:1, y:1}} style={{ paddingVertical: 14, paddingHorizontal: 20 }}>
+              <Text style={{ color: "white", fontWeight: "800" }}>Nouvelle analyse</Text>
+            </LinearGradient>
+          </Pressable>
+        </View>
+      )}
 
-        {/* Projects list */}
-        {viewMode === "projects" && projects.length > 0 && (
-          <View style={{ marginTop: 16, padding: 16, borderRadius: 12, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
-            <Text style={{ fontSize: 18, fontWeight: "800", color: "#111827", marginBottom: 12 }}>
-              Projets d'analyse ({projects.length})
+      {!loading && viewMode === "analyses" && index.size === 0 && (
+        <View style={{ marginTop: 16, padding: 24, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb", alignItems: "center" }}>
+          <View style={{ width: 80, height: 80, borderRadius: 40, backgroundColor: "#f3f4f6", alignItems: "center", justifyContent: "center" }}>
+            <Ionicons name="analytics" size={36} color="#7C3AED" />
+          </View>
+          <Text style={{ marginTop: 12, fontSize: 18, fontWeight: "800", color: "#111827" }}>Aucune analyse rapide</Text>
+          <Text style={{ marginTop: 4, color: "#6b7280", textAlign: "center" }}>Les analyses rapides apparaîtront ici</Text>
+        </View>
+      )}
+
+      {viewMode === "projects" && projects.items.length > 0 && (
+        <View style={{ marginTop: 16, flexDirection: "row", justifyContent: "space-between", alignItems: "center" }}>
+          <Text style={{ fontSize: 18, fontWeight: "800", color: "#111827" }}>
+            Projets d'analyse ({projects.total ?? projects.items.length})
+          </Text>
+          <Pressable onPress={exportPortfolio} disabled={portfolioRows !== null} style={{ flexDirection: "row", alignItems: "center", gap: 6 }}>
+            {portfolioRows !== null ? <ActivityIndicator size="small" color="#10b981" /> : <Ionicons name="download-outline" size={16} color="#059669" />}
+            <Text style={{ color: "#059669", fontWeight: "700" }}>
+              {portfolioRows !== null ? `${portfolioRows} lignes…` : "Exporter (Excel)"}
             </Text>
-            <View style={{ gap: 12 }}>
-              {projects.map((proj) => (
-                <Pressable
-                  key={proj.id}
-                  onPress={() => router.push({ pathname: "/saved-project-view", params: { projectId: proj.id } } as any)}
-                  style={{ padding: 14, borderRadius: 12, borderWidth: 1, borderColor: "#e5e7eb", backgroundColor: "#fafafa" }}
-                >
-                  <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "flex-start", marginBottom: 8 }}>
-                    <View style={{ flex: 1 }}>
-                      <Text style={{ fontSize: 16, fontWeight: "700", color: "#111827", marginBottom: 4 }}>
-                        {proj.analysis_title}
-                      </Text>
-                      <Text style={{ fontSize: 12, color: "#6b7280" }}>
-                        {new Date(proj.updated_at).toLocaleDateString()}
-                      </Text>
-                    </View>
-                    <View style={{ paddingHorizontal: 10, paddingVertical: 4, borderRadius: 999, backgroundColor: proj.status === "completed" ? "#d1fae5" : "#fef3c7" }}>
-                      <Text style={{ fontSize: 12, fontWeight: "700", color: proj.status === "completed" ? "#065f46" : "#92400e" }}>
-                        {proj.status === "completed" ? "Complété" : "En cours"}
-                      </Text>
-                    </View>
-                  </View>
+          </Pressable>
+        </View>
+      )}
 
-                  <View style={{ flexDirection: "row", gap: 8, flexWrap: "wrap", marginBottom: 8 }}>
-                    <View style={{ flexDirection: "row", alignItems: "center", gap: 4 }}>
-                      <Ionicons name={proj.project_type === "project" ? "briefcase" : "business"} size={14} color="#6b7280" />
-                      <Text style={{ fontSize: 12, color: "#6b7280" }}>
-                        {proj.project_type === "project" ? "Projet" : "Entité"}
-                      </Text>
-                    </View>
-                    {proj.entity_type && (
-                      <View style={{ paddingHorizontal: 8, paddingVertical: 2, borderRadius: 999, backgroundColor: "#eef2ff" }}>
-                        <Text style={{ fontSize: 11, fontWeight: "600", color: "#3730a3" }}>{proj.entity_type}</Text>
-                      </View>
-                    )}
-                    {proj.sector && (
-                      <View style={{ paddingHorizontal: 8, paddingVertical: 2, borderRadius: 999, backgroundColor: "#f3f4f6" }}>
-                        <Text style={{ fontSize: 11, fontWeight: "600", color: "#374151" }}>{proj.sector}</Text>
-                      </View>
-                    )}
-                  </View>
+      {viewMode === "analyses" && index.size > 0 && (
+        <View style={{ marginTop: 16, flexDirection: "row", justifyContent: "space-between", alignItems: "center" }}>
+          <Text style={{ fontSize: 18, fontWeight: "800", color: "#111827" }}>Analyses récentes</Text>
+          <Pressable onPress={() => router.push("/history")}>
+            <Text style={{ color: "#2563eb", fontWeight: "700" }}>Voir plus</Text>
+          </Pressable>
+        </View>
+      )}
+    </View>
+  );
 
-                  <View style={{ flexDirection: "row", alignItems: "center", gap: 12 }}>
-                    <View style={{ flexDirection: "row", alignItems: "center", gap: 4 }}>
-                      <Ionicons name="warning" size={16} color="#f59e0b" />
-                      <Text style={{ fontSize: 12, fontWeight: "600", color: "#374151" }}>
-                        {proj.risks_count} risques
-                      </Text>
-                    </View>
-                    <View style={{ flexDirection: "row", alignItems: "center", gap: 4 }}>
-                      <Ionicons name="checkmark-circle" size={16} color="#10b981" />
-                      <Text style={{ fontSize: 12, fontWeight: "600", color: "#374151" }}>
-                        {proj.completed_risks_count} traités
-                      </Text>
-                    </View>
+  const listFooter = (
+    <View>
+      {(viewMode === "projects" ? projects.loadingMore : analyses.loadingMore) && (
+        <ActivityIndicator style={{ marginTop: 16 }} color="#7C3AED" />
+      )}
+
+      {/* Charts placeholders (lightweight) */}
+      {index.size > 0 && (
+        <View style={{ marginTop: 16, gap: 12 }}>
+          {/* Bar chart: classification distribution */}
+          <View style={{ padding: 16, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
+            <Text style={{ fontWeight: "800", color: "#111827", marginBottom: 8 }}>Répartition par classification</Text>
+            {(() => {
+              const groups = stats.byClass;
+              const max = Math.max(1, groups.faible, groups.modere, groups.eleve);
+              const Bar = ({ label, n, color }: { label: string; n: number; color: string }) => (
+                <View style={{ flexDirection: "row", alignItems: "center", gap: 8, marginTop: 6 }}>
+                  <Text style={{ width: 90, color: "#374151" }}>{label}</Text>
+                  <View style={{ flex: 1, backgroundColor: "#f3f4f6", height: 12, borderRadius: 999, overflow: "hidden" }}>
+                    <View style={{ width: `${Math.round((n / max) * 100)}%`, backgroundColor: color, height: 12 }} />
                   </View>
-                </Pressable>
-              ))}
-            </View>
+                  <Text style={{ width: 30, textAlign: "right", color: "#111827", fontWeight: "700" }}>{n}</Text>
+                </View>
+              );
+              return (
+                <View>
+                  <Bar label="Faible" n={groups.faible} color="#10b981" />
+                  <Bar label="Modéré" n={groups.modere} color="#3b82f6" />
+                  <Bar label="Élevé" n={groups.eleve} color="#f59e0b" />
+                </View>
+              );
+            })()}
           </View>
-        )}
 
-        {/* Recent analyses list */}
-        {viewMode === "analyses" && recent.length > 0 && (
-          <View style={{ marginTop: 16, padding: 16, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
-            <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "center", marginBottom: 8 }}>
-              <Text style={{ fontSize: 18, fontWeight: "800", color: "#111827" }}>Analyses récentes</Text>
-              <Pressable onPress={() => router.push("/history")}>
-                <Text style={{ color: "#2563eb", fontWeight: "700" }}>Voir plus</Text>
-              </Pressable>
-            </View>
-            <View style={{ gap: 10 }}>
-              {recent.map((it) => {
-                const classification = (it as any).computed_classification || (it as any).classification || "";
-                const b = classBadge(classification);
-                const desc = it.description?.length > 90 ? it.description.slice(0, 90) + "…" : it.description;
-                return (
-                  <View key={it.id} style={{ padding: 12, borderRadius: 12, borderWidth: 1, borderColor: "#e5e7eb", backgroundColor: "#fff" }}>
-                    <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "flex-start", gap: 10 }}>
-                      <View style={{ flex: 1 }}>
-                        <Text style={{ color: "#6b7280", fontSize: 12 }}>{new Date(it.timestamp).toLocaleString()}</Text>
-                        <Text style={{ fontSize: 16, fontWeight: "700", color: "#111827", marginTop: 2 }}>{desc}</Text>
-                        <View style={{ marginTop: 8, flexDirection: "row", alignItems: "center", gap: 10, flexWrap: "wrap" }}>
-                          <Badge label={it.category} bg="#eef2ff" color="#3730a3" />
-                          <Badge label={(b.label)} bg={b.bg} color={b.color} />
-                          <ScorePill score={it.score} />
+          {/* Line chart: avg scores by month (simple) */}
+          <View style={{ padding: 16, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
+            <Text style={{ fontWeight: "800", color: "#111827", marginBottom: 8 }}>Évolution des scores moyens</Text>
+            {(() => {
+              // agrégats par mois (YYYY-MM) tenus à jour par l'index
+              const pairs = Array.from(stats.byMonth.entries()).sort(([a],[b]) => a.localeCompare(b)).slice(-6);
+              if (pairs.length === 0) return <Text style={{ color: "#6b7280" }}>Aucune donnée</Text>;
+              const max = Math.max(1, ...pairs.map(([k, m]) => Math.round(m.scoreSum / m.count)));
+              return (
+                <View style={{ gap: 6 }}>
+                  {pairs.map(([k, m]) => {
+                    const avg = Math.round(m.scoreSum / m.count);
+                    return (
+                      <View key={k} style={{ flexDirection: "row", alignItems: "center", gap: 8 }}>
+                        <Text style={{ width: 70, color: "#374151" }}>{k}</Text>
+                        <View style={{ flex: 1, backgroundColor: "#f3f4f6", height: 10, borderRadius: 999, overflow: "hidden" }}>
+                          <View style={{ width: `${Math.round((avg / max) * 100)}%`, height: 10, backgroundColor: "#7C3AED" }} />
                         </View>
+                        <Text style={{ width: 36, textAlign: "right", color: "#111827", fontWeight: "700" }}>{avg}</Text>
                       </View>
-                      <Pressable onPress={() => router.push({ pathname: "/analysis-details", params: { id: it.id } } as any)} style={{ paddingHorizontal: 12, paddingVertical: 8, borderRadius: 8, backgroundColor: "#f3f4f6" }}>
-                        <Text style={{ color: "#374151", fontWeight: "600" }}>Voir détails</Text>
-                      </Pressable>
-                    </View>
-                  </View>
-                );
-              })}
-              {filtered.length === 0 && (
-                <Text style={{ color: "#6b7280" }}>Aucune analyse récente</Text>
-              )}
-            </View>
+                    );
+                  })}
+                </View>
+              );
+            })()}
           </View>
-        )}
-
-        {/* Charts placeholders (lightweight) */}
-        {items.length > 0 && (
-          <View style={{ marginTop: 16, gap: 12 }}>
-            {/* Bar chart: classification distribution */}
-            <View style={{ padding: 16, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
-              <Text style={{ fontWeight: "800", color: "#111827", marginBottom: 8 }}>Répartition par classification</Text>
-              {(() => {
-                const groups = { faible: 0, modere: 0, eleve: 0 } as Record<string, number>;
-                items.forEach((it) => {
-                  // Support both computed_classification and classification fields
-                  const classification = (it as any).computed_classification || (it as any).classification || "";
-                  const s = classification.toLowerCase();
-                  if (s.includes("élev") || s.includes("eleve")) groups.eleve++;
-                  else if (s.includes("mod")) groups.modere++;
-                  else groups.faible++;
-                });
-                const max = Math.max(1, groups.faible, groups.modere, groups.eleve);
-                const Bar = ({ label, n, color }: { label: string; n: number; color: string }) => (
-                  <View style={{ flexDirection: "row", alignItems: "center", gap: 8, marginTop: 6 }}>
-                    <Text style={{ width: 90, color: "#374151" }}>{label}</Text>
-                    <View style={{ flex: 1, backgroundColor: "#f3f4f6", height: 12, borderRadius: 999, overflow: "hidden" }}>
-                      <View style={{ width: `${Math.round((n / max) * 100)}%`, backgroundColor: color, height: 12 }} />
-                    </View>
-                    <Text style={{ width: 30, textAlign: "right", color: "#111827", fontWeight: "700" }}>{n}</Text>
-                  </View>
-                );
-                return (
-                  <View>
-                    <Bar label="Faible" n={groups.faible} color="#10b981" />
-                    <Bar label="Modéré" n={groups.modere} color="#3b82f6" />
-                    <Bar label="Élevé" n={groups.eleve} color="#f59e0b" />
-                  </View>
-                );
-              })()}
-            </View>
 
-            {/* Line chart: avg scores by month (simple) */}
-            <View style={{ padding: 16, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
-              <Text style={{ fontWeight: "800", color: "#111827", marginBottom: 8 }}>Évolution des scores moyens</Text>
-              {(() => {
-                // group by YYYY-MM
-                const map = new Map<string, number[]>();
-                items.forEach((it) => {
-                  const d = new Date(it.timestamp);
-                  const k = `${d.getFullYear()}-${String(d.getMonth()+1).padStart(2,'0')}`;
-                  map.set(k, [...(map.get(k) || []), it.score || 0]);
-                });
-                const pairs = Array.from(map.entries()).sort(([a],[b]) => a.localeCompare(b)).slice(-6);
-                if (pairs.length === 0) return <Text style={{ color: "#6b7280" }}>Aucune donnée</Text>;
-                const max = Math.max(1, ...pairs.map(([k, arr]) => Math.round(arr.reduce((x, y) => x + y, 0) / arr.length)));
-                return (
-                  <View style={{ gap: 6 }}>
-                    {pairs.map(([k, arr]) => {
-                      const avg = Math.round(arr.reduce((x, y) => x + y, 0) / arr.length);
-                      return (
-                        <View key={k} style={{ flexDirection: "row", alignItems: "center", gap: 8 }}>
-                          <Text style={{ width: 70, color: "#374151" }}>{k}</Text>
-                          <View style={{ flex: 1, backgroundColor: "#f3f4f6", height: 10, borderRadius: 999, overflow: "hidden" }}>
-                            <View style={{ width: `${Math.round((avg / max) * 100)}%`, height: 10, backgroundColor: "#7C3AED" }} />
-                          </View>
-                          <Text style={{ width: 36, textAlign: "right", color: "#111827", fontWeight: "700" }}>{avg}</Text>
-                        </View>
-                      );
-                    })}
-                  </View>
-                );
-              })()}
-            </View>
-
-            {/* Donut-like distribution by category (approximation) */}
-            <View style={{ padding: 16, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
-              <Text style={{ fontWeight: "800", color: "#111827", marginBottom: 8 }}>Répartition par catégorie</Text>
-              {(() => {
-                const counts = new Map<string, number>();
-                items.forEach((it) => counts.set(it.category, (counts.get(it.category) || 0) + 1));
-                const total = Array.from(counts.values()).reduce((a, b) => a + b, 0) || 1;
-                const entries = Array.from(counts.entries()).sort((a,b) => b[1] - a[1]);
-                if (entries.length === 0) return <Text style={{ color: "#6b7280" }}>Aucune donnée</Text>;
-                return (
-                  <View style={{ gap: 6 }}>
-                    {entries.map(([cat, n]) => (
-                      <View key={cat} style={{ flexDirection: "row", alignItems: "center", gap: 8 }}>
-                        <Text style={{ width: 120, color: "#374151" }}>{cat}</Text>
-                        <View style={{ flex: 1, backgroundColor: "#f3f4f6", height: 10, borderRadius: 999, overflow: "hidden" }}>
-                          <View style={{ width: `${Math.round((n / total) * 100)}%`, height: 10, backgroundColor: "#2563EB" }} />
-                        </View>
-                        <Text style={{ width: 40, textAlign: "right", color: "#111827", fontWeight: "700" }}>{n}</Text>
+          {/* Donut-like distribution by category (approximation) */}
+          <View style={{ padding: 16, borderRadius: 16, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
+            <Text style={{ fontWeight: "800", color: "#111827", marginBottom: 8 }}>Répartition par catégorie</Text>
+            {(() => {
+              const counts = stats.byCategory;
+              const total = Array.from(counts.values()).reduce((a, b) => a + b, 0) || 1;
+              const entries = Array.from(counts.entries()).sort((a,b) => b[1] - a[1]);
+              if (entries.length === 0) return <Text style={{ color: "#6b7280" }}>Aucune donnée</Text>;
+              return (
+                <View style={{ gap: 6 }}>
+                  {entries.map(([cat, n]) => (
+                    <View key={cat} style={{ flexDirection: "row", alignItems: "center", gap: 8 }}>
+                      <Text style={{ width: 120, color: "#374151" }}>{cat}</Text>
+                      <View style={{ flex: 1, backgroundColor: "#f3f4f6", height: 10, borderRadius: 999, overflow: "hidden" }}>
+                        <View style={{ width: `${Math.round((n / total) * 100)}%`, height: 10, backgroundColor: "#2563EB" }} />
                       </View>
-                    ))}
-                  </View>
-                );
-              })()}
-            </View>
+                      <Text style={{ width: 40, textAlign: "right", color: "#111827", fontWeight: "700" }}>{n}</Text>
+                    </View>
+                  ))}
+                </View>
+              );
+            })()}
           </View>
-        )}
+        </View>
+      )}
+    </View>
+  );
 
-      </ScrollView>
+  const listProps = {
+    style: { flex: 1 },
+    contentContainerStyle: { padding: 20, paddingBottom: Platform.OS === "android" ? 90 : 70 },
+    refreshControl: <RefreshControl refreshing={refreshing} onRefresh={onRefresh} />,
+    ListHeaderComponent: listHeader,
+    ListFooterComponent: listFooter,
+    keyboardShouldPersistTaps: "handled" as const,
+    onEndReachedThreshold: 0.5,
+    initialNumToRender: 8,
+    maxToRenderPerBatch: 10,
+    windowSize: 7,
+    removeClippedSubviews: Platform.OS === "android",
+  };
 
-    
+  return (
+    <SafeAreaView style={{ flex:1, backgroundColor: "#f9fafb" }}>
+      {viewMode === "projects" ? (
+        <FlatList
+          {...listProps}
+          data={loading ? [] : projects.items}
+          keyExtractor={(p) => p.id}
+          renderItem={renderProject}
+          onEndReached={projects.loadMore}
+        />
+      ) : (
+        <FlatList
+          {...listProps}
+          data={loading ? [] : filtered}
+          keyExtractor={(e) => e.item.id}
+          renderItem={renderAnalysis}
+          onEndReached={analyses.loadMore}
+          ListEmptyComponent={!loading && index.size > 0 ? <Text style={{ marginTop: 10, color: "#6b7280" }}>Aucune analyse récente</Text> : null}
+        />
+      )}
     </SafeAreaView>
   );
 }
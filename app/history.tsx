@@ -1,17 +1,42 @@
-import React, { useEffect, useState } from "react";
-import { View, Text, ActivityIndicator, ScrollView } from "react-native";
-import { listUserAnalyses } from "../lib/api";
+import React, { memo, useCallback, useEffect, useRef, useState } from "react";
+import { View, Text, ActivityIndicator, FlatList, Pressable } from "react-native";
+import { pageUserAnalyses } from "../lib/api";
 import type { UserAnalysis } from "../lib/types";
 import RiskMatrix from "../components/RiskMatrix";
 import { useAuthGuard } from "../lib/guard";
 import { getIdToken } from "../lib/auth";
+import { createAnalysisIndex, type IndexedAnalysis } from "../lib/analysisIndex";
+import { usePaginatedList } from "../lib/usePaginatedList";
 import { SafeAreaView } from "react-native-safe-area-context";
 
+const HistoryRow = memo(function HistoryRow({ entry }: { entry: IndexedAnalysis }) {
+  const it = entry.item;
+  return (
+    <View
+      style={{ marginTop:10, padding:12, borderWidth:1, borderColor:"#e5e7eb", borderRadius:8, backgroundColor:"#fff" }}>
+      <Text style={{ fontWeight:"600" }}>{new Date(entry.ts).toLocaleString()}</Text>
+      <Text style={{ marginTop:4, color:"#374151" }}>{it.description}</Text>
+      <Text style={{ marginTop:6 }}>Niveau: {it.computed_classification}  |  Score R: {it.score}</Text>
+      <Text style={{ marginTop:4 }}>G{it.G} F{it.F} P{it.P}</Text>
+      <RiskMatrix G={it.G} P={it.P} />
+    </View>
+  );
+});
+
 export default function HistoryScreen() {
   useAuthGuard();
-  const [items, setItems] = useState<UserAnalysis[]>([]);
   const [loading, setLoading] = useState(true);
-  const [error, setError] = useState<string | null>(null);
+  // Index: tri par date et timestamps parsés une seule fois par analyse
+  const index = useRef(createAnalysisIndex()).current;
+  const [entries, setEntries] = useState<IndexedAnalysis[]>([]);
+
+  const onPage = useCallback((page: UserAnalysis[], reset: boolean) => {
+    if (reset) index.reset(page);
+    else index.upsert(page);
+    setEntries(index.query("all", ""));
+  }, [index]);
+
+  const { error, refresh, loadMore, loadingMore } = usePaginatedList(pageUserAnalyses, onPage);
 
   useEffect(() => {
     (async () => {
@@ -19,49 +44,53 @@ export default function HistoryScreen() {
         const token = await getIdToken();
         if (!token) {
           // Guard will redirect; avoid calling API without token
-          setLoading(false);
           return;
         }
-        const resp = await listUserAnalyses(50, 0);
-        setItems(resp.analyses || []);
-      } catch (e: any) {
-        const msg = String(e?.message || e || "");
-        console.warn("History load error", msg);
-        if (msg.includes("500")) {
-          // Ne pas bloquer l'écran sur une 500: afficher une liste vide et un message discret
-          setItems([]);
-          setError(null);
-        } else {
-          setError(msg || "Erreur de chargement de l'historique");
-        }
+        await refresh();
       } finally {
         setLoading(false);
       }
     })();
-  }, []);
+  }, [refresh]);
 
-  if (loading) return <View style={{ flex:1, justifyContent:"center", alignItems:"center"}}><ActivityIndicator /></View>;
-  if (error) return <View style={{ padding:16 }}><Text style={{ color:"#ef4444" }}>{error}</Text></View>;
+  useEffect(() => {
+    if (error) console.warn("History load error", error);
+  }, [error]);
 
+  const renderItem = useCallback(({ item }: { item: IndexedAnalysis }) => <HistoryRow entry={item} />, []);
+
+  if (loading) return <View style={{ flex:1, justifyContent:"center", alignItems:"center"}}><ActivityIndicator /></View>;
+  // Ne pas bloquer l'écran sur une 500: afficher une liste vide et un message discret.
+  // Une erreur sur une page suivante garde la liste chargée (voir le pied de liste).
+  if (error && !entries.length && !error.includes("500")) return <View style={{ padding:16 }}><Text style={{ color:"#ef4444" }}>{error}</Text></View>;
 
   return (
     <SafeAreaView style={{ flex:1 }}>
-      <ScrollView style={{ flex:1, padding:16 }}>
-      <Text style={{ fontSize:20, fontWeight:"700" }}>Historique des analyses</Text>
-      <View style={{ marginTop:12, gap:10 }}>
-        {items.length === 0 && <Text style={{ color:"#6b7280" }}>Aucune analyse pour l'instant</Text>}
-        {items.map((it) => (
-          <View key={it.id}
-            style={{ padding:12, borderWidth:1, borderColor:"#e5e7eb", borderRadius:8, backgroundColor:"#fff" }}>
-            <Text style={{ fontWeight:"600" }}>{new Date(it.timestamp).toLocaleString()}</Text>
-            <Text style={{ marginTop:4, color:"#374151" }}>{it.description}</Text>
-            <Text style={{ marginTop:6 }}>Niveau: {it.computed_classification}  |  Score R: {it.score}</Text>
-            <Text style={{ marginTop:4 }}>G{it.G} F{it.F} P{it.P}</Text>
-            <RiskMatrix G={it.G} P={it.P} />
-          </View>
-        ))}
-      </View>
-      </ScrollView>
+      <FlatList
+        style={{ flex:1 }}
+        contentContainerStyle={{ padding:16 }}
+        data={entries}
+        keyExtractor={(e) => e.item.id}
+        renderItem={renderItem}
+        ListHeaderComponent={<Text style={{ fontSize:20, fontWeight:"700", marginBottom:2 }}>Historique des analyses</Text>}
+        ListEmptyComponent={<Text style={{ marginTop:12, color:"#6b7280" }}>Aucune analyse pour l'instant</Text>}
+        ListFooterComponent={
+          loadingMore ? <ActivityIndicator style={{ marginVertical:16 }} /> :
+          error && entries.length ? (
+            <View style={{ marginVertical:16, alignItems:"center" }}>
+              <Text style={{ color:"#ef4444" }}>Impossible de charger la suite</Text>
+              <Pressable onPress={loadMore} style={{ marginTop:8, paddingHorizontal:12, paddingVertical:8, borderRadius:8, backgroundColor:"#f3f4f6" }}>
+                <Text style={{ color:"#374151", fontWeight:"600" }}>Réessayer</Text>
+              </Pressable>
+            </View>
+          ) : null
+        }
+        onEndReached={loadMore}
+        onEndReachedThreshold={0.5}
+        initialNumToRender={5}
+        maxToRenderPerBatch={5}
+        windowSize={5}
+      />
     </SafeAreaView>
   );
 }
@@ -1,15 +1,17 @@
 import React, { useEffect, useMemo, useState } from "react";
 import { View, Text, TextInput, Pressable, ScrollView, Alert } from "react-native";
-import { useAnalysis } from "../context/AnalysisContext";
+import { analysisActions, useAnalysisStore } from "../context/AnalysisContext";
+import { shallowEqual } from "../lib/store";
 import { createResidualAnalysis, getQuestions } from "../lib/api";
 import type { ResidualRequest, AnswerItem, Question } from "../lib/types";
 import { router } from "expo-router";
 import { SafeAreaView } from "react-native-safe-area-context";
-
-type Dim = "G" | "F" | "P";
+import { checkConsistency, compileQuestions, dimensionValues, scoreDims, to100, type Dim } from "../lib/scoring";
+import { useKinneyThresholds } from "../lib/useKinneyThresholds";
 
 export default function MeasuresScreen() {
-  const { state, setMeasures } = useAnalysis();
+  const { setMeasures } = analysisActions;
+  const state = useAnalysisStore((s) => ({ userResult: s.userResult, sector: s.sector, measures: s.measures }), shallowEqual);
   const [input, setInput] = useState("");
   const [items, setItems] = useState<string[]>(state.measures || []);
   // answers_by_dim: for each measure index, store answers per dim
@@ -17,6 +19,7 @@ export default function MeasuresScreen() {
   const [impacted, setImpacted] = useState<Array<{ G: boolean; F: boolean; P: boolean }>>([]);
   const [dimConfirmed, setDimConfirmed] = useState<Array<{ G: boolean; F: boolean; P: boolean }>>([]);
   const [questions, setQuestions] = useState<Question[]>([]);
+  const thresholds = useKinneyThresholds();
 
   const needsMeasure = useMemo(() => {
     const cls = state.userResult?.classification;
@@ -91,12 +94,6 @@ export default function MeasuresScreen() {
     })();
   }, [state.sector]);
 
-  // Normalize raw score (G*F*P, max 125) to 0..100
-  const to100 = (raw: number) => Math.round((raw / 125) * 100);
-  // Thresholds mapped to 0..100: 25/125=20, 50/125=40
-  const classify = (score100: number): "Faible" | "Modéré" | "Élevé" =>
-    score100 <= 20 ? "Faible" : score100 <= 40 ? "Modéré" : "Élevé";
-
   const orig = useMemo(() => ({
     G: state.userResult?.G || 1,
     F: state.userResult?.F || 1,
@@ -144,21 +141,11 @@ export default function MeasuresScreen() {
     });
   };
 
+  const bank = useMemo(() => compileQuestions(questions), [questions]);
+
   const computeDimValue = (dim: Dim, answers: AnswerItem[] | undefined): number | null => {
     if (!answers || answers.length === 0) return null;
-    const bank = qByDim[dim];
-    const rel = Object.fromEntries(bank.map(q => [q.id, q]));
-    let sums = 0, weights = 0;
-    for (const a of answers) {
-      const q = rel[a.question_id]; if (!q) continue;
-      const o = q.reponses_possibles.find(op => op.id === a.option_id); if (!o) continue;
-      const w = Number(q.poids || 1);
-      sums += o.contribution * w;
-      weights += w;
-    }
-    if (weights <= 0) return null;
-    const v = Math.round(sums / weights);
-    return Math.max(1, Math.min(5, v));
+    return dimensionValues(bank, answers)[dim];
   };
 
   const measureResult = (ix: number) => {
@@ -168,10 +155,7 @@ export default function MeasuresScreen() {
     const fVal = imp.F ? computeDimValue("F", ans.F) : orig.F;
     const pVal = imp.P ? computeDimValue("P", ans.P) : orig.P;
     if ((imp.G && !gVal) || (imp.F && !fVal) || (imp.P && !pVal)) return null;
-    const G = gVal as number; const F = fVal as number; const P = pVal as number;
-    const scoreRaw = G * F * P;
-    const score = to100(scoreRaw);
-    return { G, F, P, score, classification: classify(score) };
+    return scoreDims(gVal as number, fVal as number, pVal as number, thresholds);
   };
 
   const finalResult = useMemo(() => {
@@ -180,7 +164,7 @@ export default function MeasuresScreen() {
       if (res) return res;
     }
     return null;
-  }, [items.length, dimAnswers, impacted, orig.G, orig.F, orig.P]);
+  }, [items.length, dimAnswers, impacted, orig.G, orig.F, orig.P, bank, thresholds]);
 
   const addItem = () => {
     const v = input.trim();
@@ -242,7 +226,9 @@ export default function MeasuresScreen() {
             };
           }),
         };
-        await createResidualAnalysis(payload);
+        const resp = await createResidualAnalysis(payload);
+        // Le serveur fait foi : les estimations locales ne sont que contrôlées
+        resp.items?.forEach((item, i) => checkConsistency(measureResult(i), item, "residual"));
       }
     } catch (e: any) {
       Alert.alert("Sauvegarde échouée", e?.message || "Impossible d'enregistrer la ré-estimation");
@@ -370,7 +356,7 @@ export default function MeasuresScreen() {
                       Avant: G{orig.G} F{orig.F} P{orig.P} — Score {to100(orig.G * orig.F * orig.P)}/100
                     </Text>
                     <Text style={{ color:"#374151" }}>
-                      Après: G{res.G} F{res.F} P{res.P} — Score {res.score}/100 → {res.classification}
+                      Après: G{res.G} F{res.F} P{res.P} — Score {res.normalized_score_100}/100 → {res.classification}
                     </Text>
                   </View>
                 )}
@@ -394,7 +380,7 @@ export default function MeasuresScreen() {
       {finalResult && (
         <View style={{ marginTop:16, padding:12, borderRadius:8, backgroundColor:"#f9fafb", borderWidth:1, borderColor:"#e5e7eb" }}>
           <Text style={{ fontWeight:"700" }}>Nouvelle estimation (après mesures)</Text>
-          <Text style={{ marginTop:4 }}>G: {finalResult.G}   F: {finalResult.F}   P: {finalResult.P}   Score: {finalResult.score}/100</Text>
+          <Text style={{ marginTop:4 }}>G: {finalResult.G}   F: {finalResult.F}   P: {finalResult.P}   Score: {finalResult.normalized_score_100}/100</Text>
           <Text style={{ marginTop:2 }}>Classification: {finalResult.classification}</Text>
         </View>
       )}
@@ -5,7 +5,7 @@ import { SafeAreaView } from "react-native-safe-area-context";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import { LinearGradient } from "expo-linear-gradient";
 import { useAuthGuard } from "../lib/guard";
-import { getProject, deleteProject } from "../lib/api";
+import { getProject, onProjectRevalidated, deleteProject } from "../lib/api";
 import type { AnalysisProject } from "../lib/types";
 
 export default function ProjectDetailsScreen() {
@@ -24,6 +24,12 @@ export default function ProjectDetailsScreen() {
     loadProject();
   }, [authenticated, projectId]);
 
+  // Rafraîchissement en arrière-plan : afficher la version du serveur
+  useEffect(() => {
+    if (!projectId) return;
+    return onProjectRevalidated(projectId, setProject);
+  }, [projectId]);
+
   const loadProject = async () => {
     try {
       const proj = await getProject(projectId);
@@ -1,19 +1,31 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { View, Text, TextInput, Pressable, ScrollView, ActivityIndicator, Alert, Platform } from "react-native";
 import { router } from "expo-router";
 import { SafeAreaView } from "react-native-safe-area-context";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import { LinearGradient } from "expo-linear-gradient";
-import { useAnalysis } from "../context/AnalysisContext";
+import { analysisActions, analysisStore, getAnalysisState, selectRisks, useAnalysisStore } from "../context/AnalysisContext";
+import { shallowEqual } from "../lib/store";
 import { useAuthGuard } from "../lib/guard";
-import { analyzeQuestionnaire, getQuestions, createProject, addRiskToProject, updateRiskMitigation } from "../lib/api";
-import type { Question } from "../lib/types";
+import { analyzeQuestionnaire, getQuestions, saveProjectBulk, buildBulkSaveRequest } from "../lib/api";
+import { log } from "../lib/telemetry";
+import { newIdempotencyKey } from "../lib/bulkSave";
+import { checkConsistency, dimensionValues, compileQuestions, riskLevel, scoreAnswers, simulateResidual, to100 } from "../lib/scoring";
+import { useKinneyThresholds } from "../lib/useKinneyThresholds";
+import type { Question, BulkSaveProgress } from "../lib/types";
 
 export default function ProjectMeasuresScreen() {
   useAuthGuard();
-  const { state, updateRisk, resetProject } = useAnalysis();
-  
+  const { updateRisk, resetProject } = analysisActions;
   const [currentRiskIndex, setCurrentRiskIndex] = useState(0);
+  // Seul le risque affiché est suivi : évaluer un autre risque ne re-rend que les compteurs
+  const state = useAnalysisStore((s) => ({
+    analysisTitle: s.analysisTitle,
+    sector: s.sector,
+    riskCount: s.riskIds.length,
+    completedCount: s.riskIds.filter((id) => s.risksById[id].residualResult).length,
+    currentRisk: s.risksById[s.riskIds[currentRiskIndex]],
+  }), shallowEqual);
   const [mitigation, setMitigation] = useState("");
   const [evaluating, setEvaluating] = useState(false);
   const [questions, setQuestions] = useState<Question[]>([]);
@@ -21,78 +33,52 @@ export default function ProjectMeasuresScreen() {
   const [questionIndex, setQuestionIndex] = useState(0);
   const [showQuestionnaire, setShowQuestionnaire] = useState(false);
   const [loading, setLoading] = useState(false);
+  const [saveProgress, setSaveProgress] = useState<BulkSaveProgress | null>(null);
+  // Même clé tant que les données envoyées sont identiques : "Réessayer" reprend la
+  // sauvegarde au lieu de dupliquer le projet. Des données modifiées entre deux
+  // tentatives prennent une nouvelle clé, sinon le serveur rejouerait l'ancien résultat.
+  const saveAttemptRef = useRef<{ key: string; body: string; supersedes?: string } | null>(null);
+  const thresholds = useKinneyThresholds();
 
   // Redirection si données manquantes
   useEffect(() => {
-    if (!state.analysisTitle || state.risks.length < 4) {
+    if (!state.analysisTitle || state.riskCount < 4) {
       router.replace("/start");
     }
-  }, [state.analysisTitle, state.risks.length]);
+  }, [state.analysisTitle, state.riskCount]);
 
-  if (!state.analysisTitle || state.risks.length < 4) {
+  if (!state.analysisTitle || state.riskCount < 4) {
     return null;
   }
 
-  const currentRisk = state.risks[currentRiskIndex];
-  const completedCount = state.risks.filter(r => r.residualResult).length;
-  const to100 = (raw: number) => Math.round((raw / 125) * 100);
+  const currentRisk = state.currentRisk;
+  const completedCount = state.completedCount;
   const needsMeasure = (() => {
     const ur = currentRisk?.userResult;
     if (!ur) return false;
-    const score100 = to100((ur.G || 0) * (ur.F || 0) * (ur.P || 0));
-    return score100 > 20; // Medium/High
+    return riskLevel((ur.G || 0) * (ur.F || 0) * (ur.P || 0), thresholds) !== "Faible"; // Medium/High
   })();
 
   const saveProject = async () => {
     setEvaluating(true);
+    setSaveProgress(null);
     try {
-      // 1. Créer le projet
-      const projectData = {
-        project_type: state.projectType!,
-        project_description: state.projectDescription!,
-        entity_type: state.entityType,
-        entity_services: state.entityServices,
-        analysis_title: state.analysisTitle!,
-        sector: state.sector,
-      };
-
-      const createdProject = await createProject(projectData);
-      console.log("[ProjectMeasures] Project created:", createdProject.id);
-
-      // 2. Ajouter tous les risques avec leurs évaluations
-      for (const risk of state.risks) {
-        if (!risk.userResult) continue;
-
-        // Ajouter le risque avec évaluation initiale
-        const addedRisk = await addRiskToProject({
-          project_id: createdProject.id,
-          description: risk.description,
-          category: risk.category,
-          type: risk.type,
-          G: risk.userResult.G,
-          F: risk.userResult.F,
-          P: risk.userResult.P,
-        });
-
-        console.log("[ProjectMeasures] Risk added:", addedRisk.id);
-
-        // 3. Ajouter la mesure et l'évaluation résiduelle si disponibles
-        if (risk.mitigation && risk.residualResult) {
-          await updateRiskMitigation({
-            project_id: createdProject.id,
-            risk_id: addedRisk.id,
-            mitigation_measure: risk.mitigation,
-            residual_G: risk.residualResult.G,
-            residual_F: risk.residualResult.F,
-            residual_P: risk.residualResult.P,
-          });
-
-          console.log("[ProjectMeasures] Mitigation updated for risk:", addedRisk.id);
-        }
+      // Projet, risques et évaluations résiduelles envoyés en une seule sauvegarde groupée
+      const request = buildBulkSaveRequest(getAnalysisState());
+      const body = JSON.stringify(request);
+      if (saveAttemptRef.current?.body !== body) {
+        // Données modifiées depuis l'échec : nouvelle clé, et le projet à moitié
+        // écrit par la tentative précédente est supprimé avant de recommencer
+        saveAttemptRef.current = { key: newIdempotencyKey(), body, supersedes: saveAttemptRef.current?.key };
       }
+      const projectId = await saveProjectBulk(request, {
+        idempotencyKey: saveAttemptRef.current.key,
+        supersedes: saveAttemptRef.current.supersedes,
+        onProgress: setSaveProgress,
+      });
 
-      // 4. Succès - rediriger vers le dashboard approprié selon la plateforme
-      console.log("[ProjectMeasures] Project saved successfully:", createdProject.id);
+      // Succès - rediriger vers le dashboard approprié selon la plateforme
+      log.debug("[ProjectMeasures] Project saved successfully:", projectId);
       const isMobile = Platform.OS === "ios" || Platform.OS === "android";
       router.replace(isMobile ? "/(tabs)" : "/dashboard");
     } catch (e: any) {
@@ -113,6 +99,7 @@ export default function ProjectMeasuresScreen() {
       );
     } finally {
       setEvaluating(false);
+      setSaveProgress(null);
     }
   };
 
@@ -156,6 +143,7 @@ export default function ProjectMeasuresScreen() {
   const evaluateResidual = async (finalAnswers: Array<{question_id: string, option_id: string}>) => {
     setEvaluating(true);
     try {
+      const local = scoreAnswers(questions, finalAnswers, thresholds);
       const res = await analyzeQuestionnaire({
         description: currentRisk.description + " (après mesure: " + mitigation.trim() + ")",
         category: currentRisk.category,
@@ -163,6 +151,8 @@ export default function ProjectMeasuresScreen() {
         sector: state.sector!,
         answers: finalAnswers,
       });
+      // Le serveur fait foi : l'estimation locale n'est que contrôlée
+      checkConsistency(local, res, "residual");
 
       // Stocker la mesure et le résultat résiduel
       updateRisk(currentRiskIndex, {
@@ -177,7 +167,7 @@ export default function ProjectMeasuresScreen() {
       setQuestionIndex(0);
 
       // Passer au risque suivant (ne plus sauvegarder automatiquement)
-      const nextIncomplete = state.risks.findIndex((r, idx) => idx > currentRiskIndex && !r.residualResult);
+      const nextIncomplete = selectRisks(analysisStore.getState()).findIndex((r, idx) => idx > currentRiskIndex && !r.residualResult);
       if (nextIncomplete !== -1) {
         setCurrentRiskIndex(nextIncomplete);
       }
@@ -190,7 +180,7 @@ export default function ProjectMeasuresScreen() {
   };
 
   const handleSkip = () => {
-    const nextIncomplete = state.risks.findIndex((r, idx) => idx > currentRiskIndex && !r.residualResult);
+    const nextIncomplete = selectRisks(analysisStore.getState()).findIndex((r, idx) => idx > currentRiskIndex && !r.residualResult);
     if (nextIncomplete !== -1) {
       setCurrentRiskIndex(nextIncomplete);
       setMitigation("");
@@ -220,6 +210,18 @@ export default function ProjectMeasuresScreen() {
             Étape {questionIndex + 1} / {questions.length} — Dimension {currentQuestion.dimension}
           </Text>
           <Text style={{ marginTop: 8, fontSize: 18, fontWeight: "600" }}>{currentQuestion.texte_question}</Text>
+          {(() => {
+            // Estimation locale instantanée au fil des réponses
+            const dims = dimensionValues(compileQuestions(questions), answers);
+            const ur = currentRisk.userResult;
+            if (!ur || (!dims.G && !dims.F && !dims.P)) return null;
+            const est = simulateResidual(ur, dims, thresholds);
+            return (
+              <Text style={{ marginTop: 8, fontSize: 12, color: "#065f46" }}>
+                Estimation résiduelle : G{est.G} F{est.F} P{est.P} — {est.normalized_score_100}/100 ({est.classification})
+              </Text>
+            );
+          })()}
         </View>
         <ScrollView style={{ padding: 16 }}>
           <View style={{ gap: 10 }}>
@@ -257,18 +259,18 @@ export default function ProjectMeasuresScreen() {
         <View style={{ marginTop: 12 }}>
           <View style={{ flexDirection: "row", justifyContent: "space-between", marginBottom: 4 }}>
             <Text style={{ fontSize: 12, fontWeight: "600", color: "#374151" }}>
-              {completedCount} / {state.risks.length} risques traités
+              {completedCount} / {state.riskCount} risques traités
             </Text>
-            <Text style={{ fontSize: 12, color: completedCount === state.risks.length ? "#10b981" : "#f59e0b" }}>
-              {completedCount === state.risks.length ? "✓ Terminé" : "En cours"}
+            <Text style={{ fontSize: 12, color: completedCount === state.riskCount ? "#10b981" : "#f59e0b" }}>
+              {completedCount === state.riskCount ? "✓ Terminé" : "En cours"}
             </Text>
           </View>
           <View style={{ height: 8, backgroundColor: "#e5e7eb", borderRadius: 999, overflow: "hidden" }}>
             <View
               style={{
-                width: `${(completedCount / state.risks.length) * 100}%`,
+                width: `${(completedCount / state.riskCount) * 100}%`,
                 height: 8,
-                backgroundColor: completedCount === state.risks.length ? "#10b981" : "#f59e0b",
+                backgroundColor: completedCount === state.riskCount ? "#10b981" : "#f59e0b",
               }}
             />
           </View>
@@ -280,7 +282,7 @@ export default function ProjectMeasuresScreen() {
         <View style={{ marginBottom: 16, padding: 16, borderRadius: 12, backgroundColor: "#fff", borderWidth: 1, borderColor: "#e5e7eb" }}>
           <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "center", marginBottom: 12 }}>
             <Text style={{ fontSize: 16, fontWeight: "800", color: "#111827" }}>
-              Risque #{currentRiskIndex + 1} / {state.risks.length}
+              Risque #{currentRiskIndex + 1} / {state.riskCount}
             </Text>
             <View style={{ paddingHorizontal: 10, paddingVertical: 4, borderRadius: 999, backgroundColor: initialColors.bg }}>
               <Text style={{ fontSize: 12, fontWeight: "700", color: initialColors.color }}>
@@ -319,26 +321,23 @@ export default function ProjectMeasuresScreen() {
           {(() => {
             const score = (currentRisk.userResult?.G || 0) * (currentRisk.userResult?.F || 0) * (currentRisk.userResult?.P || 0);
             const score100 = to100(score);
-            let level = "";
+            const level = riskLevel(score, thresholds);
             let recommendation = "";
             let recColor = "#10b981";
             let recBg = "#d1fae5";
             let recIcon: "time-outline" | "warning-outline" | "alert-circle" = "time-outline";
 
-            if (score100 <= 20) {
-              level = "Faible";
+            if (level === "Faible") {
               recommendation = `${level} (Score = ${score100}/100) : mesure facultative`;
               recColor = "#10b981";
               recBg = "#d1fae5";
               recIcon = "time-outline";
-            } else if (score100 <= 40) {
-              level = "Moyen";
+            } else if (level === "Moyen") {
               recommendation = `${level} (Score = ${score100}/100) : mesures requises à court/moyen terme`;
               recColor = "#f59e0b";
               recBg = "#fef3c7";
               recIcon = "warning-outline";
             } else {
-              level = "Élevé";
               recommendation = `${level} (Score = ${score100}/100) : prendre des mesures immédiates`;
               recColor = "#ef4444";
               recBg = "#fee2e2";
@@ -517,7 +516,14 @@ export default function ProjectMeasuresScreen() {
                 style={{ paddingVertical: 16, alignItems: "center", flexDirection: "row", justifyContent: "center", gap: 8 }}
               >
                 {evaluating ? (
-                  <ActivityIndicator color="#fff" />
+                  <>
+                    <ActivityIndicator color="#fff" />
+                    {saveProgress && saveProgress.completed < saveProgress.total && (
+                      <Text style={{ color: "white", fontWeight: "600", fontSize: 14 }}>
+                        {saveProgress.completed}/{saveProgress.total}
+                      </Text>
+                    )}
+                  </>
                 ) : (
                   <>
                     <Ionicons name="save" size={20} color="#fff" />
@@ -535,7 +541,7 @@ export default function ProjectMeasuresScreen() {
           {completedCount >= 4 && (
             <Pressable
               onPress={() => {
-                console.log("[ProjectMeasures] Retour au dashboard clicked");
+                log.debug("[ProjectMeasures] Retour au dashboard clicked");
                 const isMobile = Platform.OS === "ios" || Platform.OS === "android";
                 router.replace(isMobile ? "/(tabs)" : "/dashboard");
               }}
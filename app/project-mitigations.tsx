@@ -5,8 +5,10 @@ import { SafeAreaView } from "react-native-safe-area-context";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import { LinearGradient } from "expo-linear-gradient";
 import { useAuthGuard } from "../lib/guard";
-import { getProject, updateRiskMitigation } from "../lib/api";
+import { getProject, onProjectRevalidated, updateRiskMitigation } from "../lib/api";
 import type { AnalysisProject, RiskItem } from "../lib/types";
+import { riskLevel, simulateResidual } from "../lib/scoring";
+import { useKinneyThresholds } from "../lib/useKinneyThresholds";
 
 export default function ProjectMitigationsScreen() {
   const { loading: authLoading, authenticated } = useAuthGuard();
@@ -18,6 +20,7 @@ export default function ProjectMitigationsScreen() {
   const [error, setError] = useState<string | null>(null);
 
   const [currentRiskIndex, setCurrentRiskIndex] = useState(0);
+  const thresholds = useKinneyThresholds();
   const [mitigationMeasure, setMitigationMeasure] = useState("");
   const [residualG, setResidualG] = useState<number>(2);
   const [residualF, setResidualF] = useState<number>(2);
@@ -30,6 +33,12 @@ export default function ProjectMitigationsScreen() {
     loadProject();
   }, [authenticated, projectId]);
 
+  // Rafraîchissement en arrière-plan : afficher la version du serveur
+  useEffect(() => {
+    if (!projectId) return;
+    return onProjectRevalidated(projectId, setProject);
+  }, [projectId]);
+
   const loadProject = async () => {
     try {
       const proj = await getProject(projectId);
@@ -118,12 +127,6 @@ export default function ProjectMitigationsScreen() {
     return { bg: "#d1fae5", color: "#065f46" };
   };
 
-  const calculateResidualLevel = (score: number): string => {
-    if (score <= 25) return "Faible";
-    if (score <= 50) return "Moyen";
-    return "Élevé";
-  };
-
   if (authLoading || loading) {
     return (
       <SafeAreaView style={{ flex: 1, backgroundColor: "#f9fafb", justifyContent: "center", alignItems: "center" }}>
@@ -152,8 +155,10 @@ export default function ProjectMitigationsScreen() {
 
   const completedCount = project.risks.filter((r) => r.residual_evaluation !== null).length;
   const totalCount = project.risks.length;
-  const residualScore = residualG * residualF * residualP;
-  const residualLevel = calculateResidualLevel(residualScore);
+  // Simulation « et si » recalculée localement à chaque changement de G/F/P
+  const whatIf = simulateResidual(currentRisk.initial_evaluation, { G: residualG, F: residualF, P: residualP }, thresholds);
+  const residualScore = whatIf.score;
+  const residualLevel = riskLevel(residualScore, thresholds);
   const residualColors = getRiskLevelColor(residualLevel);
   const initialColors = getRiskLevelColor(currentRisk.initial_evaluation.level);
 
@@ -367,7 +372,8 @@ export default function ProjectMitigationsScreen() {
             <View style={{ marginTop: 12, padding: 12, borderRadius: 8, backgroundColor: "#d1fae5", flexDirection: "row", gap: 8, alignItems: "center" }}>
               <Ionicons name="checkmark-circle" size={20} color="#10b981" />
               <Text style={{ flex: 1, color: "#065f46", fontWeight: "600" }}>
-                Réduction du risque : {currentRisk.initial_evaluation.score - residualScore} points
+                Réduction du risque : {whatIf.reduction} points ({whatIf.reductionPct}%)
+                {whatIf.classChanged ? ` — ${currentRisk.initial_evaluation.level} → ${residualLevel}` : ""}
               </Text>
             </View>
           )}
@@ -4,12 +4,107 @@ import { router } from "expo-router";
 import { SafeAreaView } from "react-native-safe-area-context";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import { LinearGradient } from "expo-linear-gradient";
-import { useAnalysis } from "../context/AnalysisContext";
+import { analysisActions, useAnalysisStore } from "../context/AnalysisContext";
+import { shallowEqual } from "../lib/store";
 import { useAuthGuard } from "../lib/guard";
 
+function getRiskLevelColor(level?: string) {
+  if (level === "Élevé") return { bg: "#fef3c7", color: "#92400e" };
+  if (level === "Modéré" || level === "Moyen") return { bg: "#dbeafe", color: "#1e40af" };
+  return { bg: "#d1fae5", color: "#065f46" };
+}
+
+function editRisk(index: number) {
+  analysisActions.setCurrentRiskIndex(index);
+  router.push("/risk");
+}
+
+// Chaque ligne s'abonne à son propre risque : évaluer un risque ne re-rend que sa ligne
+const RiskRow = React.memo(function RiskRow({ id, index, onEdit }: { id: string; index: number; onEdit: (index: number) => void }) {
+  const risk = useAnalysisStore((s) => s.risksById[id]);
+  if (!risk) return null;
+  const hasResult = !!risk.userResult;
+  const levelColors = hasResult ? getRiskLevelColor(risk.userResult?.classification as string) : { bg: "#f3f4f6", color: "#6b7280" };
+
+  return (
+    <Pressable
+      onPress={() => onEdit(index)}
+      style={{
+        padding: 16,
+        borderRadius: 12,
+        backgroundColor: "#fff",
+        borderWidth: 1,
+        borderColor: "#e5e7eb",
+      }}
+    >
+      <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "flex-start", marginBottom: 8 }}>
+        <View style={{ flex: 1 }}>
+          <Text style={{ fontSize: 14, fontWeight: "800", color: "#111827", marginBottom: 4 }}>
+            Risque #{index + 1}
+          </Text>
+          <Text style={{ color: "#374151", lineHeight: 20 }}>{risk.description}</Text>
+        </View>
+        {hasResult && <Ionicons name="checkmark-circle" size={20} color="#10b981" />}
+      </View>
+
+      <View style={{ flexDirection: "row", gap: 8, flexWrap: "wrap", marginTop: 8 }}>
+        <View style={{ paddingHorizontal: 10, paddingVertical: 4, borderRadius: 999, backgroundColor: "#eef2ff" }}>
+          <Text style={{ fontSize: 12, fontWeight: "700", color: "#3730a3" }}>{risk.category}</Text>
+        </View>
+        <View style={{ paddingHorizontal: 10, paddingVertical: 4, borderRadius: 999, backgroundColor: "#f3f4f6" }}>
+          <Text style={{ fontSize: 12, fontWeight: "700", color: "#374151" }}>{risk.type}</Text>
+        </View>
+        {hasResult && (
+          <View style={{ paddingHorizontal: 10, paddingVertical: 4, borderRadius: 999, backgroundColor: levelColors.bg }}>
+            <Text style={{ fontSize: 12, fontWeight: "700", color: levelColors.color }}>
+              {risk.userResult?.classification}
+            </Text>
+          </View>
+        )}
+      </View>
+
+      {hasResult && (
+        <View style={{ marginTop: 12, flexDirection: "row", gap: 16 }}>
+          <View>
+            <Text style={{ fontSize: 10, color: "#6b7280", marginBottom: 2 }}>Gravité</Text>
+            <Text style={{ fontSize: 16, fontWeight: "800", color: "#111827" }}>{risk.userResult?.G}/5</Text>
+          </View>
+          <View>
+            <Text style={{ fontSize: 10, color: "#6b7280", marginBottom: 2 }}>Fréquence</Text>
+            <Text style={{ fontSize: 16, fontWeight: "800", color: "#111827" }}>{risk.userResult?.F}/5</Text>
+          </View>
+          <View>
+            <Text style={{ fontSize: 10, color: "#6b7280", marginBottom: 2 }}>Probabilité</Text>
+            <Text style={{ fontSize: 16, fontWeight: "800", color: "#111827" }}>{risk.userResult?.P}/5</Text>
+          </View>
+          <View>
+            <Text style={{ fontSize: 10, color: "#6b7280", marginBottom: 2 }}>Score</Text>
+            <Text style={{ fontSize: 16, fontWeight: "800", color: "#111827" }}>
+              {(risk.userResult?.G || 0) * (risk.userResult?.F || 0) * (risk.userResult?.P || 0)}/125
+            </Text>
+          </View>
+        </View>
+      )}
+
+      {!hasResult && (
+        <View style={{ marginTop: 8, padding: 10, borderRadius: 8, backgroundColor: "#fef3c7" }}>
+          <Text style={{ fontSize: 12, color: "#92400e", fontWeight: "600" }}>
+            ⚠️ Évaluation en attente - Cliquez pour évaluer
+          </Text>
+        </View>
+      )}
+    </Pressable>
+  );
+});
+
 export default function ProjectRisksListScreen() {
   useAuthGuard();
-  const { state, setCurrentRiskIndex } = useAnalysis();
+  const { setCurrentRiskIndex } = analysisActions;
+  const state = useAnalysisStore((s) => ({
+    analysisTitle: s.analysisTitle,
+    riskIds: s.riskIds,
+    allEvaluated: s.riskIds.every((id) => !!s.risksById[id].userResult),
+  }), shallowEqual);
 
   // Redirection si données manquantes
   useEffect(() => {
@@ -23,24 +118,18 @@ export default function ProjectRisksListScreen() {
   }
 
   const handleAddRisk = () => {
-    setCurrentRiskIndex(state.risks.length);
-    router.push("/risk");
-  };
-
-  const handleEditRisk = (index: number) => {
-    setCurrentRiskIndex(index);
+    setCurrentRiskIndex(state.riskIds.length);
     router.push("/risk");
   };
 
   const handleContinue = () => {
-    if (state.risks.length < 4) {
+    if (state.riskIds.length < 4) {
       Alert.alert("Attention", "Vous devez ajouter au moins 4 risques avant de continuer.");
       return;
     }
 
     // Vérifier que tous les risques ont été évalués (ont un résultat)
-    const incompleteRisk = state.risks.find(r => !r.userResult);
-    if (incompleteRisk) {
+    if (!state.allEvaluated) {
       Alert.alert("Attention", "Tous les risques doivent être évalués avant de continuer.");
       return;
     }
@@ -49,13 +138,7 @@ export default function ProjectRisksListScreen() {
     router.push("/project-measures");
   };
 
-  const getRiskLevelColor = (level?: string) => {
-    if (level === "Élevé") return { bg: "#fef3c7", color: "#92400e" };
-    if (level === "Modéré" || level === "Moyen") return { bg: "#dbeafe", color: "#1e40af" };
-    return { bg: "#d1fae5", color: "#065f46" };
-  };
-
-  const canContinue = state.risks.length >= 4 && state.risks.every(r => r.userResult);
+  const canContinue = state.riskIds.length >= 4 && state.allEvaluated;
 
   return (
     <SafeAreaView style={{ flex: 1, backgroundColor: "#f9fafb" }}>
@@ -75,18 +158,18 @@ export default function ProjectRisksListScreen() {
         <View style={{ marginTop: 12 }}>
           <View style={{ flexDirection: "row", justifyContent: "space-between", marginBottom: 4 }}>
             <Text style={{ fontSize: 12, fontWeight: "600", color: "#374151" }}>
-              {state.risks.length} / 4 risques minimum
+              {state.riskIds.length} / 4 risques minimum
             </Text>
-            <Text style={{ fontSize: 12, color: state.risks.length >= 4 ? "#10b981" : "#f59e0b" }}>
-              {state.risks.length >= 4 ? "✓ Prêt" : "En cours"}
+            <Text style={{ fontSize: 12, color: state.riskIds.length >= 4 ? "#10b981" : "#f59e0b" }}>
+              {state.riskIds.length >= 4 ? "✓ Prêt" : "En cours"}
             </Text>
           </View>
           <View style={{ height: 8, backgroundColor: "#e5e7eb", borderRadius: 999, overflow: "hidden" }}>
             <View
               style={{
-                width: `${Math.min(100, (state.risks.length / 4) * 100)}%`,
+                width: `${Math.min(100, (state.riskIds.length / 4) * 100)}%`,
                 height: 8,
-                backgroundColor: state.risks.length >= 4 ? "#10b981" : "#f59e0b",
+                backgroundColor: state.riskIds.length >= 4 ? "#10b981" : "#f59e0b",
               }}
             />
           </View>
@@ -110,87 +193,15 @@ export default function ProjectRisksListScreen() {
         </View>
 
         {/* Liste des risques */}
-        {state.risks.length > 0 && (
+        {state.riskIds.length > 0 && (
           <View style={{ marginBottom: 16 }}>
             <Text style={{ fontSize: 18, fontWeight: "800", color: "#111827", marginBottom: 12 }}>
-              Risques identifiés ({state.risks.length})
+              Risques identifiés ({state.riskIds.length})
             </Text>
             <View style={{ gap: 12 }}>
-              {state.risks.map((risk, idx) => {
-                const hasResult = !!risk.userResult;
-                const levelColors = hasResult ? getRiskLevelColor(risk.userResult?.classification as string) : { bg: "#f3f4f6", color: "#6b7280" };
-
-                return (
-                  <Pressable
-                    key={risk.id}
-                    onPress={() => handleEditRisk(idx)}
-                    style={{
-                      padding: 16,
-                      borderRadius: 12,
-                      backgroundColor: "#fff",
-                      borderWidth: 1,
-                      borderColor: "#e5e7eb",
-                    }}
-                  >
-                    <View style={{ flexDirection: "row", justifyContent: "space-between", alignItems: "flex-start", marginBottom: 8 }}>
-                      <View style={{ flex: 1 }}>
-                        <Text style={{ fontSize: 14, fontWeight: "800", color: "#111827", marginBottom: 4 }}>
-                          Risque #{idx + 1}
-                        </Text>
-                        <Text style={{ color: "#374151", lineHeight: 20 }}>{risk.description}</Text>
-                      </View>
-                      {hasResult && <Ionicons name="checkmark-circle" size={20} color="#10b981" />}
-                    </View>
-
-                    <View style={{ flexDirection: "row", gap: 8, flexWrap: "wrap", marginTop: 8 }}>
-                      <View style={{ paddingHorizontal: 10, paddingVertical: 4, borderRadius: 999, backgroundColor: "#eef2ff" }}>
-                        <Text style={{ fontSize: 12, fontWeight: "700", color: "#3730a3" }}>{risk.category}</Text>
-                      </View>
-                      <View style={{ paddingHorizontal: 10, paddingVertical: 4, borderRadius: 999, backgroundColor: "#f3f4f6" }}>
-                        <Text style={{ fontSize: 12, fontWeight: "700", color: "#374151" }}>{risk.type}</Text>
-                      </View>
-                      {hasResult && (
-                        <View style={{ paddingHorizontal: 10, paddingVertical: 4, borderRadius: 999, backgroundColor: levelColors.bg }}>
-                          <Text style={{ fontSize: 12, fontWeight: "700", color: levelColors.color }}>
-                            {risk.userResult?.classification}
-                          </Text>
-                        </View>
-                      )}
-                    </View>
-
-                    {hasResult && (
-                      <View style={{ marginTop: 12, flexDirection: "row", gap: 16 }}>
-                        <View>
-                          <Text style={{ fontSize: 10, color: "#6b7280", marginBottom: 2 }}>Gravité</Text>
-                          <Text style={{ fontSize: 16, fontWeight: "800", color: "#111827" }}>{risk.userResult?.G}/5</Text>
-                        </View>
-                        <View>
-                          <Text style={{ fontSize: 10, color: "#6b7280", marginBottom: 2 }}>Fréquence</Text>
-                          <Text style={{ fontSize: 16, fontWeight: "800", color: "#111827" }}>{risk.userResult?.F}/5</Text>
-                        </View>
-                        <View>
-                          <Text style={{ fontSize: 10, color: "#6b7280", marginBottom: 2 }}>Probabilité</Text>
-                          <Text style={{ fontSize: 16, fontWeight: "800", color: "#111827" }}>{risk.userResult?.P}/5</Text>
-                        </View>
-                        <View>
-                          <Text style={{ fontSize: 10, color: "#6b7280", marginBottom: 2 }}>Score</Text>
-                          <Text style={{ fontSize: 16, fontWeight: "800", color: "#111827" }}>
-                            {(risk.userResult?.G || 0) * (risk.userResult?.F || 0) * (risk.userResult?.P || 0)}/125
-                          </Text>
-                        </View>
-                      </View>
-                    )}
-
-                    {!hasResult && (
-                      <View style={{ marginTop: 8, padding: 10, borderRadius: 8, backgroundColor: "#fef3c7" }}>
-                        <Text style={{ fontSize: 12, color: "#92400e", fontWeight: "600" }}>
-                          ⚠️ Évaluation en attente - Cliquez pour évaluer
-                        </Text>
-                      </View>
-                    )}
-                  </Pressable>
-                );
-              })}
+              {state.riskIds.map((id, idx) => (
+                <RiskRow key={id} id={id} index={idx} onEdit={editRisk} />
+              ))}
             </View>
           </View>
         )}
@@ -5,7 +5,7 @@ import { SafeAreaView } from "react-native-safe-area-context";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import { LinearGradient } from "expo-linear-gradient";
 import { useAuthGuard } from "../lib/guard";
-import { getProject, addRiskToProject, deleteRiskFromProject, getConstants } from "../lib/api";
+import { getProject, onProjectRevalidated, addRiskToProject, deleteRiskFromProject, getConstants } from "../lib/api";
 import type { AnalysisProject, Category, RiskType, RiskItem } from "../lib/types";
 
 export default function ProjectRisksScreen() {
@@ -50,6 +50,12 @@ export default function ProjectRisksScreen() {
     })();
   }, [authenticated, projectId]);
 
+  // Rafraîchissement en arrière-plan : afficher la version du serveur
+  useEffect(() => {
+    if (!projectId) return;
+    return onProjectRevalidated(projectId, setProject);
+  }, [projectId]);
+
   const loadProject = async () => {
     try {
       const proj = await getProject(projectId);
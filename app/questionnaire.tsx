@@ -1,6 +1,7 @@
 import React, { useEffect, useMemo, useState } from "react";
 import { View, Text, ActivityIndicator, Pressable, ScrollView } from "react-native";
-import { useAnalysis } from "../context/AnalysisContext";
+import { analysisActions, analysisStore, selectCurrentRisk, useAnalysisStore } from "../context/AnalysisContext";
+import { shallowEqual } from "../lib/store";
 import { getQuestions } from "../lib/api";
 import type { Question } from "../lib/types";
 import { router } from "expo-router";
@@ -9,22 +10,26 @@ import { SafeAreaView } from "react-native-safe-area-context";
 
 export default function QuestionnaireScreen() {
   useAuthGuard();
-  const { state, addAnswer, updateRisk } = useAnalysis();
+  const { addAnswer, updateRisk } = analysisActions;
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [questions, setQuestions] = useState<Question[]>([]);
   const [idx, setIdx] = useState(0);
   
-  // Mode projet multi-risques
-  const isProjectMode = !!state.analysisTitle;
-  const currentRisk = isProjectMode && state.currentRiskIndex !== undefined 
-    ? state.risks[state.currentRiskIndex] 
-    : null;
-
-  const sector = state.sector;
-  const description = isProjectMode ? currentRisk?.description : state.description;
-  const category = isProjectMode ? currentRisk?.category : state.category;
-  const type = isProjectMode ? currentRisk?.type : state.type;
+  // Mode projet multi-risques. Les réponses ne sont pas lues au rendu :
+  // un choix ne re-rend pas l'écran, seule la question suivante s'affiche.
+  const { isProjectMode, currentRiskIndex, sector, description, category, type } = useAnalysisStore((s) => {
+    const isProject = !!s.analysisTitle;
+    const risk = isProject ? selectCurrentRisk(s) : undefined;
+    return {
+      isProjectMode: isProject,
+      currentRiskIndex: s.currentRiskIndex,
+      sector: s.sector,
+      description: isProject ? risk?.description : s.description,
+      category: isProject ? risk?.category : s.category,
+      type: isProject ? risk?.type : s.type,
+    };
+  }, shallowEqual);
 
   useEffect(() => {
     if (!sector || !description || !category || !type) {
@@ -49,13 +54,14 @@ export default function QuestionnaireScreen() {
   const onChoose = (option_id: string) => {
     if (!current) return;
     
-    if (isProjectMode && currentRisk && state.currentRiskIndex !== undefined) {
+    const currentRisk = isProjectMode ? selectCurrentRisk(analysisStore.getState()) : undefined;
+    if (currentRisk && currentRiskIndex !== undefined) {
       // Mode projet: stocker la réponse dans le risque actuel
       const updatedAnswers = [
         ...currentRisk.answers.filter(a => a.question_id !== current.id),
         { question_id: current.id, option_id }
       ];
-      updateRisk(state.currentRiskIndex, { answers: updatedAnswers });
+      updateRisk(currentRiskIndex, { answers: updatedAnswers });
     } else {
       // Mode ancien flux
       addAnswer({ question_id: current.id, option_id });
@@ -78,7 +84,7 @@ export default function QuestionnaireScreen() {
       <View style={{ padding: 16, borderBottomWidth: 1, borderColor: "#e5e7eb" }}>
         {isProjectMode && (
           <Text style={{ fontSize: 12, color: "#7C3AED", fontWeight: "700", marginBottom: 4 }}>
-            Risque #{(state.currentRiskIndex ?? 0) + 1} - {category} / {type}
+            Risque #{(currentRiskIndex ?? 0) + 1} - {category} / {type}
           </Text>
         )}
         <Text style={{ fontSize: 16, color: "#6b7280" }}>Étape {idx + 1} / {total} — Dimension {current!.dimension}</Text>
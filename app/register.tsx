@@ -3,6 +3,7 @@ import { View, Text, TextInput, Pressable, ActivityIndicator, KeyboardAvoidingVi
 import { router } from "expo-router";
 import { signUpWithEmail, signInWithGoogle } from "../lib/auth_client";
 import { completeProfile } from "../lib/api";
+import { log } from "../lib/telemetry";
 import { LinearGradient } from "expo-linear-gradient";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import FontAwesome from "@expo/vector-icons/FontAwesome";
@@ -107,7 +108,7 @@ export default function RegisterScreen() {
           fonction: fonction.trim(),
           entreprise: entreprise.trim()
         });
-        console.log("[Register] Profile completed successfully");
+        log.debug("[Register] Profile completed successfully");
       } catch (profileError: any) {
         console.error("[Register] Failed to complete profile:", profileError);
         // Ne pas bloquer l'inscription si l'API échoue
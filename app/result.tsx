@@ -1,58 +1,86 @@
 import React, { useEffect, useState } from "react";
 import { View, Text, ActivityIndicator, Pressable, ScrollView, Linking, Platform } from "react-native";
-import { useAnalysis } from "../context/AnalysisContext";
+import { analysisActions, analysisStore, selectCurrentRisk, useAnalysisStore } from "../context/AnalysisContext";
+import { shallowEqual } from "../lib/store";
 import RiskMatrix from "../components/RiskMatrix";
-import { analyzeQuestionnaire, getReportUrl } from "../lib/api";
+import { analyzeQuestionnaire, getQuestions, getReportUrl } from "../lib/api";
 import { router } from "expo-router";
 import { SafeAreaView } from "react-native-safe-area-context";
 import { emit } from "../lib/events";
 import { useAuthGuard } from "../lib/guard";
+import { checkConsistency, scoreAnswers, to100, type LocalScore } from "../lib/scoring";
+import { useKinneyThresholds } from "../lib/useKinneyThresholds";
+import type { AnswerItem, Sector } from "../lib/types";
 
 export default function ResultScreen() {
   const { loading: authLoading, authenticated } = useAuthGuard();
-  const { state, setUserResult, updateRisk } = useAnalysis();
+  const { setUserResult, updateRisk } = analysisActions;
+  // Le rendu ne dépend que des résultats ; les réponses sont lues au montage
+  const state = useAnalysisStore((s) => ({
+    analysisTitle: s.analysisTitle,
+    currentRiskIndex: s.currentRiskIndex,
+    currentRiskDescription: selectCurrentRisk(s)?.description,
+    currentRiskResult: selectCurrentRisk(s)?.userResult,
+    userResult: s.userResult,
+  }), shallowEqual);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  // Score calculé sur l'appareil, affiché en attendant la réponse du serveur
+  const [preview, setPreview] = useState<LocalScore | null>(null);
+  const thresholds = useKinneyThresholds();
 
   // Mode projet multi-risques
   const isProjectMode = !!state.analysisTitle;
-  const currentRisk = isProjectMode && state.currentRiskIndex !== undefined 
-    ? state.risks[state.currentRiskIndex] 
-    : null;
+
+  // Les questions sont en cache : l'estimation locale est quasi immédiate
+  const scoreLocally = (sector: Sector, answers: AnswerItem[]) =>
+    getQuestions(sector)
+      .then((resp) => {
+        const local = scoreAnswers(resp.questions || [], answers, thresholds);
+        setPreview(local);
+        return local;
+      })
+      .catch(() => null);
 
   useEffect(() => {
     if (!authenticated) return;
     
+    const initial = analysisStore.getState();
+    const currentRisk = isProjectMode ? selectCurrentRisk(initial) : undefined;
     (async () => {
       try {
         if (isProjectMode && currentRisk) {
           // Mode projet: évaluer le risque actuel
-          if (!currentRisk.description || !currentRisk.category || !currentRisk.type || !state.sector || currentRisk.answers.length === 0) {
+          if (!currentRisk.description || !currentRisk.category || !currentRisk.type || !initial.sector || currentRisk.answers.length === 0) {
             router.replace("/start");
             return;
           }
+          const local = scoreLocally(initial.sector, currentRisk.answers);
           const res = await analyzeQuestionnaire({
             description: currentRisk.description,
             category: currentRisk.category,
             type: currentRisk.type,
-            sector: state.sector,
+            sector: initial.sector,
             answers: currentRisk.answers,
           });
+          checkConsistency(await local, res, "questionnaire");
           // Stocker le résultat dans le risque
-          updateRisk(state.currentRiskIndex!, { userResult: res });
+          updateRisk(initial.currentRiskIndex!, { userResult: res });
         } else {
           // Mode ancien flux
-          if (!state.description || !state.category || !state.type || !state.sector || state.answers.length === 0) {
+          if (!initial.description || !initial.category || !initial.type || !initial.sector || initial.answers.length === 0) {
             router.replace("/start");
             return;
           }
+          const local = scoreLocally(initial.sector, initial.answers);
           const res = await analyzeQuestionnaire({
-            description: state.description,
-            category: state.category,
-            type: state.type,
-            sector: state.sector,
-            answers: state.answers,
+            description: initial.description,
+            category: initial.category,
+            type: initial.type,
+            sector: initial.sector,
+            answers: initial.answers,
           });
+          checkConsistency(await local, res, "questionnaire");
           setUserResult(res);
           emit("analysis:created", res);
         }
@@ -64,15 +92,14 @@ export default function ResultScreen() {
     })();
   }, [authenticated]);
 
-  if (loading) return <View style={{ flex:1, justifyContent: "center", alignItems: "center"}}><ActivityIndicator /></View>;
+  if (loading && !preview) return <View style={{ flex:1, justifyContent: "center", alignItems: "center"}}><ActivityIndicator /></View>;
   if (error) return <View style={{ padding: 16 }}><Text style={{ color: "red" }}>{error}</Text></View>;
   
-  // Récupérer le résultat selon le mode
-  const result = isProjectMode && currentRisk ? currentRisk.userResult : state.userResult;
-  if (!result) return <View style={{ padding: 16 }}><Text>Pas de résultat</Text></View>;
+  // Récupérer le résultat selon le mode (le serveur fait foi une fois sa réponse reçue)
+  const result = loading ? null : isProjectMode && state.currentRiskDescription !== undefined ? state.currentRiskResult : state.userResult;
+  const r = result ?? preview;
+  if (!r) return <View style={{ padding: 16 }}><Text>Pas de résultat</Text></View>;
 
-  const r = result;
-  const to100 = (raw: number) => Math.round((raw / 125) * 100);
   const labelMap: Record<string, "Faible" | "Modéré" | "Élevé"> = {
     Faible: "Faible",
     Modéré: "Modéré",
@@ -102,10 +129,10 @@ export default function ResultScreen() {
         {isProjectMode ? `Résultat - Risque #${(state.currentRiskIndex ?? 0) + 1}` : "Résultat de votre analyse"}
       </Text>
       
-      {isProjectMode && currentRisk && (
+      {isProjectMode && state.currentRiskDescription !== undefined && (
         <View style={{ marginTop: 8, padding: 12, borderRadius: 8, backgroundColor: "#f5f3ff", borderLeftWidth: 4, borderLeftColor: "#7C3AED" }}>
           <Text style={{ fontSize: 12, color: "#6b7280", marginBottom: 4 }}>Description du risque</Text>
-          <Text style={{ color: "#374151", lineHeight: 20 }}>{currentRisk.description}</Text>
+          <Text style={{ color: "#374151", lineHeight: 20 }}>{state.currentRiskDescription}</Text>
         </View>
       )}
 
@@ -113,17 +140,24 @@ export default function ResultScreen() {
         <Text style={{ fontSize: 16, color: "#6b7280" }}>Niveau de risque</Text>
         <Text style={{ fontSize: 28, fontWeight: "800", color }}>{cls}</Text>
         <Text style={{ marginTop: 6 }}>Justification</Text>
-        <Text style={{ color: "#374151" }}>{r.justification || ""}</Text>
+        {result ? (
+          <Text style={{ color: "#374151" }}>{result.justification || ""}</Text>
+        ) : (
+          <View style={{ flexDirection: "row", alignItems: "center", gap: 8 }}>
+            <ActivityIndicator size="small" />
+            <Text style={{ color: "#6b7280" }}>Estimation locale — confirmation en cours…</Text>
+          </View>
+        )}
       </View>
 
       <View style={{ marginTop: 16, padding: 12, borderRadius: 8, backgroundColor: "#f9fafb" }}>
         <Text>G: {r.G}   F: {r.F}   P: {r.P}   Score estimé: {R100}/100</Text>
       </View>
 
-      {!isProjectMode && (
+      {!isProjectMode && result && (
         <>
           <Pressable
-            onPress={() => Linking.openURL(getReportUrl(r.id))}
+            onPress={() => Linking.openURL(getReportUrl(result.id))}
             style={{ marginTop: 12, padding: 14, borderRadius: 8, backgroundColor: "#2563eb", alignItems: "center" }}
           >
             <Text style={{ color: "white", fontWeight: "600" }}>Télécharger le rapport (.docx)</Text>
@@ -157,7 +191,8 @@ export default function ResultScreen() {
       {/* Bouton pour continuer */}
       <Pressable
         onPress={handleContinue}
-        style={{ marginTop: 24, padding: 14, borderRadius: 8, backgroundColor: "#7C3AED", alignItems: "center" }}
+        disabled={loading}
+        style={{ marginTop: 24, padding: 14, borderRadius: 8, backgroundColor: "#7C3AED", alignItems: "center", opacity: loading ? 0.6 : 1 }}
       >
         <Text style={{ color: "white", fontWeight: "600" }}>
           {isProjectMode ? "Retour à la liste des risques" : "Aller au dashboard"}
@@ -4,9 +4,10 @@ import { router, useLocalSearchParams } from "expo-router";
 import { SafeAreaView } from "react-native-safe-area-context";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import { LinearGradient } from "expo-linear-gradient";
-import { getProject } from "../lib/api";
-import type { AnalysisProject } from "../lib/types";
+import { getProject, getCachedRiskComparison } from "../lib/api";
+import type { AnalysisProject, CompareResponse } from "../lib/types";
 import { useAuthGuard } from "../lib/guard";
+import { to100 } from "../lib/scoring";
 
 function Badge({ label, bg, color }: { label: string; bg: string; color: string }) {
   return (
@@ -33,17 +34,18 @@ export default function RiskIADetailScreen() {
   const params = useLocalSearchParams();
   const riskId = params.riskId as string;
   const projectId = params.projectId as string;
-  let comparisonData: any = null;
-  try {
-    comparisonData = params.comparisonData ? JSON.parse(params.comparisonData as string) : null;
-  } catch (e) {
-    comparisonData = null;
-  }
-  const to100 = (raw: number) => Math.round((raw / 125) * 100);
 
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [risk, setRisk] = useState<any>(null);
+  // Transmise par l'écran parent ; à défaut, relue depuis le cache des comparaisons IA
+  const [comparisonData, setComparisonData] = useState<CompareResponse | null>(() => {
+    try {
+      return params.comparisonData ? JSON.parse(params.comparisonData as string) : null;
+    } catch (e) {
+      return null;
+    }
+  });
 
   useEffect(() => {
     if (!authenticated || !projectId || !riskId) return;
@@ -56,6 +58,10 @@ export default function RiskIADetailScreen() {
           setError("Risque introuvable");
         } else {
           setRisk(foundRisk);
+          if (!params.comparisonData) {
+            const cached = await getCachedRiskComparison(foundRisk);
+            if (cached) setComparisonData(cached);
+          }
         }
       } catch (e: any) {
         setError(e?.message || "Impossible de charger le risque");
@@ -63,7 +69,7 @@ export default function RiskIADetailScreen() {
         setLoading(false);
       }
     })();
-  }, [authenticated, projectId, riskId]);
+  }, [authenticated, projectId, riskId, params.comparisonData]);
 
   const classBadge = (cls?: string) => {
     const s = (cls || "").toLowerCase();
@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from "react";
 import { View, Text, TextInput, Pressable, ActivityIndicator, ScrollView } from "react-native";
-import { useAnalysis } from "../context/AnalysisContext";
+import { analysisActions, analysisStore, selectCurrentRisk, useAnalysisStore } from "../context/AnalysisContext";
+import { shallowEqual } from "../lib/store";
 import { getConstants } from "../lib/api";
 import type { Category, RiskType } from "../lib/types";
 import { router } from "expo-router";
@@ -10,7 +11,15 @@ import Ionicons from "@expo/vector-icons/Ionicons";
 import type { RiskInProgress } from "../context/AnalysisContext";
 
 export default function RiskScreen() {
-  const { state, setRiskInfo, addRisk, updateRisk } = useAnalysis();
+  const { setRiskInfo, addRisk, updateRisk } = analysisActions;
+  const state = useAnalysisStore((s) => ({
+    analysisTitle: s.analysisTitle,
+    currentRiskIndex: s.currentRiskIndex,
+    riskCount: s.riskIds.length,
+    description: s.description,
+    category: s.category,
+    type: s.type,
+  }), shallowEqual);
   useAuthGuard();
   const [categories, setCategories] = useState<Category[]>([]);
   const [types, setTypes] = useState<RiskType[]>([]);
@@ -18,8 +27,9 @@ export default function RiskScreen() {
   const [error, setError] = useState<string | null>(null);
 
   // Vérifier si on édite un risque existant ou on en crée un nouveau
-  const isEditing = state.currentRiskIndex !== undefined && state.currentRiskIndex < state.risks.length;
-  const currentRisk = isEditing ? state.risks[state.currentRiskIndex!] : null;
+  const isEditing = state.currentRiskIndex !== undefined && state.currentRiskIndex < state.riskCount;
+  // Valeurs initiales du formulaire : lues une fois, pas d'abonnement aux réponses du risque
+  const [currentRisk] = useState(() => (isEditing ? selectCurrentRisk(analysisStore.getState()) ?? null : null));
 
   const [description, setDescription] = useState(currentRisk?.description || state.description || "");
   const [category, setCategory] = useState<Category | undefined>(currentRisk?.category || state.category);
@@ -86,7 +96,7 @@ export default function RiskScreen() {
           </Text>
           {state.analysisTitle && (
             <Text style={{ fontSize: 12, color: "#6b7280", marginTop: 2 }}>
-              Risque #{(state.currentRiskIndex ?? state.risks.length) + 1}
+              Risque #{(state.currentRiskIndex ?? state.riskCount) + 1}
             </Text>
           )}
         </View>
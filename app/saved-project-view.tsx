@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { View, Text, Pressable, ScrollView, ActivityIndicator, Alert, TextInput, Modal } from "react-native";
 import { router, useLocalSearchParams } from "expo-router";
 import { Platform } from "react-native";
@@ -6,13 +6,17 @@ import { SafeAreaView } from "react-native-safe-area-context";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import { LinearGradient } from "expo-linear-gradient";
 import { useAuthGuard } from "../lib/guard";
-import { getProject, deleteProject, duplicateProject, updateProject, analyzeProjectWithIA, listProjects } from "../lib/api";
-import { generateProjectExcelAdvanced, generateComparativeExcelAdvanced } from "../lib/excelExportAdvanced";
-import type { AnalysisProject, CompareResponse } from "../lib/types";
+import { getProject, onProjectRevalidated, deleteProject, duplicateProject, updateProject, analyzeProjectWithIA, listProjects } from "../lib/api";
+import { log } from "../lib/telemetry";
+import { generateProjectExcel, generateComparativeExcel } from "../lib/excelExport";
+import type { AnalysisProject, CompareResponse, ProjectAIComparison } from "../lib/types";
+import { isAbortError } from "../lib/aiStream";
+import { scoreBatch, to100 } from "../lib/scoring";
+import { useKinneyThresholds } from "../lib/useKinneyThresholds";
 
 export default function SavedProjectViewScreen() {
-  const to100 = (raw: number) => Math.round((raw / 125) * 100);
   const { loading: authLoading, authenticated } = useAuthGuard();
+  const thresholds = useKinneyThresholds();
   const params = useLocalSearchParams();
   const projectId = params.projectId as string;
 
@@ -23,7 +27,8 @@ export default function SavedProjectViewScreen() {
   const [exporting, setExporting] = useState(false);
   const [analyzingIA, setAnalyzingIA] = useState(false);
   const [duplicating, setDuplicating] = useState(false);
-  const [iaAnalysisResults, setIAAnalysisResults] = useState<any>(null);
+  const [iaAnalysisResults, setIAAnalysisResults] = useState<{ comparisons: ProjectAIComparison[] } | null>(null);
+  const iaAbort = useRef<AbortController | null>(null);
   const [showEditModal, setShowEditModal] = useState(false);
   const [editTitle, setEditTitle] = useState("");
   const [editDescription, setEditDescription] = useState("");
@@ -33,6 +38,15 @@ export default function SavedProjectViewScreen() {
     loadProject();
   }, [authenticated, projectId]);
 
+  // Rafraîchissement en arrière-plan : afficher la version du serveur
+  useEffect(() => {
+    if (!projectId) return;
+    return onProjectRevalidated(projectId, setProject);
+  }, [projectId]);
+
+  // Quitter l'écran interrompt l'analyse IA en cours
+  useEffect(() => () => iaAbort.current?.abort(), []);
+
   const loadProject = async () => {
     try {
       const proj = await getProject(projectId);
@@ -74,8 +88,8 @@ export default function SavedProjectViewScreen() {
     if (!project) return;
     setExporting(true);
     try {
-      await generateProjectExcelAdvanced(project);
-      Alert.alert("Succès", "Le rapport Excel a été généré avec succès");
+      const result = await generateProjectExcel(project);
+      if (result) Alert.alert("Succès", "Le rapport Excel a été généré avec succès");
     } catch (e: any) {
       Alert.alert("Erreur", e?.message || "Impossible d'exporter le rapport");
     } finally {
@@ -83,18 +97,19 @@ export default function SavedProjectViewScreen() {
     }
   };
 
-  const handleAnalyzeWithIA = async () => {
-    console.log("[SavedProjectView] handleAnalyzeWithIA called");
+  // force : ignorer les comparaisons en cache et tout renvoyer à l'IA
+  const handleAnalyzeWithIA = async (force = false) => {
+    log.debug("[SavedProjectView] handleAnalyzeWithIA called");
     if (!project) {
-      console.log("[SavedProjectView] No project found");
+      log.debug("[SavedProjectView] No project found");
       return;
     }
     
-    console.log("[SavedProjectView] Project:", project.id, "Risks:", project.risks.length);
+    log.debug("[SavedProjectView] Project:", project.id, "Risks:", project.risks.length);
     
     // Validation : tous les risques doivent avoir une mesure et une évaluation résiduelle
     const incompleteRisks = project.risks.filter(r => !r.residual_evaluation || !r.mitigation_measure);
-    console.log("[SavedProjectView] Incomplete risks:", incompleteRisks.length);
+    log.debug("[SavedProjectView] Incomplete risks:", incompleteRisks.length);
     
     if (incompleteRisks.length > 0) {
       Alert.alert(
@@ -105,13 +120,23 @@ export default function SavedProjectViewScreen() {
       return;
     }
 
+    const controller = new AbortController();
+    iaAbort.current = controller;
     setAnalyzingIA(true);
+    setIAAnalysisResults({ comparisons: [] });
     try {
-      console.log("[SavedProjectView] Calling analyzeProjectWithIA API...");
-      const result = await analyzeProjectWithIA(projectId);
-      console.log("[SavedProjectView] API result:", result);
-      
-      // Stocker les résultats pour affichage
+      log.debug("[SavedProjectView] Calling analyzeProjectWithIA API...");
+      // Les comparaisons s'affichent au fur et à mesure (cache d'abord, puis flux serveur)
+      const result = await analyzeProjectWithIA(projectId, {
+        risks: project.risks,
+        signal: controller.signal,
+        force,
+        onComparison: (comp) =>
+          setIAAnalysisResults((prev) => ({
+            comparisons: [...(prev?.comparisons || []).filter((c) => c.risk_id !== comp.risk_id), comp],
+          })),
+      });
+      log.debug("[SavedProjectView] API result:", result.comparisons.length, "comparisons");
       setIAAnalysisResults(result);
       
       Alert.alert(
@@ -120,13 +145,20 @@ export default function SavedProjectViewScreen() {
         [{ text: "OK" }]
       );
     } catch (e: any) {
+      // Annulation : on garde les comparaisons déjà reçues
+      if (isAbortError(e)) return;
       console.error("[SavedProjectView] Error:", e);
       Alert.alert("Erreur", e?.message || "Impossible de lancer l'analyse IA");
     } finally {
+      if (iaAbort.current === controller) iaAbort.current = null;
       setAnalyzingIA(false);
     }
   };
 
+  const cancelAnalyzeWithIA = () => {
+    iaAbort.current?.abort();
+  };
+
   // Détecte si le projet est déjà une copie éditable
   const isEditableCopy = (title: string): boolean => {
     return /_v\d+$/.test(title); // Vérifie si le titre se termine par _v2, _v3, etc.
@@ -212,9 +244,12 @@ export default function SavedProjectViewScreen() {
   const completedRisks = project.risks.filter((r) => r.residual_evaluation !== null && r.mitigation_measure).length;
   const isComplete = project.status === "completed";
   const allRisksComplete = completedRisks >= project.risks.length;
+  // Répartition par niveau, calculée localement en une passe sur tout le projet
+  const initialCounts = scoreBatch(project.risks.map((r) => r.initial_evaluation), [], thresholds).counts;
+  const residualCounts = scoreBatch(project.risks.map((r) => r.residual_evaluation), [], thresholds).counts;
   
-  console.log("[SavedProjectView] Completed risks:", completedRisks, "/", project.risks.length);
-  console.log("[SavedProjectView] All complete:", allRisksComplete);
+  log.debug("[SavedProjectView] Completed risks:", completedRisks, "/", project.risks.length);
+  log.debug("[SavedProjectView] All complete:", allRisksComplete);
 
   return (
     <SafeAreaView style={{ flex: 1, backgroundColor: "#f9fafb" }}>
@@ -241,6 +276,10 @@ export default function SavedProjectViewScreen() {
           <Text style={{ marginTop: 4, color: isComplete ? "#065f46" : "#92400e" }}>
             {completedRisks} / {project.risks.length} risques traités
           </Text>
+          <Text style={{ marginTop: 4, fontSize: 12, color: isComplete ? "#065f46" : "#92400e" }}>
+            Initial : {initialCounts[0]} faible(s) · {initialCounts[1]} moyen(s) · {initialCounts[2]} élevé(s)
+            {completedRisks > 0 ? `\nRésiduel : ${residualCounts[0]} faible(s) · ${residualCounts[1]} moyen(s) · ${residualCounts[2]} élevé(s)` : ""}
+          </Text>
         </View>
 
         {/* Titre */}
@@ -405,12 +444,22 @@ export default function SavedProjectViewScreen() {
             </View>
 
             <Text style={{ fontSize: 14, color: "#6b7280", marginBottom: 16 }}>
-              {iaAnalysisResults.comparisons.length} risque(s) analysé(s) par l'IA
+              {analyzingIA
+                ? `Analyse en cours : ${iaAnalysisResults.comparisons.length}/${project.risks.length} risque(s)…`
+                : `${iaAnalysisResults.comparisons.length} risque(s) analysé(s) par l'IA`}
             </Text>
 
-            {iaAnalysisResults.comparisons.map((comp: any, idx: number) => {
-              const risk = project.risks.find((r) => r.id === comp.risk_id);
-              if (!risk) return null;
+            {/* Les résultats peuvent venir du cache : permettre une nouvelle analyse complète */}
+            {!analyzingIA && iaAnalysisResults.comparisons.length > 0 && (
+              <Pressable onPress={() => handleAnalyzeWithIA(true)} style={{ flexDirection: "row", alignItems: "center", gap: 6, alignSelf: "flex-start", marginTop: -8, marginBottom: 16 }}>
+                <Ionicons name="refresh" size={16} color="#7C3AED" />
+                <Text style={{ color: "#7C3AED", fontWeight: "700" }}>Relancer l'analyse IA (sans cache)</Text>
+              </Pressable>
+            )}
+
+            {project.risks.map((risk, idx) => {
+              const comp = iaAnalysisResults.comparisons.find((c) => c.risk_id === risk.id);
+              if (!comp) return null;
 
               const agreement = comp.comparison.agreement_level;
               const agreementColor = 
@@ -424,10 +473,12 @@ export default function SavedProjectViewScreen() {
                     // Naviguer vers une page de détail avec les données de comparaison
                     router.push({
                       pathname: "/risk-ia-detail",
+                      // La comparaison affichée est transmise : l'entrée du cache local
+                      // a pu expirer ou être évincée depuis
                       params: {
                         riskId: comp.risk_id,
                         projectId: projectId,
-                        comparisonData: JSON.stringify(comp)
+                        comparisonData: JSON.stringify(comp),
                       }
                     });
                   }}
@@ -472,40 +523,42 @@ export default function SavedProjectViewScreen() {
             })}
 
             {/* Bouton pour télécharger l'Excel comparatif */}
-            <Pressable
-              onPress={async () => {
-                try {
-                  const iaComparisons = iaAnalysisResults.comparisons.map((comp: any) => {
-                    const risk = project.risks.find((r) => r.id === comp.risk_id);
-                    if (!risk) throw new Error("Risque introuvable");
-                    
-                    const comparison: CompareResponse = {
-                      human_analysis: comp.human_analysis,
-                      ia_analysis: comp.ia_analysis,
-                      comparison: comp.comparison
-                    };
+            {!analyzingIA && iaAnalysisResults.comparisons.length > 0 && (
+              <Pressable
+                onPress={async () => {
+                  try {
+                    const iaComparisons = iaAnalysisResults.comparisons.map((comp) => {
+                      const risk = project.risks.find((r) => r.id === comp.risk_id);
+                      if (!risk) throw new Error("Risque introuvable");
+                      
+                      const comparison: CompareResponse = {
+                        human_analysis: comp.human_analysis,
+                        ia_analysis: comp.ia_analysis,
+                        comparison: comp.comparison
+                      };
+                      
+                      return { risk, comparison };
+                    });
                     
-                    return { risk, comparison };
-                  });
-                  
-                  await generateComparativeExcelAdvanced(project, iaComparisons);
-                  Alert.alert("Succès", "Le rapport Excel comparatif a été téléchargé");
-                } catch (e: any) {
-                  Alert.alert("Erreur", "Impossible de générer le rapport Excel");
-                }
-              }}
-              style={{ borderRadius: 12, overflow: "hidden", marginTop: 8 }}
-            >
-              <LinearGradient
-                colors={["#7C3AED", "#2563EB"]}
-                start={{ x: 0, y: 0 }}
-                end={{ x: 1, y: 1 }}
-                style={{ paddingVertical: 14, alignItems: "center", flexDirection: "row", justifyContent: "center", gap: 8 }}
+                    const result = await generateComparativeExcel(project, iaComparisons);
+                    if (result) Alert.alert("Succès", "Le rapport Excel comparatif a été téléchargé");
+                  } catch (e: any) {
+                    Alert.alert("Erreur", "Impossible de générer le rapport Excel");
+                  }
+                }}
+                style={{ borderRadius: 12, overflow: "hidden", marginTop: 8 }}
               >
-                <Ionicons name="download" size={20} color="#fff" />
-                <Text style={{ color: "white", fontWeight: "700", fontSize: 15 }}>Télécharger rapport Excel comparatif</Text>
-              </LinearGradient>
-            </Pressable>
+                <LinearGradient
+                  colors={["#7C3AED", "#2563EB"]}
+                  start={{ x: 0, y: 0 }}
+                  end={{ x: 1, y: 1 }}
+                  style={{ paddingVertical: 14, alignItems: "center", flexDirection: "row", justifyContent: "center", gap: 8 }}
+                >
+                  <Ionicons name="download" size={20} color="#fff" />
+                  <Text style={{ color: "white", fontWeight: "700", fontSize: 15 }}>Télécharger rapport Excel comparatif</Text>
+                </LinearGradient>
+              </Pressable>
+            )}
           </View>
         )}
 
@@ -569,10 +622,9 @@ export default function SavedProjectViewScreen() {
             </LinearGradient>
           </Pressable>
 
-          {/* Lancer analyse IA */}
+          {/* Lancer analyse IA (appui pendant l'analyse : annulation) */}
           <Pressable
-            onPress={handleAnalyzeWithIA}
-            disabled={analyzingIA}
+            onPress={analyzingIA ? cancelAnalyzeWithIA : () => handleAnalyzeWithIA()}
             style={{ borderRadius: 12, overflow: "hidden" }}
           >
             <LinearGradient
@@ -582,7 +634,10 @@ export default function SavedProjectViewScreen() {
               style={{ paddingVertical: 16, alignItems: "center", flexDirection: "row", justifyContent: "center", gap: 8 }}
             >
               {analyzingIA ? (
-                <ActivityIndicator color="#fff" />
+                <>
+                  <ActivityIndicator color="#fff" />
+                  <Text style={{ color: "white", fontWeight: "700", fontSize: 16 }}>Annuler l'analyse IA</Text>
+                </>
               ) : (
                 <>
                   <Ionicons name="sparkles" size={20} color="#fff" />
@@ -3,7 +3,7 @@ import { View, Text, ActivityIndicator, Pressable, TextInput, Platform, ScrollVi
 import { router } from "expo-router";
 import Ionicons from "@expo/vector-icons/Ionicons";
 import { LinearGradient } from "expo-linear-gradient";
-import { useAnalysis } from "../context/AnalysisContext";
+import { analysisActions, analysisStore } from "../context/AnalysisContext";
 import { getConstants } from "../lib/api";
 import { useAuthGuard } from "../lib/guard";
 import { SafeAreaView } from "react-native-safe-area-context";
@@ -20,7 +20,9 @@ const ENTITY_TYPES: EntityType[] = [
 
 export default function StartScreen() {
   useAuthGuard();
-  const { state, setProjectInfo } = useAnalysis();
+  const { setProjectInfo } = analysisActions;
+  // Valeurs initiales du formulaire seulement : pas d'abonnement au store
+  const [state] = useState(analysisStore.getState);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [sectors, setSectors] = useState<string[]>([]);
@@ -1,7 +1,8 @@
 import React, { useEffect, useState } from 'react';
-import { View, Text, Pressable, ScrollView } from 'react-native';
+import { View, Text, Pressable, ScrollView, Platform } from 'react-native';
 import { getIdToken, clearTokenCache, refreshToken } from '../lib/auth';
 import { getFirebaseAuth, initFirebaseApp } from '../lib/firebase';
+import { exportTelemetry, getTelemetry, resetTelemetry, log, type HistogramSummary } from '../lib/telemetry';
 
 /**
  * Composant de debug pour afficher l'état d'authentification
@@ -128,3 +129,143 @@ export function AuthDebug() {
     </View>
   );
 }
+
+const ms = (h: HistogramSummary) => (h.count ? `${h.p50} / ${h.p95} ms` : '-');
+
+const kb = (chars: number) => (chars >= 1024 ? `${(chars / 1024).toFixed(1)} ko` : `${chars} o`);
+
+/**
+ * Écrit les métriques en JSON puis les partage (mobile) ou les télécharge (web).
+ */
+async function shareTelemetry() {
+  const json = exportTelemetry();
+  const filename = `safeqore-telemetry-${Date.now()}.json`;
+  if (Platform.OS === 'web') {
+    const url = URL.createObjectURL(new Blob([json], { type: 'application/json' }));
+    const a = document.createElement('a');
+    a.href = url;
+    a.download = filename;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    URL.revokeObjectURL(url);
+    return;
+  }
+  const FileSystem = require('expo-file-system');
+  const Sharing = require('expo-sharing');
+  const file = new FileSystem.File(FileSystem.Paths.cache, filename);
+  file.create();
+  file.write(json);
+  if (await Sharing.isAvailableAsync()) {
+    await Sharing.shareAsync(file.uri, { mimeType: 'application/json', dialogTitle: 'Exporter les métriques' });
+  }
+}
+
+/**
+ * Métriques collectées par lib/telemetry.ts : latence (p50 / p95) et taille
+ * moyenne des réponses par endpoint, taux de cache, attente du jeton et temps
+ * jusqu'à l'interactivité de chaque écran.
+ */
+export function TelemetryDebug() {
+  const [snapshot, setSnapshot] = useState(getTelemetry);
+
+  useEffect(() => {
+    const timer = setInterval(() => setSnapshot(getTelemetry()), 1000);
+    return () => clearInterval(timer);
+  }, []);
+
+  const row = { fontFamily: 'monospace', fontSize: 11 } as const;
+  const { startup, auth } = snapshot;
+
+  return (
+    <View style={{ padding: 16, backgroundColor: '#f3f4f6', borderRadius: 8, margin: 16 }}>
+      <Text style={{ fontSize: 18, fontWeight: 'bold', marginBottom: 12 }}>⏱️ Performances</Text>
+
+      <ScrollView style={{ maxHeight: 400 }}>
+        <Text style={{ fontWeight: '600', marginBottom: 4 }}>Démarrage</Text>
+        <Text style={row}>
+          JS chargé à {Math.round(startup.jsStartMs)} ms
+          {startup.firstScreen ? `, ${startup.firstScreen.route} interactif à ${Math.round(startup.firstScreen.ms)} ms` : ''}
+        </Text>
+
+        <Text style={{ fontWeight: '600', marginTop: 12, marginBottom: 4 }}>Jeton d'authentification (p50 / p95)</Text>
+        <Text style={row}>
+          {ms(auth.wait)} · cache {auth.sources.cache} · rafraîchi {auth.sources.refresh} · absent {auth.sources.none}
+        </Text>
+
+        <Text style={{ fontWeight: '600', marginTop: 12, marginBottom: 4 }}>Endpoints (p50 / p95)</Text>
+        {Object.entries(snapshot.endpoints).map(([key, e]) => (
+          <Text key={key} style={row}>
+            {key} · {e.calls}× {ms(e.latency)} · {kb(e.avgResponseSize)}
+            {e.cache.hitRate !== null ? ` · cache ${Math.round(e.cache.hitRate * 100)} %` : ''}
+            {e.errors ? ` · ${e.errors} erreur(s)` : ''}
+          </Text>
+        ))}
+
+        <Text style={{ fontWeight: '600', marginTop: 12, marginBottom: 4 }}>Écrans, temps jusqu'à l'interactivité (p50 / p95)</Text>
+        {Object.entries(snapshot.screens).map(([route, h]) => (
+          <Text key={route} style={row}>
+            {route} · {h.count}× {ms(h)}
+          </Text>
+        ))}
+      </ScrollView>
+
+      <View style={{ flexDirection: 'row', gap: 8, marginTop: 12, flexWrap: 'wrap' }}>
+        <Pressable
+          onPress={() => shareTelemetry().catch((e) => log.warn('[Telemetry] Export failed:', e))}
+          style={{ padding: 10, backgroundColor: '#3b82f6', borderRadius: 6 }}
+        >
+          <Text style={{ color: 'white', fontWeight: '600' }}>Exporter JSON</Text>
+        </Pressable>
+
+        <Pressable
+          onPress={() => {
+            resetTelemetry();
+            setSnapshot(getTelemetry());
+          }}
+          style={{ padding: 10, backgroundColor: '#ef4444', borderRadius: 6 }}
+        >
+          <Text style={{ color: 'white', fontWeight: '600' }}>Réinitialiser</Text>
+        </Pressable>
+      </View>
+    </View>
+  );
+}
+
+/**
+ * Bouton flottant ouvrant les panneaux de debug (authentification et
+ * performances) par-dessus l'écran courant. Monté en développement seulement.
+ */
+export function DebugOverlay() {
+  const [open, setOpen] = useState(false);
+
+  return (
+    <>
+      {open && (
+        <View style={{ position: 'absolute', top: 0, left: 0, right: 0, bottom: 0, backgroundColor: 'rgba(17,24,39,0.6)', paddingTop: 48 }}>
+          <ScrollView>
+            <TelemetryDebug />
+            <AuthDebug />
+          </ScrollView>
+        </View>
+      )}
+      <Pressable
+        onPress={() => setOpen((o) => !o)}
+        style={{
+          position: 'absolute',
+          right: 16,
+          bottom: 96,
+          width: 44,
+          height: 44,
+          borderRadius: 22,
+          alignItems: 'center',
+          justifyContent: 'center',
+          backgroundColor: open ? '#ef4444' : '#111827',
+          opacity: 0.85,
+        }}
+      >
+        <Text style={{ color: 'white', fontSize: 18 }}>{open ? '✕' : '⏱️'}</Text>
+      </Pressable>
+    </>
+  );
+}
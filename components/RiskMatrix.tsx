@@ -12,7 +12,7 @@ function cellColor(g: number, p: number) {
   return "#fee2e2"; // red-100
 }
 
-export default function RiskMatrix({ G, P }: { G: number; P: number }) {
+function RiskMatrix({ G, P }: { G: number; P: number }) {
   const rows = [5,4,3,2,1];
   const cols = [1,2,3,4,5];
 
@@ -50,3 +50,6 @@ export default function RiskMatrix({ G, P }: { G: number; P: number }) {
     </View>
   );
 }
+
+// Memoized: rendered once per row in long lists (history)
+export default React.memo(RiskMatrix);
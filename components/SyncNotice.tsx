@@ -0,0 +1,99 @@
+import React, { useEffect, useState } from 'react';
+import { View, Text, Pressable, Alert, Platform } from 'react-native';
+import { on, takePending } from '../lib/events';
+import type { OutboxOp } from '../lib/outbox';
+
+const LABELS: Record<OutboxOp['type'], string> = {
+  createProject: 'La création du projet',
+  updateProject: 'La modification du projet',
+  deleteProject: 'La suppression du projet',
+  addRisk: 'La création du risque',
+  updateRiskMitigation: 'La mesure de réduction',
+  deleteRisk: 'La suppression du risque',
+  deleteUserAnalysis: "La suppression de l'analyse",
+};
+
+function subject(op: OutboxOp): string {
+  const title = op.payload?.data?.analysis_title || op.payload?.data?.description;
+  return title ? `${LABELS[op.type]} « ${title} »` : LABELS[op.type];
+}
+
+const conflictMessage = ({ op }: { op: OutboxOp }) =>
+  `${subject(op)} n'a pas été enregistrée : le projet a été modifié ailleurs entre-temps. La version du serveur a été conservée.`;
+
+const failedMessage = ({ op, error, dependents }: { op: OutboxOp; error?: string; dependents: number }) =>
+  `${subject(op)} a été refusée par le serveur${error ? ` (${error})` : ''}.` +
+  (dependents ? ` Les modifications qui en dépendaient ont aussi été annulées (${dependents}).` : '');
+
+/**
+ * Demande confirmation avant une déconnexion qui perdrait des modifications
+ * faites hors ligne et pas encore envoyées au serveur.
+ */
+export function confirmDiscardPending(pending: number): Promise<boolean> {
+  const title = 'Modifications non synchronisées';
+  const message =
+    `${pending} modification(s) faite(s) hors ligne n'ont pas pu être envoyées au serveur. ` +
+    'Elles seront perdues si vous vous déconnectez maintenant.';
+  if (Platform.OS === 'web') {
+    return Promise.resolve(typeof window !== 'undefined' && window.confirm(`${title}\n\n${message}`));
+  }
+  return new Promise((resolve) => {
+    Alert.alert(title, message, [
+      { text: 'Annuler', style: 'cancel', onPress: () => resolve(false) },
+      { text: 'Se déconnecter', style: 'destructive', onPress: () => resolve(true) },
+    ], { cancelable: true, onDismiss: () => resolve(false) });
+  });
+}
+
+/**
+ * Bandeau affiché quand une modification faite hors ligne n'a pas pu être
+ * synchronisée (conflit avec une version plus récente, ou refus du serveur).
+ */
+export function SyncNotice() {
+  const [messages, setMessages] = useState<string[]>([]);
+
+  useEffect(() => {
+    const push = (message: string) => setMessages((m) => [...m, message]);
+    // Événements émis avant le montage (premier rejeu au démarrage)
+    takePending('outbox:conflict').forEach((e) => push(conflictMessage(e)));
+    takePending('outbox:failed').forEach((e) => push(failedMessage(e)));
+    const offConflict = on('outbox:conflict', (e) => push(conflictMessage(e)));
+    const offFailed = on('outbox:failed', (e) => push(failedMessage(e)));
+    return () => {
+      offConflict();
+      offFailed();
+    };
+  }, []);
+
+  if (!messages.length) return null;
+
+  return (
+    <View
+      style={{
+        position: 'absolute',
+        left: 16,
+        right: 16,
+        bottom: 24,
+        backgroundColor: '#FEF3C7',
+        borderColor: '#F59E0B',
+        borderWidth: 1,
+        borderRadius: 8,
+        padding: 12,
+        shadowColor: '#000',
+        shadowOpacity: 0.15,
+        shadowRadius: 6,
+        elevation: 4,
+      }}
+    >
+      <Text style={{ fontWeight: '700', color: '#92400E', marginBottom: 4 }}>Synchronisation</Text>
+      {messages.map((message, i) => (
+        <Text key={i} style={{ color: '#92400E', marginBottom: 4 }}>
+          {message}
+        </Text>
+      ))}
+      <Pressable onPress={() => setMessages([])} style={{ alignSelf: 'flex-end', paddingVertical: 4, paddingHorizontal: 8 }}>
+        <Text style={{ color: '#92400E', fontWeight: '600' }}>OK</Text>
+      </Pressable>
+    </View>
+  );
+}
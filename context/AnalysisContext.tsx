@@ -1,107 +1,98 @@
-import React, { createContext, useContext, useMemo, useState } from "react";
-import type { AnswerItem, Category, RiskType, Sector, QuestionnaireAnalyzeResponse, CompareResponse, EntityType } from "../lib/types";
+import React, { useEffect } from "react";
+import { getRecord, listRecords, putRecord, removeRecord } from "../lib/localStore";
+import { shallowEqual } from "../lib/store";
+import {
+  analysisStore,
+  defaultAnalysisState as defaultState,
+  restoreAnalysis,
+  type AnalysisState,
+  type AnalysisStoreState,
+  type RiskInProgress,
+} from "../lib/analysisStore";
 
-export type RiskInProgress = {
-  id: string;
-  description: string;
-  category: Category;
-  type: RiskType;
-  answers: AnswerItem[];
-  userResult?: QuestionnaireAnalyzeResponse;
-  mitigation?: string;
-  residualResult?: QuestionnaireAnalyzeResponse;
-};
+// L'état vit dans lib/analysisStore.ts ; les écrans l'importent d'ici.
+export * from "../lib/analysisStore";
 
-export type AnalysisState = {
-  // Informations du projet
-  projectType?: "project" | "entity";
-  projectDescription?: string;
-  entityType?: EntityType;
-  entityServices?: string;
-  analysisTitle?: string;
-  sector?: Sector;
-  
-  // Risques du projet (minimum 4)
-  risks: RiskInProgress[];
-  currentRiskIndex?: number;
-  
-  // Ancien flux (pour compatibilité)
-  projectName?: string;
-  description?: string;
-  category?: Category;
-  type?: RiskType;
-  answers: AnswerItem[];
-  userResult?: QuestionnaireAnalyzeResponse;
-  compareResult?: CompareResponse;
-  measures?: string[];
-};
+// ---------------------------------------------------------------------------
+// Brouillon persistant
+//
+// Le brouillon est persisté par enregistrement : l'en-tête (sans les risques)
+// et un enregistrement par risque, réécrit seulement quand il change.
+type DraftMeta = Omit<AnalysisState, "risks"> & { riskIds: string[] };
 
-const defaultState: AnalysisState = {
-  answers: [],
-  risks: [],
-};
+async function loadDraft(): Promise<AnalysisStoreState | null> {
+  const meta = await getRecord<DraftMeta>("draft", "state");
+  if (!meta) return null;
+  const stored = new Map((await listRecords<RiskInProgress>("draft_risks")).map((r) => [r.id, r]));
+  const risksById: Record<string, RiskInProgress> = {};
+  for (const id of meta.riskIds) {
+    const r = stored.get(id);
+    if (r) risksById[id] = r;
+  }
+  return { ...meta, riskIds: meta.riskIds.filter((id) => risksById[id]), risksById };
+}
 
-export type AnalysisContextType = {
-  state: AnalysisState;
-  // Nouveau flux projet
-  setProjectInfo: (type: "project" | "entity", description: string, title: string, sector?: string, entityType?: EntityType, entityServices?: string) => void;
-  addRisk: (risk: RiskInProgress) => void;
-  updateRisk: (index: number, risk: Partial<RiskInProgress>) => void;
-  setCurrentRiskIndex: (index: number) => void;
-  resetProject: () => void;
-  // Ancien flux (compatibilité)
-  setSector: (s: Sector) => void;
-  setProjectName: (n?: string) => void;
-  setRiskInfo: (d: string, c: Category, t: RiskType) => void;
-  addAnswer: (a: AnswerItem) => void;
-  replaceAnswers: (arr: AnswerItem[]) => void;
-  resetFlow: () => void;
-  setUserResult: (r: QuestionnaireAnalyzeResponse) => void;
-  setCompareResult: (r: CompareResponse) => void;
-  setMeasures: (m: string[]) => void;
-};
+async function saveDraft(state: AnalysisStoreState, prev: AnalysisStoreState) {
+  const { riskIds, risksById, ...meta } = state;
+  const { riskIds: prevIds, risksById: prevById, ...prevMeta } = prev;
+  if (risksById !== prevById) {
+    // Identité des objets : seuls les risques modifiés sont réécrits
+    for (const id of riskIds) {
+      if (prevById[id] !== risksById[id]) await putRecord("draft_risks", id, risksById[id]);
+    }
+    for (const id of prevIds) {
+      if (!risksById[id]) await removeRecord("draft_risks", id);
+    }
+  }
+  if (state === defaultState) {
+    await removeRecord("draft", "state");
+    return;
+  }
+  const metaChanged = !shallowEqual(meta, prevMeta);
+  if (metaChanged || riskIds !== prevIds) {
+    await putRecord<DraftMeta>("draft", "state", { ...meta, riskIds });
+  }
+}
 
-const Ctx = createContext<AnalysisContextType | undefined>(undefined);
+function persistDraft(): () => void {
+  let hydrated = false;
+  let saved = defaultState;
+  let writing = Promise.resolve();
 
-export const AnalysisProvider: React.FC<{ children: React.ReactNode }> = ({ children }) => {
-  const [state, setState] = useState<AnalysisState>(defaultState);
+  loadDraft()
+    .then((draft) => {
+      // Ne pas écraser un flux démarré pendant le chargement
+      if (draft && analysisStore.getState() === defaultState) {
+        saved = draft;
+        restoreAnalysis(draft);
+      }
+    })
+    .catch((e) => console.warn("[Analysis] Draft restore failed:", e))
+    .finally(() => {
+      hydrated = true;
+      onChange();
+    });
 
-  const api: AnalysisContextType = useMemo(() => ({
-    state,
-    // Nouveau flux projet
-    setProjectInfo: (type, description, title, sector, entityType, entityServices) => setState((prev) => ({
-      ...prev,
-      projectType: type,
-      projectDescription: description,
-      analysisTitle: title,
-      sector,
-      entityType,
-      entityServices,
-    })),
-    addRisk: (risk) => setState((prev) => ({ ...prev, risks: [...prev.risks, risk] })),
-    updateRisk: (index, risk) => setState((prev) => ({
-      ...prev,
-      risks: prev.risks.map((r, i) => i === index ? { ...r, ...risk } : r),
-    })),
-    setCurrentRiskIndex: (index) => setState((prev) => ({ ...prev, currentRiskIndex: index })),
-    resetProject: () => setState(defaultState),
-    // Ancien flux (compatibilité)
-    setSector: (s) => setState((prev) => ({ ...prev, sector: s })),
-    setProjectName: (n) => setState((prev) => ({ ...prev, projectName: n })),
-    setRiskInfo: (d, c, t) => setState((prev) => ({ ...prev, description: d, category: c, type: t })),
-    addAnswer: (a) => setState((prev) => ({ ...prev, answers: [...prev.answers.filter(x => x.question_id !== a.question_id), a] })),
-    replaceAnswers: (arr) => setState((prev) => ({ ...prev, answers: arr })),
-    resetFlow: () => setState(defaultState),
-    setUserResult: (r) => setState((prev) => ({ ...prev, userResult: r })),
-    setCompareResult: (r) => setState((prev) => ({ ...prev, compareResult: r })),
-    setMeasures: (m) => setState((prev) => ({ ...prev, measures: m })),
-  }), [state]);
+  function onChange() {
+    if (!hydrated) return;
+    const state = analysisStore.getState();
+    const prev = saved;
+    if (state === prev) return;
+    saved = state;
+    // Écritures sérialisées : un état plus ancien ne peut pas écraser un plus récent
+    writing = writing
+      .then(() => saveDraft(state, prev))
+      .catch((e) => console.warn("[Analysis] Draft save failed:", e));
+  }
 
-  return <Ctx.Provider value={api}>{children}</Ctx.Provider>;
-};
+  return analysisStore.subscribe(onChange);
+}
 
-export const useAnalysis = (): AnalysisContextType => {
-  const ctx = useContext(Ctx);
-  if (!ctx) throw new Error("useAnalysis must be used within AnalysisProvider");
-  return ctx;
+/**
+ * Restaure puis persiste le brouillon d'analyse. L'état lui-même vit dans
+ * `analysisStore` : les écrans s'y abonnent via useAnalysisStore.
+ */
+export const AnalysisProvider: React.FC<{ children: React.ReactNode }> = ({ children }) => {
+  useEffect(() => persistDraft(), []);
+  return <>{children}</>;
 };
@@ -0,0 +1,85 @@
+// Client-side cache of human vs IA comparisons, keyed by the content of the
+// risk that was analysed. A risk whose description, category, type and G/F/P
+// have not changed is not sent to the IA again, whatever its id, until its
+// entry expires (or the caller forces a new analysis).
+
+import { getRecord, listRecords, putRecord, removeRecord } from "./localStore";
+import type { CompareRequest, CompareResponse } from "./types";
+
+export type RiskContent = {
+  description: string;
+  category: string;
+  type: string;
+  G: number;
+  F: number;
+  P: number;
+};
+
+type StoredComparison = { hash: string; storedAt: number; data: CompareResponse };
+
+const MAX_ENTRIES = 500;
+// Entries tolerated above MAX_ENTRIES: the collection is listed and sorted
+// once per EVICT_BATCH new entries rather than on every put.
+const EVICT_BATCH = 50;
+// The model behind /compare evolves: don't reuse an answer forever
+const TTL = 30 * 24 * 60 * 60 * 1000;
+
+// Number of stored entries, counted on the first put
+let entryCount: number | null = null;
+
+// cyrb53: fast 53-bit string hash, plenty for a few thousand cache keys
+function cyrb53(str: string, seed = 0): string {
+  let h1 = 0xdeadbeef ^ seed;
+  let h2 = 0x41c6ce57 ^ seed;
+  for (let i = 0; i < str.length; i++) {
+    const ch = str.charCodeAt(i);
+    h1 = Math.imul(h1 ^ ch, 2654435761);
+    h2 = Math.imul(h2 ^ ch, 1597334677);
+  }
+  h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+  h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+  return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(36);
+}
+
+const normalize = (text: string) => text.trim().replace(/\s+/g, " ");
+
+export function riskContentHash(r: RiskContent): string {
+  return cyrb53(JSON.stringify([normalize(r.description), r.category, r.type, r.G, r.F, r.P]));
+}
+
+/** Key of a standalone /compare request: every field it sends, in a stable order. */
+export function compareRequestHash(req: CompareRequest): string {
+  const fields = Object.entries(req)
+    .filter(([, v]) => v !== undefined)
+    .map(([k, v]) => [k, k === "description" ? normalize(v as string) : v])
+    .sort(([a], [b]) => (a < b ? -1 : 1));
+  return `compare:${cyrb53(JSON.stringify(fields))}`;
+}
+
+/** Content of a project risk as analysed by the IA (initial evaluation). */
+export function projectRiskContent(r: {
+  description: string;
+  category: string;
+  type: string;
+  initial_evaluation: { G: number; F: number; P: number };
+}): RiskContent {
+  const { G, F, P } = r.initial_evaluation;
+  return { description: r.description, category: r.category, type: r.type, G, F, P };
+}
+
+export async function getCachedComparison(hash: string): Promise<CompareResponse | undefined> {
+  const entry = await getRecord<StoredComparison>("ai_comparisons", hash);
+  return entry && Date.now() - entry.storedAt < TTL ? entry.data : undefined;
+}
+
+export async function putCachedComparison(hash: string, data: CompareResponse): Promise<void> {
+  const isNew = !(await getRecord<StoredComparison>("ai_comparisons", hash));
+  await putRecord<StoredComparison>("ai_comparisons", hash, { hash, storedAt: Date.now(), data });
+  if (entryCount === null) entryCount = (await listRecords<StoredComparison>("ai_comparisons")).length;
+  else if (isNew) entryCount++;
+  if (entryCount <= MAX_ENTRIES + EVICT_BATCH) return;
+  const all = await listRecords<StoredComparison>("ai_comparisons");
+  const oldest = all.sort((a, b) => a.storedAt - b.storedAt).slice(0, all.length - MAX_ENTRIES);
+  for (const e of oldest) await removeRecord("ai_comparisons", e.hash);
+  entryCount = all.length - oldest.length;
+}
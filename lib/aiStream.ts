@@ -0,0 +1,187 @@
+// Incremental reader for streamed JSON responses (NDJSON or Server-Sent Events).
+// No React Native imports: the stub server check in scripts/ runs it under Node.
+
+export type StreamFormat = "ndjson" | "sse" | "json";
+
+export function formatOf(contentType: string | null | undefined): StreamFormat {
+  const ct = (contentType || "").toLowerCase();
+  if (ct.includes("text/event-stream")) return "sse";
+  if (ct.includes("ndjson") || ct.includes("jsonl") || ct.includes("json-seq")) return "ndjson";
+  return "json";
+}
+
+export type StreamParser = {
+  /** Feed the next chunk of text; complete values are emitted immediately. */
+  push(text: string): void;
+  /** Flush what is left once the body is complete. */
+  end(): void;
+};
+
+/**
+ * NDJSON: one value per line. SSE: blank-line separated events whose `data:`
+ * lines are joined; an `event:` name becomes `type` when the payload has none.
+ * JSON: the whole body is buffered and parsed at the end (non-streaming server).
+ */
+export function createStreamParser(format: StreamFormat, onValue: (value: any) => void): StreamParser {
+  let buffer = "";
+
+  const parse = (raw: string, event?: string) => {
+    const text = raw.trim();
+    if (!text || text === "[DONE]") return;
+    let value: any;
+    try {
+      value = JSON.parse(text);
+    } catch {
+      console.warn("[AIStream] Ignoring malformed chunk:", text.slice(0, 80));
+      return;
+    }
+    if (event && value && typeof value === "object" && !("type" in value)) value = { type: event, data: value };
+    onValue(value);
+  };
+
+  const sseEvent = (block: string) => {
+    let event: string | undefined;
+    const data: string[] = [];
+    for (const line of block.split(/\r?\n/)) {
+      if (!line || line.startsWith(":")) continue;
+      const colon = line.indexOf(":");
+      const field = colon === -1 ? line : line.slice(0, colon);
+      const value = colon === -1 ? "" : line.slice(colon + 1).replace(/^ /, "");
+      if (field === "data") data.push(value);
+      else if (field === "event") event = value;
+    }
+    if (data.length) parse(data.join("\n"), event && event !== "message" ? event : undefined);
+  };
+
+  const drain = (final: boolean) => {
+    if (format === "json") {
+      if (final) parse(buffer);
+      return;
+    }
+    const separator = format === "sse" ? /\r?\n\r?\n/ : /\r?\n/;
+    const parts = buffer.split(separator);
+    buffer = final ? "" : parts.pop() ?? "";
+    for (const part of parts) format === "sse" ? sseEvent(part) : parse(part);
+  };
+
+  return {
+    push(text) {
+      buffer += text;
+      if (format !== "json") drain(false);
+    },
+    end() {
+      drain(true);
+    },
+  };
+}
+
+export type StreamRequest = {
+  url: string;
+  method?: string;
+  headers?: Record<string, string>;
+  body?: string;
+  signal?: AbortSignal;
+};
+
+export function abortError(): Error {
+  const e = new Error("Requête annulée");
+  e.name = "AbortError";
+  return e;
+}
+
+export function isAbortError(e: any): boolean {
+  return e?.name === "AbortError";
+}
+
+type StreamSink = {
+  /** Called once a successful status is known, before any text. */
+  start(contentType: string | null): void;
+  text(chunk: string): void;
+};
+
+// React Native's fetch buffers the whole body; XHR exposes it while it arrives.
+const hasReadableFetch = () =>
+  !(typeof navigator !== "undefined" && (navigator as any).product === "ReactNative");
+
+async function viaFetch(req: StreamRequest, sink: StreamSink): Promise<void> {
+  const res = await fetch(req.url, { method: req.method, headers: req.headers, body: req.body, signal: req.signal });
+  if (!res.ok) throw new Error(`${res.status} ${res.statusText}: ${await res.text()}`);
+  sink.start(res.headers.get("Content-Type"));
+  if (!res.body) {
+    sink.text(await res.text());
+    return;
+  }
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    sink.text(decoder.decode(value, { stream: true }));
+  }
+  sink.text(decoder.decode());
+}
+
+function viaXhr(req: StreamRequest, sink: StreamSink): Promise<void> {
+  return new Promise((resolve, reject) => {
+    if (req.signal?.aborted) return reject(abortError());
+    const xhr = new XMLHttpRequest();
+    let seen = 0;
+    let ok = false;
+    const onAbort = () => xhr.abort();
+    const settle = (fn: () => void) => {
+      req.signal?.removeEventListener("abort", onAbort);
+      fn();
+    };
+    const flush = () => {
+      if (!ok) return;
+      const text = xhr.responseText;
+      if (text.length > seen) {
+        sink.text(text.slice(seen));
+        seen = text.length;
+      }
+    };
+    xhr.open(req.method || "GET", req.url);
+    for (const [k, v] of Object.entries(req.headers || {})) xhr.setRequestHeader(k, v);
+    xhr.onreadystatechange = () => {
+      if (xhr.readyState === 2 && xhr.status >= 200 && xhr.status < 300) {
+        ok = true;
+        sink.start(xhr.getResponseHeader("Content-Type"));
+      }
+    };
+    xhr.onprogress = flush;
+    xhr.onload = () =>
+      settle(() => {
+        if (!ok) return reject(new Error(`${xhr.status} ${xhr.statusText}: ${xhr.responseText}`));
+        flush();
+        resolve();
+      });
+    // Same message as a failed fetch so callers treat it as a network error
+    xhr.onerror = () => settle(() => reject(new TypeError("Network request failed")));
+    xhr.onabort = () => settle(() => reject(abortError()));
+    req.signal?.addEventListener("abort", onAbort);
+    xhr.send(req.body ?? null);
+  });
+}
+
+/**
+ * Send `req` and call `onValue` for every JSON value of the response as soon
+ * as it is complete. The format follows the response Content-Type, so a
+ * server that ignores the streaming request still works (one final value).
+ * Rejects with an AbortError when `req.signal` fires.
+ */
+export async function streamJson(req: StreamRequest, onValue: (value: any) => void): Promise<void> {
+  let parser: StreamParser | null = null;
+  const sink: StreamSink = {
+    start: (contentType) => {
+      parser = createStreamParser(formatOf(contentType), onValue);
+    },
+    text: (chunk) => parser?.push(chunk),
+  };
+  try {
+    await (hasReadableFetch() ? viaFetch(req, sink) : viaXhr(req, sink));
+  } catch (e) {
+    if (req.signal?.aborted) throw abortError();
+    throw e;
+  }
+  (parser as StreamParser | null)?.end();
+}
@@ -0,0 +1,180 @@
+// In-memory index over user analyses for the dashboard and history screens.
+// Timestamps are parsed and search text normalised once per item, and the
+// aggregates (counts, average score, distributions) are kept up to date as
+// items are added or replaced instead of being recomputed on every render.
+
+import type { UserAnalysis } from "./types";
+
+export type RiskClass = "faible" | "modere" | "eleve";
+export type Period = "today" | "week" | "month" | "all";
+
+export type IndexedAnalysis = {
+  item: UserAnalysis;
+  ts: number;
+  monthKey: string; // YYYY-MM
+  klass: RiskClass;
+  haystack: string; // normalised description/category/type/classification/sector
+};
+
+export type AnalysisStats = {
+  count: number;
+  scoreSum: number;
+  byClass: Record<RiskClass, number>;
+  byCategory: Map<string, number>;
+  byMonth: Map<string, { count: number; scoreSum: number }>;
+};
+
+const DAY = 24 * 60 * 60 * 1000;
+
+/** Lowercase and strip accents so "eleve" matches "Élevé". */
+export function normalize(s: string): string {
+  return s.normalize("NFD").replace(/[\u0300-\u036f]/g, "").toLowerCase();
+}
+
+export function classOf(classification?: string): RiskClass {
+  const s = normalize(classification || "");
+  if (s.includes("elev")) return "eleve";
+  if (s.includes("mod") || s.includes("moyen")) return "modere";
+  return "faible";
+}
+
+function monthKeyOf(d: Date) {
+  return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, "0")}`;
+}
+
+function toEntry(item: UserAnalysis): IndexedAnalysis {
+  const d = new Date(item.timestamp);
+  const classification = item.computed_classification || (item as any).classification || "";
+  return {
+    item,
+    ts: d.getTime() || 0,
+    monthKey: monthKeyOf(d),
+    klass: classOf(classification),
+    haystack: normalize([item.description, item.category, item.type, classification, item.sector].filter(Boolean).join("\n")),
+  };
+}
+
+function emptyStats(): AnalysisStats {
+  return { count: 0, scoreSum: 0, byClass: { faible: 0, modere: 0, eleve: 0 }, byCategory: new Map(), byMonth: new Map() };
+}
+
+function account(stats: AnalysisStats, e: IndexedAnalysis, sign: 1 | -1) {
+  const score = e.item.score || 0;
+  stats.count += sign;
+  stats.scoreSum += sign * score;
+  stats.byClass[e.klass] += sign;
+  const cat = e.item.category;
+  stats.byCategory.set(cat, (stats.byCategory.get(cat) || 0) + sign);
+  if (!stats.byCategory.get(cat)) stats.byCategory.delete(cat);
+  const m = stats.byMonth.get(e.monthKey) || { count: 0, scoreSum: 0 };
+  const next = { count: m.count + sign, scoreSum: m.scoreSum + sign * score };
+  if (next.count) stats.byMonth.set(e.monthKey, next);
+  else stats.byMonth.delete(e.monthKey);
+}
+
+export type AnalysisIndex = ReturnType<typeof createAnalysisIndex>;
+
+export function createAnalysisIndex() {
+  const byId = new Map<string, IndexedAnalysis>();
+  // Newest first
+  let sorted: IndexedAnalysis[] = [];
+  let stats = emptyStats();
+  // Bumped on every change so callers can use it as a memo dependency
+  let version = 0;
+
+  // Binary search for the insertion point keeping `sorted` by ts descending
+  const position = (ts: number) => {
+    let lo = 0;
+    let hi = sorted.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (sorted[mid].ts > ts) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  };
+
+  const detach = (id: string) => {
+    const prev = byId.get(id);
+    if (!prev) return;
+    byId.delete(id);
+    account(stats, prev, -1);
+    const i = sorted.indexOf(prev, position(prev.ts));
+    if (i !== -1) sorted.splice(i, 1);
+  };
+
+  return {
+    get version() {
+      return version;
+    },
+    get stats(): Readonly<AnalysisStats> {
+      return stats;
+    },
+    get size() {
+      return sorted.length;
+    },
+
+    reset(items: UserAnalysis[]) {
+      byId.clear();
+      stats = emptyStats();
+      sorted = items.map(toEntry).sort((a, b) => b.ts - a.ts);
+      sorted.forEach((e) => {
+        byId.set(e.item.id, e);
+        account(stats, e, 1);
+      });
+      version++;
+    },
+
+    /** Add or replace items (new page, optimistic insert, server refresh). */
+    upsert(items: UserAnalysis[]) {
+      if (!items.length) return;
+      // Fresh copy so memoised consumers holding the previous array see a change
+      sorted = sorted.slice();
+      for (const item of items) {
+        detach(item.id);
+        const e = toEntry(item);
+        byId.set(item.id, e);
+        account(stats, e, 1);
+        sorted.splice(position(e.ts), 0, e);
+      }
+      version++;
+    },
+
+    remove(id: string) {
+      if (!byId.has(id)) return;
+      sorted = sorted.slice();
+      detach(id);
+      version++;
+    },
+
+    has(id: string) {
+      return byId.has(id);
+    },
+
+    /** Items of the period matching every word of `q`, newest first. */
+    query(period: Period, q: string, now = new Date()): IndexedAnalysis[] {
+      const words = normalize(q.trim()).split(/\s+/).filter(Boolean);
+      const t = now.getTime();
+      const month = monthKeyOf(now);
+      if (period === "all" && !words.length) return sorted;
+      // Sorted by date: the day/week periods form a prefix of the list
+      const minTs = period === "today" ? t - DAY : period === "week" ? t - 7 * DAY : -Infinity;
+      const out: IndexedAnalysis[] = [];
+      for (const e of sorted) {
+        if (e.ts <= minTs) break;
+        if (period === "month" && e.monthKey !== month) continue;
+        if (words.length && !words.every((w) => e.haystack.includes(w))) continue;
+        out.push(e);
+      }
+      return out;
+    },
+
+    countInMonth(now = new Date()) {
+      return stats.byMonth.get(monthKeyOf(now))?.count || 0;
+    },
+
+    averageScore() {
+      return stats.count ? Math.round(stats.scoreSum / stats.count) : 0;
+    },
+  };
+}
@@ -0,0 +1,155 @@
+// État du parcours d'analyse (projet multi-risques et ancien flux à un risque).
+// Sans import React Native : les scripts de benchmark l'exécutent sous Node.
+
+import type { AnswerItem, Category, RiskType, Sector, QuestionnaireAnalyzeResponse, CompareResponse, EntityType } from "./types";
+import { createStore, useStore, type Equality } from "./store";
+
+export type RiskInProgress = {
+  id: string;
+  description: string;
+  category: Category;
+  type: RiskType;
+  answers: AnswerItem[];
+  userResult?: QuestionnaireAnalyzeResponse;
+  mitigation?: string;
+  residualResult?: QuestionnaireAnalyzeResponse;
+};
+
+export type AnalysisState = {
+  // Informations du projet
+  projectType?: "project" | "entity";
+  projectDescription?: string;
+  entityType?: EntityType;
+  entityServices?: string;
+  analysisTitle?: string;
+  sector?: Sector;
+
+  // Risques du projet (minimum 4)
+  risks: RiskInProgress[];
+  currentRiskIndex?: number;
+
+  // Ancien flux (pour compatibilité)
+  projectName?: string;
+  description?: string;
+  category?: Category;
+  type?: RiskType;
+  answers: AnswerItem[];
+  userResult?: QuestionnaireAnalyzeResponse;
+  compareResult?: CompareResponse;
+  measures?: string[];
+};
+
+/**
+ * État stocké : les risques sont normalisés (ordre + index par id). Modifier un
+ * risque ne recrée que cet objet ; les autres gardent leur identité, donc les
+ * composants abonnés à un autre risque ne se re-rendent pas.
+ */
+export type AnalysisStoreState = Omit<AnalysisState, "risks"> & {
+  riskIds: string[];
+  risksById: Record<string, RiskInProgress>;
+};
+
+export const defaultAnalysisState: AnalysisStoreState = {
+  answers: [],
+  riskIds: [],
+  risksById: {},
+};
+
+export const analysisStore = createStore<AnalysisStoreState>(defaultAnalysisState);
+
+// ---------------------------------------------------------------------------
+// Sélecteurs
+
+let risksMemo: { ids: string[]; byId: Record<string, RiskInProgress>; list: RiskInProgress[] } | null = null;
+
+/** Risques dans l'ordre ; même tableau tant qu'aucun risque n'a changé. */
+export function selectRisks(s: AnalysisStoreState): RiskInProgress[] {
+  if (!risksMemo || risksMemo.ids !== s.riskIds || risksMemo.byId !== s.risksById) {
+    risksMemo = { ids: s.riskIds, byId: s.risksById, list: s.riskIds.map((id) => s.risksById[id]) };
+  }
+  return risksMemo.list;
+}
+
+export const selectRiskCount = (s: AnalysisStoreState) => s.riskIds.length;
+
+export const selectRiskAt = (index: number | undefined) => (s: AnalysisStoreState): RiskInProgress | undefined =>
+  index === undefined ? undefined : s.risksById[s.riskIds[index]];
+
+export const selectCurrentRisk = (s: AnalysisStoreState) => selectRiskAt(s.currentRiskIndex)(s);
+
+/** Vue dénormalisée (risques en tableau), pour l'enregistrement du projet. */
+export function toAnalysisState(s: AnalysisStoreState): AnalysisState {
+  const { riskIds, risksById, ...rest } = s;
+  return { ...rest, risks: selectRisks(s) };
+}
+
+/**
+ * Abonne le composant à une partie de l'état d'analyse. Passer `shallowEqual`
+ * quand le sélecteur construit un objet ({ a: s.a, b: s.b }).
+ */
+export function useAnalysisStore<T>(selector: (s: AnalysisStoreState) => T, isEqual?: Equality<T>): T {
+  return useStore(analysisStore, selector, isEqual);
+}
+
+// ---------------------------------------------------------------------------
+// Actions (stables : pas de dépendance à l'état courant)
+
+const set = analysisStore.setState;
+
+function patchRisk(s: AnalysisStoreState, id: string | undefined, risk: Partial<RiskInProgress>): AnalysisStoreState {
+  const prev = id !== undefined ? s.risksById[id] : undefined;
+  if (!prev) return s;
+  return { ...s, risksById: { ...s.risksById, [prev.id]: { ...prev, ...risk, id: prev.id } } };
+}
+
+export const analysisActions = {
+  // Nouveau flux projet
+  setProjectInfo: (type: "project" | "entity", description: string, title: string, sector?: string, entityType?: EntityType, entityServices?: string) =>
+    set((prev) => ({
+      ...prev,
+      projectType: type,
+      projectDescription: description,
+      analysisTitle: title,
+      sector,
+      entityType,
+      entityServices,
+    })),
+  addRisk: (risk: RiskInProgress) =>
+    set((prev) => ({
+      ...prev,
+      riskIds: prev.risksById[risk.id] ? prev.riskIds : [...prev.riskIds, risk.id],
+      risksById: { ...prev.risksById, [risk.id]: risk },
+    })),
+  updateRisk: (index: number, risk: Partial<RiskInProgress>) => set((prev) => patchRisk(prev, prev.riskIds[index], risk)),
+  updateRiskById: (id: string, risk: Partial<RiskInProgress>) => set((prev) => patchRisk(prev, id, risk)),
+  setCurrentRiskIndex: (index: number) => set((prev) => (prev.currentRiskIndex === index ? prev : { ...prev, currentRiskIndex: index })),
+  resetProject: () => set(() => defaultAnalysisState),
+  // Ancien flux (compatibilité)
+  setSector: (s: Sector) => set((prev) => ({ ...prev, sector: s })),
+  setProjectName: (n?: string) => set((prev) => ({ ...prev, projectName: n })),
+  setRiskInfo: (d: string, c: Category, t: RiskType) => set((prev) => ({ ...prev, description: d, category: c, type: t })),
+  addAnswer: (a: AnswerItem) => set((prev) => ({ ...prev, answers: [...prev.answers.filter(x => x.question_id !== a.question_id), a] })),
+  replaceAnswers: (arr: AnswerItem[]) => set((prev) => ({ ...prev, answers: arr })),
+  resetFlow: () => set(() => defaultAnalysisState),
+  setUserResult: (r: QuestionnaireAnalyzeResponse) => set((prev) => ({ ...prev, userResult: r })),
+  setCompareResult: (r: CompareResponse) => set((prev) => ({ ...prev, compareResult: r })),
+  setMeasures: (m: string[]) => set((prev) => ({ ...prev, measures: m })),
+};
+
+// ---------------------------------------------------------------------------
+// Snapshot / restore : l'état est immuable, un instantané est une simple référence
+
+export type AnalysisSnapshot = AnalysisStoreState;
+
+export function snapshotAnalysis(): AnalysisSnapshot {
+  return analysisStore.getState();
+}
+
+export function restoreAnalysis(snapshot: AnalysisSnapshot) {
+  set(() => snapshot);
+}
+
+/** État complet en lecture ponctuelle (handlers, enregistrement), sans abonnement. */
+export function getAnalysisState(): AnalysisState {
+  return toAnalysisState(analysisStore.getState());
+}
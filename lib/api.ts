@@ -1,5 +1,17 @@
 import { API_BASE_URL } from "./config";
-import { getAuthHeader } from "./auth";
+import { getAuthHeader, refreshToken } from "./auth";
+import { emit, on } from "./events";
+import {
+  getEntry,
+  setEntry,
+  isFresh,
+  isUsable,
+  invalidate,
+  coversKey,
+  cacheGeneration,
+  type CacheEntry,
+  type CachePolicy,
+} from "./cache";
 import type {
   QuestionnaireQuestionsResponse,
   QuestionnaireAnalyzeRequest,
@@ -11,61 +23,234 @@ import type {
   ResidualRequest,
   ResidualResponse,
   UserAnalysisListResponse,
+  UserAnalysis,
   AnalysisProject,
   CreateProjectRequest,
   AddRiskRequest,
   UpdateRiskMitigationRequest,
   ProjectSummaryListResponse,
+  ProjectSummary,
   RiskItem,
+  BulkSaveProjectRequest,
+  BulkSaveProgress,
+  Page,
+  ProjectAIComparison,
+  ProjectAIAnalysisResponse,
 } from "./types";
+import type { AnalysisState } from "./analysisStore";
+import { runSavePipeline, countOperations, type SaveJournal, type SaveOperations } from "./bulkSave";
+import {
+  newLocalId,
+  isLocalId,
+  resolveId,
+  getLocalProject,
+  listLocalProjects,
+  saveProjectLocally,
+  saveRiskLocally,
+  removeProjectLocally,
+  removeRiskLocally,
+  remapProjectId,
+  remapRiskId,
+  saveAnalysesLocally,
+  listLocalAnalyses,
+  removeRecord,
+  getServerVersion,
+  setServerVersion,
+} from "./localStore";
+import {
+  enqueue,
+  hasPendingFor,
+  isNetworkError,
+  rebasePending,
+  rewritePending,
+  setDiscardHandler,
+  setOutboxHandler,
+  type OutboxOp,
+} from "./outbox";
+import { evaluate } from "./scoring";
+import { isAbortError, streamJson } from "./aiStream";
+import { compareRequestHash, getCachedComparison, putCachedComparison, projectRiskContent, riskContentHash } from "./aiCache";
+import { endpointKey, log, now, recordCache, recordRequest, recordResponseSize, utf8Length } from "./telemetry";
 
-async function http<T>(path: string, init?: RequestInit): Promise<T> {
+// Importing the worker from here guarantees the outbox handler below is registered.
+export { startSyncWorker, pendingCount } from "./outbox";
+
+async function request(path: string, init?: RequestInit): Promise<Response> {
   const authHeader = await getAuthHeader();
   const needsAuth = path.startsWith("/profile") || path.startsWith("/user/") || path.startsWith("/projects");
-  
-  console.log(`[API] Calling ${path}`, {
-    hasAuth: !!authHeader?.Authorization,
-    authPreview: authHeader?.Authorization ? authHeader.Authorization.substring(0, 30) + '...' : 'none'
-  });
-  
+  const method = (init?.method || "GET").toUpperCase();
+
   if (needsAuth && !authHeader?.Authorization) {
-    console.error(`[API] Missing Authorization header for protected path: ${path}`);
+    log.error(`[API] Missing Authorization header for protected path: ${path}`);
   }
-  
-  const res = await fetch(`${API_BASE_URL}${path}`, {
-    ...init,
-    headers: {
-      "Content-Type": "application/json",
-      ...authHeader,
-      ...(init?.headers || {}),
-    },
+
+  const send = (auth: Record<string, string>) =>
+    fetch(`${API_BASE_URL}${path}`, {
+      ...init,
+      headers: {
+        "Content-Type": "application/json",
+        ...auth,
+        ...(init?.headers || {}),
+      },
+    });
+
+  const key = endpointKey(method, path);
+  const sentBytes = typeof init?.body === "string" ? utf8Length(init.body) : 0;
+  const started = now();
+  let res: Response;
+  try {
+    res = await send(authHeader);
+    // Token revoked or expired early: retry exactly once with a forced refresh
+    if (res.status === 401 && authHeader?.Authorization) {
+      const token = await refreshToken();
+      if (token) {
+        log.debug(`[API] 401 for ${path}, retrying with a refreshed token`);
+        res = await send({ Authorization: `Bearer ${token}` });
+      }
+    }
+  } catch (e) {
+    recordRequest(key, { ms: now() - started, status: 0, sentBytes });
+    throw e;
+  }
+
+  const ms = now() - started;
+  recordRequest(key, { ms, status: res.status, sentBytes });
+  log.debug(`[API] ${method} ${path}: ${res.status} in ${Math.round(ms)}ms`);
+  return res;
+}
+
+/** Parse a JSON body, recording its size against the endpoint. */
+async function readJson<T>(res: Response, path: string, init?: RequestInit): Promise<T> {
+  const text = await res.text();
+  recordResponseSize(endpointKey(init?.method || "GET", path), utf8Length(text));
+  return JSON.parse(text);
+}
+
+async function httpError(res: Response): Promise<Error> {
+  const text = await res.text();
+  return new Error(`${res.status} ${res.statusText}: ${text}`);
+}
+
+// Identical GET requests issued while one is pending share its promise.
+const inflight = new Map<string, Promise<any>>();
+
+function dedupe<T>(key: string, run: () => Promise<T>): Promise<T> {
+  const pending = inflight.get(key);
+  if (pending) return pending;
+  const p = run().finally(() => {
+    if (inflight.get(key) === p) inflight.delete(key);
   });
-  
-  console.log(`[API] Response for ${path}:`, res.status, res.statusText);
-  
-  if (!res.ok) {
-    const text = await res.text();
-    throw new Error(`${res.status} ${res.statusText}: ${text}`);
+  inflight.set(key, p);
+  return p;
+}
+
+async function http<T>(path: string, init?: RequestInit): Promise<T> {
+  const run = async () => {
+    const res = await request(path, init);
+    if (!res.ok) throw await httpError(res);
+    return readJson<T>(res, path, init);
+  };
+  const method = (init?.method || "GET").toUpperCase();
+  // A no-cache read (e.g. a conflict check) must not be handed the pending
+  // result of a revalidation, which can be answered from the cache by a 304.
+  const noCache =
+    (!!init?.cache && init.cache !== "default") ||
+    /no-cache|no-store/i.test(new Headers(init?.headers).get("Cache-Control") || "");
+  return method === "GET" && !init?.body && !noCache ? dedupe(path, run) : run();
+}
+
+/**
+ * Fetch `path` and store the result, sending If-None-Match when a previous
+ * entry carries an ETag. A 304 simply extends the lifetime of that entry.
+ */
+function revalidate<T>(path: string, policy: CachePolicy, entry?: CacheEntry<T>): Promise<T> {
+  return dedupe(path, async () => {
+    const generation = cacheGeneration();
+    const res = await request(path, entry?.etag ? { headers: { "If-None-Match": entry.etag } } : undefined);
+    if (res.status === 304 && entry) {
+      if (generation === cacheGeneration()) {
+        await setEntry(path, { ...entry, storedAt: Date.now(), ttl: policy.ttl });
+      }
+      return entry.data;
+    }
+    if (!res.ok) throw await httpError(res);
+    const data = await readJson<T>(res, path);
+    // A mutation invalidated this path while the request was in flight: don't resurrect it.
+    if (generation === cacheGeneration()) {
+      await setEntry(path, { data, etag: res.headers.get("ETag") || undefined, storedAt: Date.now(), ttl: policy.ttl });
+      if (entry) emit("cache:revalidated", { path, data });
+    }
+    return data;
+  });
+}
+
+/**
+ * GET with stale-while-revalidate semantics: fresh entries are returned
+ * immediately, stale ones are returned immediately and refreshed in the
+ * background, and missing or expired ones wait for the network.
+ */
+async function cachedHttp<T>(path: string, policy: CachePolicy): Promise<T> {
+  let entry: CacheEntry<T> | undefined;
+  try {
+    entry = await getEntry<T>(path);
+  } catch {}
+  const key = endpointKey("GET", path);
+  if (entry && isFresh(entry)) {
+    recordCache(key, "hit");
+    return entry.data;
   }
-  return res.json();
+  if (entry && isUsable(entry, policy)) {
+    recordCache(key, "stale");
+    revalidate(path, policy, entry).catch((e) => log.warn(`[API] Background revalidation failed for ${path}:`, e));
+    return entry.data;
+  }
+  recordCache(key, "miss");
+  return revalidate(path, policy, entry);
 }
 
+async function invalidateCache(...paths: string[]) {
+  for (const key of Array.from(inflight.keys())) {
+    if (paths.some((p) => coversKey(p, key))) inflight.delete(key);
+  }
+  await invalidate(...paths);
+}
+
+const idempotent = (key: string) => ({ "Idempotency-Key": key });
+
+const projectKey = (projectId: string) => `/projects/${encodeURIComponent(projectId)}`;
+
+const REFERENCE_POLICY: CachePolicy = { ttl: 60 * 60 * 1000 };
+const PROJECT_POLICY: CachePolicy = { ttl: 60 * 1000, maxStale: 60 * 60 * 1000 };
+
 export const getQuestions = (sector?: string) =>
-  http<QuestionnaireQuestionsResponse>(
-    sector ? `/questionnaire/questions?sector=${encodeURIComponent(sector)}` : "/questionnaire/questions"
+  cachedHttp<QuestionnaireQuestionsResponse>(
+    sector ? `/questionnaire/questions?sector=${encodeURIComponent(sector)}` : "/questionnaire/questions",
+    REFERENCE_POLICY
   );
 
-export const analyzeQuestionnaire = (payload: QuestionnaireAnalyzeRequest) =>
-  http<QuestionnaireAnalyzeResponse>("/questionnaire/analyze", {
+export const analyzeQuestionnaire = async (payload: QuestionnaireAnalyzeRequest) => {
+  const result = await http<QuestionnaireAnalyzeResponse>("/questionnaire/analyze", {
     method: "POST",
     body: JSON.stringify(payload),
   });
+  await invalidateCache("/user/analyses", "/questionnaire/analyses");
+  return result;
+};
 
-export const compareAnalyses = (payload: CompareRequest) =>
-  http<CompareResponse>("/compare", {
+// Une même saisie (description, catégorie, type, G/F/P) n'est comparée qu'une fois
+export const compareAnalyses = async (payload: CompareRequest, signal?: AbortSignal) => {
+  const hash = compareRequestHash(payload);
+  const cached = await getCachedComparison(hash);
+  recordCache("POST /compare", cached ? "hit" : "miss");
+  if (cached) return cached;
+  const result = await http<CompareResponse>("/compare", {
     method: "POST",
     body: JSON.stringify(payload),
+    signal,
   });
+  putCachedComparison(hash, result).catch(() => {});
+  return result;
+};
 
 // Export comparison as Word document (.docx)
 export const exportCompareReport = async (payload: CompareRequest) => {
@@ -95,46 +280,91 @@ export const listTraces = (limit = 50, offset = 0) =>
 
 export const getTrace = (id: string) => http(`/questionnaire/analyses/${encodeURIComponent(id)}`);
 
-export const getConstants = () => http<ConstantsResponse>("/constants");
+export const getConstants = () => cachedHttp<ConstantsResponse>("/constants", REFERENCE_POLICY);
 
-export const createResidualAnalysis = (payload: ResidualRequest) =>
-  http<ResidualResponse>("/questionnaire/residual", {
+export const createResidualAnalysis = async (payload: ResidualRequest) => {
+  const result = await http<ResidualResponse>("/questionnaire/residual", {
     method: "POST",
     body: JSON.stringify(payload),
   });
+  await invalidateCache("/user/analyses", "/questionnaire/analyses");
+  return result;
+};
 
 export const getReportUrl = (id: string) => `${API_BASE_URL}/questionnaire/report/${encodeURIComponent(id)}`;
 
 export const getExportUrl = () => `${API_BASE_URL}/questionnaire/export`;
 
-export const importAnalyses = (items: any[]) =>
-  http<{ status: string; imported: number; total: number }>("/questionnaire/import", {
+export const importAnalyses = async (items: any[]) => {
+  const result = await http<{ status: string; imported: number; total: number }>("/questionnaire/import", {
     method: "POST",
     body: JSON.stringify({ items }),
   });
+  await invalidateCache("/user/analyses", "/questionnaire/analyses");
+  return result;
+};
 
 // User-scoped analyses (per logged-in account)
-export const listUserAnalyses = (limit = 50, offset = 0) =>
-  http<UserAnalysisListResponse>(`/user/analyses?limit=${limit}&offset=${offset}`);
+export const listUserAnalyses = async (limit = 50, offset = 0): Promise<UserAnalysisListResponse> => {
+  try {
+    const resp = await http<UserAnalysisListResponse>(`/user/analyses?limit=${limit}&offset=${offset}`);
+    saveAnalysesLocally(resp.analyses).catch(() => {});
+    return resp;
+  } catch (e) {
+    if (!isNetworkError(e)) throw e;
+    // Hors ligne : servir les analyses déjà connues localement
+    const local = await listLocalAnalyses();
+    if (!local.length) throw e;
+    return { total: local.length, limit, offset, analyses: local.slice(offset, offset + limit) };
+  }
+};
+
+// ---------------------------------------------------------------------------
+// Cursor pagination over the limit/offset list endpoints
+
+export const PAGE_SIZE = 30;
+const OFFSET_CURSOR = "offset:";
+
+const isServerCursor = (cursor: string | null): cursor is string => !!cursor && !cursor.startsWith(OFFSET_CURSOR);
+const offsetOf = (cursor: string | null) => (cursor ? Number(cursor.slice(OFFSET_CURSOR.length)) : 0);
+
+function nextCursor(cursor: string | null, limit: number, served: number, serverCursor?: string | null) {
+  if (serverCursor !== undefined) return serverCursor;
+  return served >= limit ? `${OFFSET_CURSOR}${offsetOf(cursor) + limit}` : null;
+}
+
+export const pageUserAnalyses = async (cursor: string | null, limit = PAGE_SIZE): Promise<Page<UserAnalysis>> => {
+  const resp = isServerCursor(cursor)
+    ? await http<UserAnalysisListResponse>(`/user/analyses?limit=${limit}&cursor=${encodeURIComponent(cursor)}`)
+    : await listUserAnalyses(limit, offsetOf(cursor));
+  const items = resp.analyses || [];
+  return { items, total: resp.total, nextCursor: nextCursor(cursor, limit, items.length, resp.next_cursor) };
+};
+
+export const pageProjects = async (cursor: string | null, limit = PAGE_SIZE): Promise<Page<ProjectSummary>> => {
+  const resp = isServerCursor(cursor)
+    ? await http<ProjectSummaryListResponse>(`/projects/?limit=${limit}&cursor=${encodeURIComponent(cursor)}`)
+    : await listProjects(limit, offsetOf(cursor));
+  const items = resp.projects || [];
+  return { items, total: resp.total, nextCursor: nextCursor(cursor, limit, items.length, resp.next_cursor) };
+};
 
 // Get a single user analysis by ID
 export const getUserAnalysis = (id: string) =>
   http<QuestionnaireAnalyzeResponse>(`/user/analyses/${encodeURIComponent(id)}`);
 
-// Delete a user analysis by ID
+// Delete a user analysis by ID (local first, replayed by the outbox)
 export const deleteUserAnalysis = async (id: string) => {
-  const authHeader = await getAuthHeader();
-  const res = await fetch(`${API_BASE_URL}/user/analyses/${encodeURIComponent(id)}`, {
-    method: "DELETE",
-    headers: {
-      ...authHeader,
-    },
-  });
-  if (!res.ok) {
-    const text = await res.text();
-    throw new Error(`${res.status} ${res.statusText}: ${text}`);
-  }
-  return res.json();
+  await removeRecord("analyses", id);
+  await enqueue("deleteUserAnalysis", { id });
+  await invalidateCache("/user/analyses");
+  return { status: "pending" };
+};
+
+const remoteDeleteUserAnalysis = async (id: string) => {
+  const result = await http<{ status: string }>(`/user/analyses/${encodeURIComponent(id)}`, { method: "DELETE" });
+  await invalidateCache("/user/analyses");
+  return result;
 };
 
 export type ProfileResponse = {
@@ -171,73 +401,274 @@ export const getProfile = () => http<ProfileResponse>("/profile");
 
 export const getExtendedProfile = () => http<ExtendedProfileResponse>("/user/profile/extended");
 
-export const completeProfile = (data: CompleteProfileRequest) =>
-  http<{ status: string; message: string; profile: any }>("/user/profile/complete", {
+export const completeProfile = async (data: CompleteProfileRequest) => {
+  const result = await http<{ status: string; message: string; profile: any }>("/user/profile/complete", {
     method: "POST",
     body: JSON.stringify(data),
   });
+  await invalidateCache("/user/profile", "/profile");
+  return result;
+};
 
 // Project-based analysis API
-export const createProject = (data: CreateProjectRequest) =>
+const remoteCreateProject = (data: CreateProjectRequest, idempotencyKey?: string) =>
   http<AnalysisProject>("/projects/", {
     method: "POST",
     body: JSON.stringify(data),
+    headers: idempotencyKey ? idempotent(idempotencyKey) : undefined,
   });
 
-export const listProjects = (limit = 50, offset = 0) =>
-  http<ProjectSummaryListResponse>(`/projects/?limit=${limit}&offset=${offset}`);
+export const listProjects = async (limit = 50, offset = 0): Promise<ProjectSummaryListResponse> => {
+  // Projets créés hors ligne, pas encore connus du serveur
+  const pending = offset === 0 ? (await listLocalProjects()).filter((p) => isLocalId(p.id)).map(toSummary) : [];
+  try {
+    const resp = await http<ProjectSummaryListResponse>(`/projects/?limit=${limit}&offset=${offset}`);
+    return pending.length ? { ...resp, total: resp.total + pending.length, projects: [...pending, ...resp.projects] } : resp;
+  } catch (e) {
+    if (!isNetworkError(e)) throw e;
+    const local = (await listLocalProjects()).map(toSummary);
+    if (!local.length) throw e;
+    return { total: local.length, limit, offset, projects: local.slice(offset, offset + limit) };
+  }
+};
 
-export const getProject = (projectId: string) =>
-  http<AnalysisProject>(`/projects/${encodeURIComponent(projectId)}`);
+/**
+ * Local copy while it has unsynced edits, otherwise the (cached) server
+ * version, falling back to the local copy when offline.
+ */
+export const getProject = async (projectId: string): Promise<AnalysisProject> => {
+  const id = await resolveId(projectId);
+  if (isLocalId(id) || await hasPendingFor(id)) {
+    const local = await getLocalProject(id);
+    if (local) return local;
+  }
+  try {
+    const project = await cachedHttp<AnalysisProject>(projectKey(id), PROJECT_POLICY);
+    keepServerCopy(project).catch(() => {});
+    return project;
+  } catch (e) {
+    const local = isNetworkError(e) ? await getLocalProject(id) : undefined;
+    if (local) return local;
+    throw e;
+  }
+};
 
-export const addRiskToProject = (data: AddRiskRequest) =>
-  http<RiskItem>(`/projects/${encodeURIComponent(data.project_id)}/risks`, {
+/**
+ * Calls `cb` with the server copy of the project whenever a background
+ * revalidation replaces the cached one, unless local edits are still queued.
+ * Returns the unsubscribe function.
+ */
+export function onProjectRevalidated(projectId: string, cb: (project: AnalysisProject) => void): () => void {
+  let key = projectKey(projectId);
+  resolveId(projectId).then((id) => {
+    key = projectKey(id);
+  }).catch(() => {});
+  return on("cache:revalidated", ({ path, data }) => {
+    if (path !== key) return;
+    const project = data as AnalysisProject;
+    hasPendingFor(project.id).then((pending) => {
+      if (pending) return;
+      keepServerCopy(project).catch(() => {});
+      cb(project);
+    }).catch(() => {});
+  });
+}
+
+/** Calls `cb` with the new constants whenever a background revalidation refreshes them. */
+export const onConstantsRevalidated = (cb: (constants: ConstantsResponse) => void) =>
+  on("cache:revalidated", ({ path, data }) => {
+    if (path === "/constants") cb(data as ConstantsResponse);
+  });
+
+/** Current server copy of a project, bypassing the response cache and the local store. */
+const fetchProject = (projectId: string) =>
+  http<AnalysisProject>(projectKey(projectId), { headers: { "Cache-Control": "no-cache" } });
+
+/** Like getProject, without storing what it reads. */
+async function readProject(projectId: string): Promise<AnalysisProject> {
+  const id = await resolveId(projectId);
+  if (isLocalId(id) || await hasPendingFor(id)) {
+    const local = await getLocalProject(id);
+    if (local) return local;
+  }
+  return fetchProject(id);
+}
+
+/**
+ * Every project of the account with its risks, fetched one at a time so a
+ * portfolio export only holds the project being written. Read-only: nothing
+ * is written to the response cache or the local store. Projects with
+ * unsynced edits are exported from their local copy.
+ */
+export async function* iterateProjects(): AsyncGenerator<AnalysisProject> {
+  let cursor: string | null = null;
+  do {
+    const page: Page<ProjectSummary> = await pageProjects(cursor);
+    for (const summary of page.items) yield await readProject(summary.id);
+    cursor = page.nextCursor;
+  } while (cursor);
+}
+
+const remoteAddRisk = async (data: AddRiskRequest, idempotencyKey?: string) => {
+  const risk = await http<RiskItem>(`/projects/${encodeURIComponent(data.project_id)}/risks`, {
     method: "POST",
     body: JSON.stringify(data),
+    headers: idempotencyKey ? idempotent(idempotencyKey) : undefined,
   });
+  await invalidateCache(projectKey(data.project_id));
+  return risk;
+};
 
-export const updateRiskMitigation = (data: UpdateRiskMitigationRequest) =>
-  http<RiskItem>(`/projects/${encodeURIComponent(data.project_id)}/risks/${encodeURIComponent(data.risk_id)}/mitigation`, {
+const remoteUpdateRiskMitigation = async (data: UpdateRiskMitigationRequest) => {
+  const risk = await http<RiskItem>(`/projects/${encodeURIComponent(data.project_id)}/risks/${encodeURIComponent(data.risk_id)}/mitigation`, {
     method: "PUT",
     body: JSON.stringify(data),
   });
+  await invalidateCache(projectKey(data.project_id));
+  return risk;
+};
 
-export const deleteProject = async (projectId: string) => {
-  const authHeader = await getAuthHeader();
-  const res = await fetch(`${API_BASE_URL}/projects/${encodeURIComponent(projectId)}`, {
+const remoteDeleteProject = async (projectId: string) => {
+  const result = await http<{ status: string }>(projectKey(projectId), { method: "DELETE" });
+  await invalidateCache(projectKey(projectId));
+  return result;
+};
+
+const remoteDeleteRisk = async (projectId: string, riskId: string) => {
+  const result = await http<{ status: string }>(`${projectKey(projectId)}/risks/${encodeURIComponent(riskId)}`, {
     method: "DELETE",
-    headers: {
-      ...authHeader,
-    },
   });
-  if (!res.ok) {
-    const text = await res.text();
-    throw new Error(`${res.status} ${res.statusText}: ${text}`);
-  }
-  return res.json();
+  await invalidateCache(projectKey(projectId));
+  return result;
 };
 
-export const deleteRiskFromProject = async (projectId: string, riskId: string) => {
-  const authHeader = await getAuthHeader();
-  const res = await fetch(`${API_BASE_URL}/projects/${encodeURIComponent(projectId)}/risks/${encodeURIComponent(riskId)}`, {
-    method: "DELETE",
-    headers: {
-      ...authHeader,
+// Sauvegarde groupée d'un projet complet (projet + risques + évaluations résiduelles)
+export function buildBulkSaveRequest(state: AnalysisState): BulkSaveProjectRequest {
+  return {
+    project: {
+      project_type: state.projectType!,
+      project_description: state.projectDescription!,
+      entity_type: state.entityType,
+      entity_services: state.entityServices,
+      analysis_title: state.analysisTitle!,
+      sector: state.sector,
     },
-  });
-  if (!res.ok) {
-    const text = await res.text();
-    throw new Error(`${res.status} ${res.statusText}: ${text}`);
+    risks: state.risks
+      .filter((r) => !!r.userResult)
+      .map((r) => {
+        const withMitigation = !!r.mitigation && !!r.residualResult;
+        return {
+          client_id: r.id,
+          description: r.description,
+          category: r.category,
+          type: r.type,
+          G: r.userResult!.G,
+          F: r.userResult!.F,
+          P: r.userResult!.P,
+          ...(withMitigation ? {
+            mitigation_measure: r.mitigation,
+            residual_G: r.residualResult!.G,
+            residual_F: r.residualResult!.F,
+            residual_P: r.residualResult!.P,
+          } : {}),
+        };
+      }),
+  };
+}
+
+const pipelineOps: SaveOperations = {
+  createProject: (data, key) =>
+    http<AnalysisProject>("/projects/", { method: "POST", body: JSON.stringify(data), headers: idempotent(key) }),
+  addRisk: (data, key) =>
+    http<RiskItem>(`/projects/${encodeURIComponent(data.project_id)}/risks`, {
+      method: "POST",
+      body: JSON.stringify(data),
+      headers: idempotent(key),
+    }),
+  updateMitigation: (data, key) =>
+    http<RiskItem>(`/projects/${encodeURIComponent(data.project_id)}/risks/${encodeURIComponent(data.risk_id)}/mitigation`, {
+      method: "PUT",
+      body: JSON.stringify(data),
+      headers: idempotent(key),
+    }),
+};
+
+// undefined until the first bulk save tells us whether the server supports it
+let bulkEndpointAvailable: boolean | undefined;
+const saveJournals = new Map<string, SaveJournal>();
+
+export type BulkSaveOptions = {
+  /** Reuse the same key when retrying a failed save. */
+  idempotencyKey: string;
+  /**
+   * Key of an earlier failed attempt whose payload has since been edited.
+   * The project that attempt left half-written is deleted first, so it
+   * is not orphaned on the server.
+   */
+  supersedes?: string;
+  concurrency?: number;
+  onProgress?: (p: BulkSaveProgress) => void;
+};
+
+/**
+ * Persist a whole project in one batched request, falling back to a
+ * bounded-concurrency pipeline of individual calls when `/projects/bulk`
+ * is not available. Returns the server project id.
+ */
+export const saveProjectBulk = async (payload: BulkSaveProjectRequest, options: BulkSaveOptions): Promise<string> => {
+  const key = options.idempotencyKey;
+  const stale = options.supersedes && options.supersedes !== key ? saveJournals.get(options.supersedes) : undefined;
+  if (stale) {
+    if (stale.projectId) {
+      try { await remoteDeleteProject(stale.projectId); } catch (e) { if (!isNotFound(e)) throw e; }
+    }
+    saveJournals.delete(options.supersedes!);
+  }
+  let journal = saveJournals.get(key);
+  if (!journal) {
+    journal = { riskIds: {}, mitigated: {} };
+    saveJournals.set(key, journal);
   }
-  return res.json();
+
+  let projectId: string | undefined;
+  // Once the pipeline has written something, keep resuming it rather than switching to the batch.
+  if (bulkEndpointAvailable !== false && !journal.projectId) {
+    const res = await request("/projects/bulk", {
+      method: "POST",
+      body: JSON.stringify(payload),
+      headers: idempotent(key),
+    });
+    if (res.ok) {
+      bulkEndpointAvailable = true;
+      const project = await readJson<AnalysisProject>(res, "/projects/bulk", { method: "POST" });
+      projectId = project.id;
+      const total = countOperations(payload);
+      options.onProgress?.({ completed: total, total });
+    } else if (res.status === 404 || res.status === 405 || res.status === 501) {
+      bulkEndpointAvailable = false;
+    } else {
+      throw await httpError(res);
+    }
+  }
+
+  if (!projectId) {
+    projectId = await runSavePipeline(payload, pipelineOps, key, journal, options);
+  }
+
+  saveJournals.delete(key);
+  await invalidateCache(projectKey(projectId));
+  return projectId;
 };
 
 // Mettre à jour un projet existant
-export const updateProject = (projectId: string, data: Partial<CreateProjectRequest>) =>
-  http<AnalysisProject>(`/projects/${encodeURIComponent(projectId)}`, {
+const remoteUpdateProject = async (projectId: string, data: Partial<CreateProjectRequest>) => {
+  const project = await http<AnalysisProject>(`/projects/${encodeURIComponent(projectId)}`, {
     method: "PUT",
     body: JSON.stringify(data),
   });
+  await invalidateCache(projectKey(projectId));
+  return project;
+};
 
 // Dupliquer un projet
 export const duplicateProject = (projectId: string, newTitle?: string) =>
@@ -246,26 +677,320 @@ export const duplicateProject = (projectId: string, newTitle?: string) =>
     body: JSON.stringify({ new_title: newTitle }),
   });
 
-// Lancer une analyse IA comparative pour un projet
-export const analyzeProjectWithIA = async (projectId: string) => {
-  return http<{
-    project_id: string;
-    comparisons: Array<{
-      risk_id: string;
-      risk_description: string;
-      human_analysis: {
-        G: number; F: number; P: number; score: number; classification: string;
-      };
-      ia_analysis: {
-        G: number; F: number; P: number; score: number; classification: string;
-        causes?: string[]; recommendations?: string[]; justification?: string;
-      };
-      comparison: {
-        agreement_level?: string;
-        classifications_match?: boolean;
-      };
-    }>;
-  }>(`/projects/${encodeURIComponent(projectId)}/ai-analysis`, {
-    method: "POST",
-  });
+// ---------------------------------------------------------------------------
+// Offline-first mutations: applied to the local store, then queued in the
+// outbox and replayed by the sync worker (see lib/outbox.ts).
+
+function toSummary(p: AnalysisProject): ProjectSummary {
+  return {
+    id: p.id,
+    analysis_title: p.analysis_title,
+    project_type: p.project_type,
+    entity_type: p.entity_type,
+    sector: p.sector,
+    risks_count: p.risks.length,
+    completed_risks_count: p.risks.filter((r) => !!r.residual_evaluation).length,
+    status: p.status,
+    created_at: p.created_at,
+    updated_at: p.updated_at,
+  };
+}
+
+/** Store a server copy locally; later local edits are based on its version. */
+async function keepServerCopy(project: AnalysisProject) {
+  await saveProjectLocally(project);
+  await setServerVersion(project.id, project.updated_at);
+}
+
+async function touchLocalProject(projectId: string, patch: Partial<AnalysisProject> = {}) {
+  const local = await getLocalProject(projectId);
+  if (!local) return undefined;
+  const updated = { ...local, ...patch, updated_at: new Date().toISOString() };
+  await saveProjectLocally(updated);
+  return updated;
+}
+
+export const createProject = async (data: CreateProjectRequest): Promise<AnalysisProject> => {
+  const now = new Date().toISOString();
+  const project: AnalysisProject = {
+    ...data,
+    id: newLocalId(),
+    risks: [],
+    user_uid: "",
+    created_at: now,
+    updated_at: now,
+    status: "draft",
+  };
+  await saveProjectLocally(project);
+  await enqueue("createProject", { local_id: project.id, data });
+  return project;
+};
+
+export const updateProject = async (projectId: string, data: Partial<CreateProjectRequest>): Promise<AnalysisProject> => {
+  const id = await resolveId(projectId);
+  if (!(await getLocalProject(id))) return remoteUpdateProject(id, data);
+  const updated = (await touchLocalProject(id, data))!;
+  await enqueue("updateProject", { project_id: id, data }, await getServerVersion(id));
+  await invalidateCache(projectKey(id));
+  return updated;
+};
+
+export const deleteProject = async (projectId: string) => {
+  const id = await resolveId(projectId);
+  await removeProjectLocally(id);
+  await enqueue("deleteProject", { project_id: id });
+  await invalidateCache(projectKey(id));
+  return { status: "pending" };
+};
+
+export const addRiskToProject = async (data: AddRiskRequest): Promise<RiskItem> => {
+  const projectId = await resolveId(data.project_id);
+  if (!(await getLocalProject(projectId))) return remoteAddRisk({ ...data, project_id: projectId });
+  const risk: RiskItem = {
+    id: newLocalId(),
+    description: data.description,
+    category: data.category,
+    type: data.type,
+    initial_evaluation: evaluate(data.G, data.F, data.P),
+    mitigation_measure: "",
+    residual_evaluation: null,
+    created_at: new Date().toISOString(),
+  };
+  await saveRiskLocally(projectId, risk);
+  await touchLocalProject(projectId);
+  await enqueue("addRisk", { local_id: risk.id, data: { ...data, project_id: projectId } });
+  await invalidateCache(projectKey(projectId));
+  return risk;
+};
+
+export const updateRiskMitigation = async (data: UpdateRiskMitigationRequest): Promise<RiskItem> => {
+  const projectId = await resolveId(data.project_id);
+  const riskId = await resolveId(data.risk_id);
+  const local = await getLocalProject(projectId);
+  const current = local?.risks.find((r) => r.id === riskId);
+  if (!current) return remoteUpdateRiskMitigation({ ...data, project_id: projectId, risk_id: riskId });
+  const risk: RiskItem = {
+    ...current,
+    mitigation_measure: data.mitigation_measure,
+    residual_evaluation: evaluate(data.residual_G, data.residual_F, data.residual_P),
+  };
+  await saveRiskLocally(projectId, risk);
+  await touchLocalProject(projectId);
+  await enqueue("updateRiskMitigation", { ...data, project_id: projectId, risk_id: riskId }, await getServerVersion(projectId));
+  await invalidateCache(projectKey(projectId));
+  return risk;
+};
+
+export const deleteRiskFromProject = async (projectId: string, riskId: string) => {
+  const pid = await resolveId(projectId);
+  const rid = await resolveId(riskId);
+  await removeRiskLocally(pid, rid);
+  await touchLocalProject(pid);
+  await enqueue("deleteRisk", { project_id: pid, risk_id: rid });
+  await invalidateCache(projectKey(pid));
+  return { status: "pending" };
+};
+
+const replaceId = (from: string, to: string) => (payload: any) => {
+  const json = JSON.stringify(payload);
+  return json.includes(`"${from}"`) ? JSON.parse(json.split(`"${from}"`).join(`"${to}"`)) : payload;
+};
+
+const isNotFound = (e: any) => /^404 /.test(String(e?.message || ""));
+
+/**
+ * Returns the server project when it changed since the version the queued
+ * edit was based on, i.e. someone else modified it in the meantime. Edits
+ * with an unknown base version are applied.
+ */
+async function newerOnServer(projectId: string, op: OutboxOp): Promise<AnalysisProject | null> {
+  if (!op.base_version) return null;
+  const server = await fetchProject(projectId);
+  return Date.parse(server.updated_at) > Date.parse(op.base_version) ? server : null;
+}
+
+/**
+ * Record the version our own write produced, so that it does not count as a
+ * concurrent edit for the operations still queued on the project. The risk
+ * endpoints don't return the project: read it back, or give up on checking
+ * the queued edits when that fails.
+ */
+async function afterOwnWrite(projectId: string, version?: string) {
+  if (!version) version = await fetchProject(projectId).then((p) => p.updated_at, () => undefined);
+  await setServerVersion(projectId, version);
+  await rebasePending(projectId, version);
+}
+
+setOutboxHandler(async (op) => {
+  const p = op.payload;
+  switch (op.type) {
+    case "createProject": {
+      const project = await remoteCreateProject(p.data, op.id);
+      await remapProjectId(p.local_id, project.id);
+      await rewritePending(replaceId(p.local_id, project.id));
+      await afterOwnWrite(project.id, project.updated_at);
+      return "done";
+    }
+    case "addRisk": {
+      const risk = await remoteAddRisk(p.data, op.id);
+      await remapRiskId(p.data.project_id, p.local_id, risk);
+      await rewritePending(replaceId(p.local_id, risk.id));
+      await afterOwnWrite(p.data.project_id);
+      return "done";
+    }
+    case "updateProject":
+    case "updateRiskMitigation": {
+      const server = await newerOnServer(p.project_id, op);
+      if (server) {
+        // The server copy wins; drop the local edit.
+        await keepServerCopy(server);
+        await invalidateCache(projectKey(p.project_id));
+        return "superseded";
+      }
+      if (op.type === "updateProject") {
+        const project = await remoteUpdateProject(p.project_id, p.data);
+        const local = await getLocalProject(p.project_id);
+        await saveProjectLocally({ ...project, risks: local?.risks ?? project.risks });
+        await afterOwnWrite(p.project_id, project.updated_at);
+      } else {
+        const risk = await remoteUpdateRiskMitigation(p);
+        await saveRiskLocally(p.project_id, risk);
+        await afterOwnWrite(p.project_id);
+      }
+      return "done";
+    }
+    case "deleteProject":
+      try { await remoteDeleteProject(p.project_id); } catch (e) { if (!isNotFound(e)) throw e; }
+      return "done";
+    case "deleteRisk":
+      try { await remoteDeleteRisk(p.project_id, p.risk_id); } catch (e) { if (!isNotFound(e)) throw e; }
+      await afterOwnWrite(p.project_id);
+      return "done";
+    case "deleteUserAnalysis":
+      try { await remoteDeleteUserAnalysis(p.id); } catch (e) { if (!isNotFound(e)) throw e; }
+      return "done";
+  }
+});
+
+// The server rejected a creation (or the creation it depended on): the
+// records only exist on this device, remove them.
+setDiscardHandler(async (op) => {
+  const p = op.payload;
+  if (op.type === "createProject") {
+    await removeProjectLocally(p.local_id);
+    await invalidateCache("/projects");
+  } else if (op.type === "addRisk") {
+    await removeRiskLocally(p.data.project_id, p.local_id);
+    await invalidateCache(projectKey(p.data.project_id));
+  }
+});
+
+export type AIAnalysisOptions = {
+  /** Risks of the project; loaded with getProject when omitted. */
+  risks?: RiskItem[];
+  signal?: AbortSignal;
+  /** Called for every comparison as soon as it is known, cached ones first. */
+  onComparison?: (comparison: ProjectAIComparison, source: "cache" | "server") => void;
+  /** Ignore cached comparisons and re-analyse every risk. */
+  force?: boolean;
 };
+
+function comparisonsIn(value: any): ProjectAIComparison[] {
+  if (!value || typeof value !== "object") return [];
+  if (value.type === "comparison") return value.data ? [value.data] : [];
+  if (value.type === "error") {
+    log.warn("[API] IA analysis failed for risk", value.risk_id, value.message);
+    return [];
+  }
+  if (Array.isArray(value.comparisons)) return value.comparisons;
+  return value.risk_id && value.ia_analysis ? [value] : [];
+}
+
+// Lancer une analyse IA comparative pour un projet.
+// Seuls les risques modifiés depuis la dernière analyse sont envoyés ; les
+// comparaisons arrivent une par une (NDJSON / SSE) et sont annulables.
+export const analyzeProjectWithIA = async (
+  projectId: string,
+  options: AIAnalysisOptions = {}
+): Promise<ProjectAIAnalysisResponse> => {
+  const id = await resolveId(projectId);
+  const risks = options.risks ?? (await getProject(id)).risks;
+  const hashes = new Map(risks.map((r) => [r.id, riskContentHash(projectRiskContent(r))]));
+  const byRisk = new Map<string, ProjectAIComparison>();
+  const stale: string[] = [];
+
+  for (const r of risks) {
+    const cached = options.force ? undefined : await getCachedComparison(hashes.get(r.id)!);
+    if (!cached) {
+      stale.push(r.id);
+      continue;
+    }
+    // Same content under another id (duplicated or re-created risk): re-key it
+    const comparison = { ...cached, risk_id: r.id, risk_description: r.description };
+    byRisk.set(r.id, comparison);
+    options.onComparison?.(comparison, "cache");
+  }
+
+  const key = endpointKey("POST", `/projects/${id}/ai-analysis`);
+  recordCache(key, "hit", risks.length - stale.length);
+  recordCache(key, "miss", stale.length);
+
+  if (stale.length) {
+    log.debug(`[API] IA analysis: ${stale.length}/${risks.length} risks to analyse`);
+    const body = JSON.stringify({ risk_ids: stale });
+    const authHeader = await getAuthHeader();
+    const started = now();
+    // Whole stream, until the last comparison
+    const done = (status: number) => recordRequest(key, { ms: now() - started, status, sentBytes: utf8Length(body) });
+    const send = (auth: Record<string, string>) =>
+      streamJson(
+        {
+          url: `${API_BASE_URL}/projects/${encodeURIComponent(id)}/ai-analysis?stream=1`,
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+            Accept: "application/x-ndjson, text/event-stream;q=0.9, application/json;q=0.5",
+            ...auth,
+          },
+          body,
+          signal: options.signal,
+        },
+        (value) => {
+          for (const comparison of comparisonsIn(value)) {
+            const hash = hashes.get(comparison.risk_id);
+            if (!hash) continue;
+            byRisk.set(comparison.risk_id, comparison);
+            putCachedComparison(hash, comparison).catch(() => {});
+            options.onComparison?.(comparison, "server");
+          }
+        }
+      );
+    try {
+      try {
+        await send(authHeader);
+      } catch (e) {
+        // As in request(): token revoked or expired early, retry exactly once
+        // with a forced refresh. A 401 comes before any streamed comparison.
+        if (!/^401 /.test(String((e as Error)?.message)) || !authHeader?.Authorization) throw e;
+        const token = await refreshToken();
+        if (!token) throw e;
+        log.debug(`[API] 401 for ${key}, retrying with a refreshed token`);
+        await send({ Authorization: `Bearer ${token}` });
+      }
+    } catch (e) {
+      // Aborted streams are not server errors
+      if (!isAbortError(e)) done(Number(/^(\d{3}) /.exec((e as Error)?.message ?? "")?.[1] ?? 0));
+      throw e;
+    }
+    done(200);
+  }
+
+  return {
+    project_id: id,
+    comparisons: risks.map((r) => byRisk.get(r.id)).filter((c): c is ProjectAIComparison => !!c),
+  };
+};
+
+/** Comparison of a project risk from the client cache, if its content was already analysed. */
+export const getCachedRiskComparison = (risk: RiskItem) =>
+  getCachedComparison(riskContentHash(projectRiskContent(risk)));
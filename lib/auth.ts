@@ -1,10 +1,28 @@
 // Lightweight auth helper to provide Authorization header with Firebase ID token if available.
 // This works even if Firebase SDK is not installed (fails gracefully).
+//
+// Token manager: the SDK is resolved once, concurrent callers share a single
+// in-flight refresh, and tokens are renewed ahead of the `exp` claim they carry.
+
+import { initFirebaseApp, getFirebaseAuth } from "./firebase";
+import { log, now, recordAuthWait } from "./telemetry";
+import { claimLocalStore } from "./localStore";
 
 let customTokenProvider: (() => Promise<string | null>) | null = null;
 let cachedToken: string | null = null;
 let tokenExpiry: number = 0;
-import { initFirebaseApp, getFirebaseAuth } from "./firebase";
+// Bumped by clearTokenCache so a refresh started before sign-out can't repopulate the cache
+let cacheGeneration = 0;
+
+// Renew this long before the real expiry so requests never carry a token about to lapse
+const REFRESH_MARGIN = 5 * 60 * 1000;
+// Used only when the token cannot be decoded
+const FALLBACK_LIFETIME = 55 * 60 * 1000;
+// Shortest wait before a background refresh, doubled (up to the margin) while
+// refreshes keep returning a token whose expiry did not move forward
+const MIN_REFRESH_DELAY = 30 * 1000;
+// Longest wait for the SDK to restore a persisted session at startup
+const AUTH_STATE_TIMEOUT = 3000;
 
 /**
  * Optionally register a custom token provider (e.g., your login flow can set this).
@@ -13,33 +31,65 @@ export function setCustomTokenProvider(fn: () => Promise<string | null>) {
   customTokenProvider = fn;
 }
 
-/**
- * Try to fetch an ID token from Firebase SDKs when present.
- */
-async function tryGetFirebaseToken(): Promise<string | null> {
-  // Check cache first (tokens are valid for 1 hour)
-  const now = Date.now();
-  if (cachedToken && tokenExpiry > now) {
-    console.log('[Auth] Using cached token');
-    return cachedToken;
-  }
+// ---------------------------------------------------------------------------
+// Synchronous auth state (read by useAuthGuard without awaiting anything)
 
-  console.log('[Auth] Fetching fresh token from Firebase...');
+export type AuthStatus = "unknown" | "signedIn" | "signedOut";
+
+let status: AuthStatus = "unknown";
+const listeners = new Set<() => void>();
+
+function setStatus(next: AuthStatus) {
+  if (status === next) return;
+  status = next;
+  listeners.forEach((l) => l());
+}
+
+export function getAuthStatus(): AuthStatus {
+  return status;
+}
+
+export function subscribeAuthStatus(listener: () => void): () => void {
+  listeners.add(listener);
+  return () => {
+    listeners.delete(listener);
+  };
+}
 
+/** True when a token is cached and not within the refresh margin of its expiry. */
+export function hasFreshToken(): boolean {
+  return !!cachedToken && tokenExpiry - REFRESH_MARGIN > Date.now();
+}
+
+// ---------------------------------------------------------------------------
+// SDK resolution (once)
+
+type AuthSdk = {
+  name: string;
+  currentUser(): any;
+  getToken(user: any, force: boolean): Promise<string | null>;
+  onAuthStateChanged(cb: (user: any) => void): () => void;
+};
+
+let sdkPromise: Promise<AuthSdk | null> | null = null;
+let authReady: Promise<void> | null = null;
+// undefined until the SDK has reported the session restored at startup
+let lastUid: string | null | undefined = undefined;
+// Local data of another account is dropped before any request is authorised
+let storeClaim: Promise<void> = Promise.resolve();
+
+async function loadSdk(): Promise<AuthSdk | null> {
   // Try @react-native-firebase/auth first (common in RN apps)
   try {
     // @ts-ignore - optional dependency
     const rnAuth = await import('@react-native-firebase/auth');
-    const current = rnAuth.default().currentUser;
-    if (current) {
-      const token = await current.getIdToken();
-      if (token) {
-        cachedToken = token;
-        tokenExpiry = now + 55 * 60 * 1000; // Cache for 55 minutes
-        console.log('[Auth] Token from RN Firebase');
-        return token;
-      }
-    }
+    const auth = rnAuth.default();
+    return {
+      name: "rn-firebase",
+      currentUser: () => auth.currentUser,
+      getToken: (user, force) => user.getIdToken(force),
+      onAuthStateChanged: (cb) => auth.onAuthStateChanged(cb),
+    };
   } catch {}
 
   // Fallback to Web SDK if used in Expo Web
@@ -48,64 +98,160 @@ async function tryGetFirebaseToken(): Promise<string | null> {
     await initFirebaseApp();
     const auth = await getFirebaseAuth();
     const firebaseAuth: any = await import('firebase/auth');
-    let current = auth.currentUser;
-    
-    console.log('[Auth] Firebase currentUser:', current ? 'exists' : 'null');
-    
-    // currentUser peut être null au démarrage; attendre l'état d'auth
-    if (!current) {
-      console.log('[Auth] Waiting for auth state...');
-      current = await new Promise<any>((resolve) => {
-        const unsub = firebaseAuth.onAuthStateChanged(auth, (u: any) => {
-          console.log('[Auth] Auth state resolved:', u ? 'user found' : 'no user');
-          try { unsub(); } catch {}
-          resolve(u);
-        });
-        // Augmenter le timeout pour laisser le temps à Firebase de se synchroniser
-        setTimeout(() => {
-          console.log('[Auth] Auth state timeout');
-          try { unsub(); } catch {}
-          resolve(null);
-        }, 3000);
-      });
-    }
-    
-    if (current) {
-      console.log('[Auth] Getting token from current user...');
-      const token = await firebaseAuth.getIdToken(current);
-      if (token) {
-        cachedToken = token;
-        tokenExpiry = now + 55 * 60 * 1000; // Cache for 55 minutes
-        console.log('[Auth] Token retrieved successfully');
-        return token;
-      }
-    }
+    return {
+      name: "firebase-web",
+      currentUser: () => auth.currentUser,
+      getToken: (user, force) => firebaseAuth.getIdToken(user, force),
+      onAuthStateChanged: (cb) => firebaseAuth.onAuthStateChanged(auth, cb),
+    };
   } catch (e) {
-    console.error('[Auth] Error getting Firebase token:', e);
+    log.error('[Auth] Error loading Firebase SDK:', e);
   }
-
-  console.warn('[Auth] No token available');
   return null;
 }
 
-export async function getIdToken(): Promise<string | null> {
+function getSdk(): Promise<AuthSdk | null> {
+  if (!sdkPromise) {
+    sdkPromise = loadSdk().then((sdk) => {
+      if (!sdk) sdkPromise = null; // retry on next call
+      return sdk;
+    });
+  }
+  return sdkPromise;
+}
+
+/**
+ * Resolves once the SDK has reported the persisted session (or after a short
+ * timeout). The listener stays attached and keeps the cache and status in sync.
+ */
+function whenAuthReady(sdk: AuthSdk): Promise<void> {
+  if (!authReady) {
+    authReady = new Promise<void>((resolve) => {
+      const timer = setTimeout(() => {
+        log.warn('[Auth] Auth state timeout');
+        resolve();
+      }, AUTH_STATE_TIMEOUT);
+      sdk.onAuthStateChanged((user) => {
+        const uid = user?.uid ?? null;
+        if (uid) storeClaim = claimLocalStore(uid).catch((e) => log.warn('[Auth] Local store claim failed:', e));
+        // The first report is the session being restored, not a change of
+        // account: clearing there would also drop the cold-start refresh
+        // waiting on it and break single flight.
+        if (lastUid !== undefined && uid !== lastUid) clearTokenCache();
+        lastUid = uid;
+        setStatus(user ? "signedIn" : "signedOut");
+        clearTimeout(timer);
+        resolve();
+      });
+    });
+  }
+  return authReady;
+}
+
+// ---------------------------------------------------------------------------
+// Token refresh (single flight)
+
+/** Expiry (ms) from the JWT `exp` claim, or null if the token can't be decoded. */
+export function tokenExpiresAt(token: string): number | null {
+  try {
+    const payload = token.split(".")[1];
+    const base64 = payload.replace(/-/g, "+").replace(/_/g, "/").padEnd(Math.ceil(payload.length / 4) * 4, "=");
+    const exp = JSON.parse(atob(base64)).exp;
+    return typeof exp === "number" ? exp * 1000 : null;
+  } catch {
+    return null;
+  }
+}
+
+let refreshTimer: ReturnType<typeof setTimeout> | null = null;
+let refreshFloor = MIN_REFRESH_DELAY;
+
+function storeToken(token: string) {
+  const previousExpiry = tokenExpiry;
+  cachedToken = token;
+  tokenExpiry = tokenExpiresAt(token) ?? Date.now() + FALLBACK_LIFETIME;
+  // A token already inside the margin comes back unchanged from a forced
+  // refresh: back off instead of looping on a 0 ms timer
+  refreshFloor = tokenExpiry > previousExpiry ? MIN_REFRESH_DELAY : Math.min(refreshFloor * 2, REFRESH_MARGIN);
+  if (refreshTimer) clearTimeout(refreshTimer);
+  // Renew in the background so no request waits on the network for it
+  const delay = Math.max(refreshFloor, tokenExpiry - REFRESH_MARGIN - Date.now());
+  refreshTimer = setTimeout(() => {
+    refreshTimer = null;
+    refresh(true).catch(() => {});
+  }, delay);
+}
+
+async function fetchToken(force: boolean): Promise<string | null> {
+  const sdk = await getSdk();
+  if (!sdk) {
+    setStatus("signedOut");
+    return null;
+  }
+  await whenAuthReady(sdk);
+  await storeClaim;
+  const user = sdk.currentUser();
+  if (!user) {
+    setStatus("signedOut");
+    return null;
+  }
+  const generation = cacheGeneration;
+  log.debug(`[Auth] Fetching ${force ? "refreshed" : "fresh"} token from ${sdk.name}...`);
+  const token = await sdk.getToken(user, force);
+  if (!token || generation !== cacheGeneration) return null;
+  storeToken(token);
+  setStatus("signedIn");
+  return token;
+}
+
+let inflight: { promise: Promise<string | null>; forced: boolean } | null = null;
+
+/**
+ * Concurrent callers share the pending refresh. A forced refresh only joins a
+ * pending one that was itself forced: an unforced one may hand back the token
+ * the server just rejected.
+ */
+function refresh(force: boolean): Promise<string | null> {
+  if (inflight && (inflight.forced || !force)) return inflight.promise;
+  const promise = fetchToken(force)
+    .catch((e) => {
+      log.error('[Auth] Error getting Firebase token:', e);
+      return null;
+    })
+    .finally(() => {
+      if (inflight?.promise === promise) inflight = null;
+    });
+  inflight = { promise, forced: force };
+  return promise;
+}
+
+async function tryGetFirebaseToken(force = false): Promise<string | null> {
+  if (!force && hasFreshToken()) return cachedToken;
+  return refresh(force);
+}
+
+export async function getIdToken(options: { forceRefresh?: boolean } = {}): Promise<string | null> {
+  const started = now();
   if (customTokenProvider) {
     try {
       const t = await customTokenProvider();
-      if (t) return t;
+      if (t) {
+        setStatus("signedIn");
+        recordAuthWait(now() - started, "refresh");
+        return t;
+      }
     } catch {}
   }
-  return await tryGetFirebaseToken();
+  const cached = !options.forceRefresh && hasFreshToken();
+  const token = await tryGetFirebaseToken(!!options.forceRefresh);
+  recordAuthWait(now() - started, !token ? "none" : cached ? "cache" : "refresh");
+  if (!token) log.debug('[Auth] No token available');
+  return token;
 }
 
 export async function getAuthHeader(): Promise<Record<string, string>> {
-  console.log('[Auth] getAuthHeader called');
   const token = await getIdToken();
-  console.log('[Auth] Token result:', token ? `${token.length} chars` : 'null');
-  if (!token) {
-    console.warn('[Auth] No token available for Authorization header');
-    return {};
-  }
+  if (!token) return {};
   return { Authorization: `Bearer ${token}` };
 }
 
@@ -115,12 +261,17 @@ export async function getAuthHeader(): Promise<Record<string, string>> {
 export function clearTokenCache() {
   cachedToken = null;
   tokenExpiry = 0;
+  cacheGeneration++;
+  inflight = null;
+  if (refreshTimer) {
+    clearTimeout(refreshTimer);
+    refreshTimer = null;
+  }
 }
 
 /**
  * Force refresh the token from Firebase (bypasses cache)
  */
 export async function refreshToken(): Promise<string | null> {
-  clearTokenCache();
-  return await tryGetFirebaseToken();
+  return getIdToken({ forceRefresh: true });
 }
@@ -3,12 +3,10 @@
 
 import { initFirebaseApp, getFirebaseAuth } from "./firebase";
 import { clearTokenCache } from "./auth";
-import { 
-  signInWithEmailAndPassword, 
-  createUserWithEmailAndPassword,
-  signOut as firebaseSignOut,
-  GoogleAuthProvider
-} from 'firebase/auth';
+import { clearResponseCache } from "./cache";
+import { clearLocalStore } from "./localStore";
+import { pendingCount, syncNow } from "./outbox";
+import { log } from "./telemetry";
 import { Platform } from 'react-native';
 
 export async function signInWithEmail(email: string, password: string): Promise<void> {
@@ -43,6 +41,7 @@ export async function signInWithEmail(email: string, password: string): Promise<
   try {
     await initFirebaseApp();
     const auth = await getFirebaseAuth();
+    const { signInWithEmailAndPassword } = await import('firebase/auth');
     const userCredential = await signInWithEmailAndPassword(auth, email, password);
     
     // Check if email is verified
@@ -126,7 +125,7 @@ export async function signUpWithEmail(email: string, password: string): Promise<
       if (userCredential.user) {
         try {
           await userCredential.user.sendEmailVerification();
-          console.log("[Auth] Email verification sent to:", email);
+          log.debug("[Auth] Email verification sent to:", email);
         } catch (emailError) {
           console.error("[Auth] Failed to send verification email:", emailError);
           // Don't throw - account is created, just email failed
@@ -147,6 +146,7 @@ export async function signUpWithEmail(email: string, password: string): Promise<
   try {
     await initFirebaseApp();
     const auth = await getFirebaseAuth();
+    const { createUserWithEmailAndPassword } = await import('firebase/auth');
     const userCredential = await createUserWithEmailAndPassword(auth, email, password);
     
     // Send email verification with custom redirect URL
@@ -166,7 +166,7 @@ export async function signUpWithEmail(email: string, password: string): Promise<
         };
         
         await sendEmailVerification(userCredential.user, actionCodeSettings);
-        console.log("[Auth] Email verification sent to:", email, "with redirect to", actionCodeSettings.url);
+        log.debug("[Auth] Email verification sent to:", email, "with redirect to", actionCodeSettings.url);
       } catch (emailError) {
         console.error("[Auth] Failed to send verification email:", emailError);
         // Don't throw - account is created, just email failed
@@ -211,7 +211,7 @@ export async function resendVerificationEmail(): Promise<void> {
     }
     await user.sendEmailVerification();
     lastEmailSentTime = Date.now(); // Mettre à jour le timestamp
-    console.log("[Auth] Verification email resent to:", user.email);
+    log.debug("[Auth] Verification email resent to:", user.email);
     return;
   } catch (importError) {
     // Module not available, continue to Web SDK
@@ -245,23 +245,38 @@ export async function resendVerificationEmail(): Promise<void> {
   
   await sendEmailVerification(user, actionCodeSettings);
   lastEmailSentTime = Date.now(); // Mettre à jour le timestamp
-  console.log("[Auth] Verification email resent to:", user.email, "with redirect to", actionCodeSettings.url);
+  log.debug("[Auth] Verification email resent to:", user.email, "with redirect to", actionCodeSettings.url);
 }
 
-export async function signOut(): Promise<void> {
+/**
+ * Sign out and drop the account's local data. Offline edits still queued are
+ * sent first; when some can't be (offline, server down) nothing is done and
+ * their number is returned, unless `discardPending` confirms they may be lost.
+ */
+export async function signOut(options: { discardPending?: boolean } = {}): Promise<{ pending: number }> {
+  if (!options.discardPending && (await pendingCount())) {
+    const pending = await syncNow();
+    if (pending) return { pending };
+  }
+
   // Clear the token cache on sign out
   clearTokenCache();
+  // Cached responses and local records belong to the signed-out account
+  await clearResponseCache();
+  await clearLocalStore();
   
   try {
     // @ts-ignore optional dependency
     const rnAuth = await import("@react-native-firebase/auth");
     await rnAuth.default().signOut();
-    return;
+    return { pending: 0 };
   } catch {}
 
   await initFirebaseApp();
   const auth = await getFirebaseAuth();
+  const { signOut: firebaseSignOut } = await import('firebase/auth');
   await firebaseSignOut(auth);
+  return { pending: 0 };
 }
 
 export async function signInWithGoogle(): Promise<void> {
@@ -276,7 +291,7 @@ export async function signInWithGoogle(): Promise<void> {
       const auth = await getFirebaseAuth();
       
       // Dynamic import for web-only method
-      const { signInWithPopup } = await import('firebase/auth');
+      const { signInWithPopup, GoogleAuthProvider } = await import('firebase/auth');
       const provider = new GoogleAuthProvider();
       
       // Add scopes for better user info
@@ -358,7 +373,7 @@ export async function signInWithGoogle(): Promise<void> {
         await new Promise(resolve => setTimeout(resolve, 300));
       }
       
-      console.log("[Google Sign-In Mobile] Success:", userCredential.user.email);
+      log.debug("[Google Sign-In Mobile] Success:", userCredential.user.email);
       return;
     } catch (error: any) {
       console.error("[Google Sign-In Mobile] Error:", error);
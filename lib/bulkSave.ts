@@ -0,0 +1,133 @@
+// Fallback pipeline used to persist a whole project when the batch endpoint
+// is not available. Kept free of React Native imports so it can be driven by
+// scripts/bench-project-save.ts.
+
+import type {
+  AddRiskRequest,
+  AnalysisProject,
+  BulkSaveProgress,
+  BulkSaveProjectRequest,
+  CreateProjectRequest,
+  RiskItem,
+  UpdateRiskMitigationRequest,
+} from "./types";
+
+export type SaveOperations = {
+  createProject: (data: CreateProjectRequest, idempotencyKey: string) => Promise<AnalysisProject>;
+  addRisk: (data: AddRiskRequest, idempotencyKey: string) => Promise<RiskItem>;
+  updateMitigation: (data: UpdateRiskMitigationRequest, idempotencyKey: string) => Promise<RiskItem>;
+};
+
+/**
+ * What a save attempt already wrote on the server. A retry with the same
+ * idempotency key resumes from here instead of creating a second project.
+ */
+export type SaveJournal = {
+  projectId?: string;
+  riskIds: Record<string, string>; // client_id -> server risk id
+  mitigated: Record<string, true>;
+};
+
+export type PipelineOptions = {
+  concurrency?: number;
+  onProgress?: (p: BulkSaveProgress) => void;
+};
+
+export const DEFAULT_SAVE_CONCURRENCY = 4;
+
+export function newIdempotencyKey(): string {
+  return `save_${Date.now().toString(36)}_${Math.random().toString(36).slice(2, 10)}`;
+}
+
+export function countOperations(req: BulkSaveProjectRequest): number {
+  return 1 + req.risks.reduce((n, r) => n + (hasMitigation(r) ? 2 : 1), 0);
+}
+
+function hasMitigation(r: BulkSaveProjectRequest["risks"][number]) {
+  return !!r.mitigation_measure && r.residual_G != null && r.residual_F != null && r.residual_P != null;
+}
+
+/**
+ * Run `worker` over `items` with at most `limit` calls pending at once.
+ * Rejects with the first error, after in-flight calls have settled.
+ */
+export async function mapWithConcurrency<T, R>(items: T[], limit: number, worker: (item: T, index: number) => Promise<R>): Promise<R[]> {
+  const results: R[] = new Array(items.length);
+  let next = 0;
+  let failed = false;
+  let firstError: unknown;
+  const lane = async () => {
+    while (!failed && next < items.length) {
+      const i = next++;
+      try {
+        results[i] = await worker(items[i], i);
+      } catch (e) {
+        if (!failed) firstError = e;
+        failed = true;
+      }
+    }
+  };
+  await Promise.all(Array.from({ length: Math.max(1, Math.min(limit, items.length)) }, lane));
+  if (failed) throw firstError;
+  return results;
+}
+
+/**
+ * Create the project, then each risk followed by its mitigation, with
+ * bounded concurrency across risks. Steps recorded in `journal` are skipped.
+ */
+export async function runSavePipeline(
+  req: BulkSaveProjectRequest,
+  ops: SaveOperations,
+  key: string,
+  journal: SaveJournal,
+  opts: PipelineOptions = {},
+): Promise<string> {
+  const total = countOperations(req);
+  let completed = 0;
+  const step = () => {
+    completed++;
+    opts.onProgress?.({ completed, total });
+  };
+
+  if (!journal.projectId) {
+    const project = await ops.createProject(req.project, `${key}:project`);
+    journal.projectId = project.id;
+  }
+  const projectId = journal.projectId;
+  step();
+
+  await mapWithConcurrency(req.risks, opts.concurrency ?? DEFAULT_SAVE_CONCURRENCY, async (risk) => {
+    let riskId = journal.riskIds[risk.client_id];
+    if (!riskId) {
+      const added = await ops.addRisk({
+        project_id: projectId,
+        description: risk.description,
+        category: risk.category,
+        type: risk.type,
+        G: risk.G,
+        F: risk.F,
+        P: risk.P,
+      }, `${key}:risk:${risk.client_id}`);
+      riskId = added.id;
+      journal.riskIds[risk.client_id] = riskId;
+    }
+    step();
+
+    if (!hasMitigation(risk)) return;
+    if (!journal.mitigated[risk.client_id]) {
+      await ops.updateMitigation({
+        project_id: projectId,
+        risk_id: riskId,
+        mitigation_measure: risk.mitigation_measure!,
+        residual_G: risk.residual_G!,
+        residual_F: risk.residual_F!,
+        residual_P: risk.residual_P!,
+      }, `${key}:mitigation:${risk.client_id}`);
+      journal.mitigated[risk.client_id] = true;
+    }
+    step();
+  });
+
+  return projectId;
+}
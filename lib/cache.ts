@@ -0,0 +1,147 @@
+// Client-side response cache for GET requests.
+// Keeps recent responses in memory and in AsyncStorage, expires them by TTL
+// and by an LRU size limit, and remembers the ETag so stale entries can be
+// revalidated with If-None-Match.
+
+import AsyncStorage from "@react-native-async-storage/async-storage";
+
+export type CacheEntry<T = any> = {
+  data: T;
+  etag?: string;
+  storedAt: number;
+  ttl: number;
+};
+
+export type CachePolicy = {
+  /** Duration (ms) during which the entry is served without touching the network. */
+  ttl: number;
+  /** Duration (ms) after which a stale entry is discarded instead of being served while revalidating. */
+  maxStale?: number;
+};
+
+const STORAGE_PREFIX = "@safeqore/http-cache:";
+const INDEX_KEY = `${STORAGE_PREFIX}__index`;
+const MAX_ENTRIES = 100;
+const DEFAULT_MAX_STALE = 24 * 60 * 60 * 1000;
+
+// Map iteration order is insertion order: the first key is the least recently used.
+const memory = new Map<string, CacheEntry>();
+let hydrated: Promise<void> | null = null;
+let indexWrite: ReturnType<typeof setTimeout> | null = null;
+// Bumped on every invalidation so in-flight fetches can tell their result is outdated.
+let generation = 0;
+
+export function cacheGeneration(): number {
+  return generation;
+}
+
+function touch(key: string, entry: CacheEntry) {
+  memory.delete(key);
+  memory.set(key, entry);
+}
+
+function scheduleIndexWrite() {
+  if (indexWrite) return;
+  indexWrite = setTimeout(() => {
+    indexWrite = null;
+    AsyncStorage.setItem(INDEX_KEY, JSON.stringify(Array.from(memory.keys()))).catch(() => {});
+  }, 500);
+}
+
+function evict() {
+  while (memory.size > MAX_ENTRIES) {
+    const oldest = memory.keys().next().value as string;
+    memory.delete(oldest);
+    AsyncStorage.removeItem(STORAGE_PREFIX + oldest).catch(() => {});
+  }
+}
+
+/**
+ * Load persisted entries into memory once per app session.
+ */
+function hydrate(): Promise<void> {
+  if (!hydrated) {
+    hydrated = (async () => {
+      try {
+        const raw = await AsyncStorage.getItem(INDEX_KEY);
+        const keys: string[] = raw ? JSON.parse(raw) : [];
+        if (!keys.length) return;
+        const pairs = await AsyncStorage.multiGet(keys.map((k) => STORAGE_PREFIX + k));
+        pairs.forEach(([storageKey, value]) => {
+          if (!value) return;
+          const key = storageKey.slice(STORAGE_PREFIX.length);
+          // Entries written during hydration are newer than what is on disk.
+          if (memory.has(key)) return;
+          try { memory.set(key, JSON.parse(value)); } catch {}
+        });
+        evict();
+      } catch (e) {
+        console.warn("[Cache] Hydration failed:", e);
+      }
+    })();
+  }
+  return hydrated;
+}
+
+export async function getEntry<T>(key: string): Promise<CacheEntry<T> | undefined> {
+  await hydrate();
+  const entry = memory.get(key);
+  if (!entry) return undefined;
+  touch(key, entry);
+  scheduleIndexWrite();
+  return entry as CacheEntry<T>;
+}
+
+export async function setEntry<T>(key: string, entry: CacheEntry<T>): Promise<void> {
+  await hydrate();
+  touch(key, entry);
+  evict();
+  scheduleIndexWrite();
+  AsyncStorage.setItem(STORAGE_PREFIX + key, JSON.stringify(entry)).catch(() => {});
+}
+
+export function isFresh(entry: CacheEntry, now = Date.now()): boolean {
+  return now - entry.storedAt < entry.ttl;
+}
+
+export function isUsable(entry: CacheEntry, policy: CachePolicy, now = Date.now()): boolean {
+  return now - entry.storedAt < policy.ttl + (policy.maxStale ?? DEFAULT_MAX_STALE);
+}
+
+/**
+ * True when `key` is `path` itself or a sub-path / query of it: "/projects/abc"
+ * covers "/projects/abc/risks" and "/projects/abc?x=1", not "/projects/abcd".
+ */
+export function coversKey(path: string, key: string): boolean {
+  return key === path || key.startsWith(path + "/") || key.startsWith(path + "?");
+}
+
+/**
+ * Drop every entry for the given paths and their sub-paths (see coversKey).
+ */
+export async function invalidate(...paths: string[]): Promise<void> {
+  generation++;
+  await hydrate();
+  const removed: string[] = [];
+  for (const key of Array.from(memory.keys())) {
+    if (paths.some((p) => coversKey(p, key))) {
+      memory.delete(key);
+      removed.push(STORAGE_PREFIX + key);
+    }
+  }
+  if (removed.length) {
+    scheduleIndexWrite();
+    AsyncStorage.multiRemove(removed).catch(() => {});
+  }
+}
+
+/**
+ * Forget every cached response (call on sign-out: entries are user-scoped).
+ */
+export async function clearResponseCache(): Promise<void> {
+  generation++;
+  await hydrate();
+  const keys = Array.from(memory.keys()).map((k) => STORAGE_PREFIX + k);
+  memory.clear();
+  await AsyncStorage.multiRemove([...keys, INDEX_KEY]).catch(() => {});
+}
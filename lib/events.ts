@@ -1,27 +1,56 @@
-type Listener = (payload?: any) => void;
+import type { QuestionnaireAnalyzeResponse } from "./types";
+import type { OutboxOp } from "./outbox";
 
-const bus: Record<string, Set<Listener>> = {};
-const lastPayload: Record<string, any> = {};
+/** Every app event and the payload it carries. */
+export type EventMap = {
+  "analysis:created": QuestionnaireAnalyzeResponse;
+  "cache:revalidated": { path: string; data: unknown };
+  "outbox:changed": { pending: number };
+  "outbox:conflict": { op: OutboxOp };
+  /** `dependents`: queued operations dropped with it (they relied on it). */
+  "outbox:failed": { op: OutboxOp; error?: string; dependents: number };
+};
 
-export function on(event: string, cb: Listener) {
-  if (!bus[event]) bus[event] = new Set();
-  bus[event].add(cb);
+export type EventName = keyof EventMap;
+type Listener<K extends EventName> = (payload: EventMap[K]) => void;
+
+const bus: { [K in EventName]?: Set<Listener<K>> } = {};
+
+// Events nobody was listening to, kept for a screen that mounts later
+// (e.g. the dashboard after Result). Bounded so an unheard event can't grow forever.
+const MAX_PENDING = 20;
+const pending: { [K in EventName]?: EventMap[K][] } = {};
+
+export function on<K extends EventName>(event: K, cb: Listener<K>) {
+  let set = bus[event] as Set<Listener<K>> | undefined;
+  if (!set) {
+    set = new Set();
+    (bus as Record<EventName, Set<Listener<any>>>)[event] = set;
+  }
+  set.add(cb);
   return () => off(event, cb);
 }
 
-export function off(event: string, cb: Listener) {
-  bus[event]?.delete(cb);
+export function off<K extends EventName>(event: K, cb: Listener<K>) {
+  (bus[event] as Set<Listener<K>> | undefined)?.delete(cb);
 }
 
-export function emit(event: string, payload?: any) {
-  lastPayload[event] = payload;
-  bus[event]?.forEach((cb) => {
+export function emit<K extends EventName>(event: K, payload: EventMap[K]) {
+  const listeners = bus[event] as Set<Listener<K>> | undefined;
+  if (!listeners?.size) {
+    const queue = ((pending as Record<EventName, any[]>)[event] ??= []);
+    queue.push(payload);
+    if (queue.length > MAX_PENDING) queue.shift();
+    return;
+  }
+  listeners.forEach((cb) => {
     try { cb(payload); } catch {}
   });
 }
 
-export function last(event: string, consume = true) {
-  const p = lastPayload[event];
-  if (consume) delete lastPayload[event];
-  return p;
+/** Payloads emitted while nobody listened, oldest first; the queue is emptied. */
+export function takePending<K extends EventName>(event: K): EventMap[K][] {
+  const queue = (pending[event] as EventMap[K][] | undefined) ?? [];
+  delete pending[event];
+  return queue;
 }
@@ -0,0 +1,167 @@
+// Contenu des classeurs exportés (sans dépendance React Native, partagé avec
+// le benchmark d'export).
+
+import type { AnalysisProject, RiskItem, CompareResponse } from './types';
+import { to100 } from './scoring';
+import type { Row, SheetSpec } from './xlsxStream';
+
+export type IAComparison = { risk: RiskItem; comparison: CompareResponse };
+
+// Colonnes du rapport ExcelJS livré jusqu'ici (excelExportAdvanced) : mêmes
+// en-têtes, mêmes valeurs, mêmes largeurs.
+const RISK_HEADER = ['N°', 'Catégorie', 'Type', 'Description', 'G', 'F', 'P', 'Score (/100)', 'Mesure', 'G res.', 'F res.', 'P res.', 'Score res. (/100)'];
+const RISK_WIDTHS = [6, 18, 18, 60, 6, 6, 6, 14, 40, 8, 8, 8, 18];
+
+function riskCells(risk: RiskItem, index: number) {
+  return [
+    index + 1,
+    risk.category,
+    risk.type,
+    risk.description,
+    risk.initial_evaluation.G,
+    risk.initial_evaluation.F,
+    risk.initial_evaluation.P,
+    to100(risk.initial_evaluation.score),
+    risk.mitigation_measure || '',
+    risk.residual_evaluation?.G || '',
+    risk.residual_evaluation?.F || '',
+    risk.residual_evaluation?.P || '',
+    typeof risk.residual_evaluation?.score === 'number' ? to100(risk.residual_evaluation.score) : '',
+  ];
+}
+
+const COMPARISON_HEADER = [
+  'N°', 'Risque', 'G (Hum)', 'F (Hum)', 'P (Hum)', 'Score Hum (/100)',
+  'G (IA)', 'F (IA)', 'P (IA)', 'Score IA (/100)', 'Classe IA', 'Accord', 'Concordance',
+];
+const COMPARISON_WIDTHS = [6, 60, 9, 9, 9, 16, 9, 9, 9, 16, 16, 14, 14];
+
+/**
+ * Feuille du rapport d'un projet d'analyse : bloc de titre, fiche du projet
+ * puis le détail des risques.
+ */
+export function projectSheets(project: AnalysisProject): SheetSpec[] {
+  return [
+    {
+      name: 'Rapport',
+      widths: RISK_WIDTHS,
+      rows: function* () {
+        yield { cells: ["Rapport d'analyse SafeQore"], style: 'title' };
+        yield [];
+        yield ['Titre', project.analysis_title];
+        yield ['Type', project.project_type];
+        yield ['Secteur', project.sector || ''];
+        yield ['Description', project.project_description || ''];
+        yield ['Services/Produits', project.entity_services || ''];
+        yield [];
+        yield { cells: ['Détails des risques'], style: 'bold' };
+        yield { cells: RISK_HEADER, style: 'bold' };
+        for (let i = 0; i < project.risks.length; i++) yield riskCells(project.risks[i], i);
+      },
+    },
+  ];
+}
+
+/**
+ * Feuille du rapport comparatif Humain vs IA. Les valeurs « humaines » sont
+ * celles que le serveur a comparées (human_analysis), pas l'évaluation
+ * actuelle du risque.
+ */
+export function comparativeSheets(project: AnalysisProject, iaComparisons: IAComparison[]): SheetSpec[] {
+  return [
+    {
+      name: 'Comparatif Humain vs IA',
+      widths: COMPARISON_WIDTHS,
+      rows: function* () {
+        yield { cells: ['Comparaison Humain / IA'], style: 'title' };
+        yield [];
+        yield ['Titre', project.analysis_title];
+        yield ['Type', project.project_type];
+        yield ['Secteur', project.sector || ''];
+        yield [];
+        yield { cells: COMPARISON_HEADER, style: 'bold' };
+        for (let i = 0; i < iaComparisons.length; i++) {
+          const { risk, comparison } = iaComparisons[i];
+          const human = comparison.human_analysis;
+          const ia = comparison.ia_analysis;
+          yield [
+            i + 1,
+            risk.description,
+            human.G,
+            human.F,
+            human.P,
+            to100(human.score),
+            ia.G,
+            ia.F,
+            ia.P,
+            to100(ia.score),
+            ia.classification,
+            comparison.comparison.agreement_level || 'N/A',
+            comparison.comparison.classifications_match ? 'Oui' : 'Non',
+          ];
+        }
+      },
+    },
+  ];
+}
+
+/**
+ * Feuilles du rapport multi-projets (portefeuille). Les projets sont lus un
+ * par un : seul le projet en cours d'écriture est gardé en mémoire.
+ */
+export function portfolioSheets(projects: Iterable<AnalysisProject> | AsyncIterable<AnalysisProject>): SheetSpec[] {
+  // Alimenté pendant l'écriture des risques, puis écrit comme premier onglet
+  const summary: Row[] = [{
+    style: 'headerBlue',
+    cells: ['Projet', 'Type', 'Secteur', 'Statut', 'Risques', 'Risques traités', 'Score initial moyen (/100)', 'Score résiduel moyen (/100)', 'Dernière mise à jour'],
+  }];
+  let totalRisks = 0;
+
+  return [
+    {
+      name: 'Risques',
+      tab: 1,
+      widths: [30, ...RISK_WIDTHS],
+      rows: async function* () {
+        yield { cells: ['Projet', ...RISK_HEADER], style: 'headerBlue' };
+        for await (const project of projects) {
+          let initial = 0;
+          let residual = 0;
+          let treated = 0;
+          for (let i = 0; i < project.risks.length; i++) {
+            const risk = project.risks[i];
+            initial += to100(risk.initial_evaluation.score);
+            if (risk.residual_evaluation) {
+              residual += to100(risk.residual_evaluation.score);
+              treated++;
+            }
+            yield [project.analysis_title, ...riskCells(risk, i)];
+          }
+          const n = project.risks.length;
+          totalRisks += n;
+          summary.push([
+            project.analysis_title,
+            project.project_type === 'project' ? 'Projet' : 'Entité',
+            project.sector || 'N/A',
+            project.status === 'completed' ? 'Complété' : 'En cours',
+            n,
+            treated,
+            n ? Math.round(initial / n) : '',
+            treated ? Math.round(residual / treated) : '',
+            new Date(project.updated_at).toLocaleDateString('fr-FR'),
+          ]);
+        }
+      },
+    },
+    {
+      name: 'Portefeuille',
+      tab: 0,
+      widths: [40, 10, 20, 12, 10, 15, 24, 24, 20],
+      rows: function* () {
+        yield* summary;
+        yield [];
+        yield { cells: ['Total', '', '', '', totalRisks], style: 'bold' };
+      },
+    },
+  ];
+}
@@ -1,8 +1,9 @@
 // Firebase initializer with env-driven config and platform-specific persistence.
 // Works on both web and React Native.
 
-import { initializeApp, getApps, getApp, type FirebaseApp } from 'firebase/app';
+import type { FirebaseApp } from 'firebase/app';
 import { Platform } from 'react-native';
+import { log } from './telemetry';
 
 export type FirebaseConfig = {
   apiKey: string;
@@ -29,6 +30,8 @@ export async function initFirebaseApp(): Promise<FirebaseApp> {
   if (appInstance) return appInstance;
   
   const cfg = fallbackConfig;
+  // Loaded on first use: the SDK stays out of the startup path
+  const { initializeApp, getApps, getApp } = await import('firebase/app');
   if (getApps().length) {
     appInstance = getApp();
   } else {
@@ -63,7 +66,7 @@ export async function getFirebaseAuth(): Promise<any> {
     
     // Note: For production React Native apps, consider using @react-native-firebase/auth
     // which provides native Firebase SDK integration with better performance
-    console.log('Firebase Auth initialized for React Native (using web SDK)');
+    log.debug('Firebase Auth initialized for React Native (using web SDK)');
   }
   
   return authInstance;
@@ -1,43 +1,25 @@
-import { useEffect, useState } from "react";
+import { useEffect, useSyncExternalStore } from "react";
 import { router } from "expo-router";
-import { getIdToken } from "./auth";
+import { getAuthStatus, getIdToken, hasFreshToken, subscribeAuthStatus } from "./auth";
 
 /**
  * Redirects to /login if no Firebase ID token is available.
  * Call at the top of protected screens.
  * Returns { loading: boolean, authenticated: boolean }
+ *
+ * The auth state is read synchronously from the token manager: once the
+ * session is known, screens render authenticated on their first frame.
  */
 export function useAuthGuard(redirectTo: string = "/login") {
-  const [loading, setLoading] = useState(true);
-  const [authenticated, setAuthenticated] = useState(false);
+  const status = useSyncExternalStore(subscribeAuthStatus, getAuthStatus);
 
   useEffect(() => {
-    let mounted = true;
-    (async () => {
-      try {
-        const token = await getIdToken();
-        
-        if (!mounted) return;
-        
-        if (!token) {
-          router.replace(redirectTo as any);
-          setAuthenticated(false);
-        } else {
-          setAuthenticated(true);
-        }
-      } catch (e) {
-        if (mounted) {
-          router.replace(redirectTo as any);
-          setAuthenticated(false);
-        }
-      } finally {
-        if (mounted) setLoading(false);
-      }
-    })();
-    return () => {
-      mounted = false;
-    };
-  }, [redirectTo]);
+    // First screen after launch: let the token manager resolve the session
+    if (status === "unknown" || (status === "signedIn" && !hasFreshToken())) {
+      getIdToken().catch(() => {});
+    }
+    if (status === "signedOut") router.replace(redirectTo as any);
+  }, [status, redirectTo]);
 
-  return { loading, authenticated };
+  return { loading: status === "unknown", authenticated: status === "signedIn" };
 }
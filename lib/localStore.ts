@@ -0,0 +1,215 @@
+// Local persistence engine for projects, risks and user analyses.
+// Each record lives under its own AsyncStorage key so an edit rewrites one
+// record, not the whole dataset; a per-collection id index is only touched
+// when records are added or removed.
+
+import AsyncStorage from "@react-native-async-storage/async-storage";
+import type { AnalysisProject, RiskItem, UserAnalysis } from "./types";
+
+export type Collection = "projects" | "risks" | "analyses" | "aliases" | "outbox" | "draft" | "draft_risks" | "ai_comparisons" | "versions" | "meta";
+
+const PREFIX = "@safeqore/store:";
+const recordKey = (c: Collection, id: string) => `${PREFIX}${c}:${id}`;
+const indexKey = (c: Collection) => `${PREFIX}${c}`;
+
+const collections = new Map<Collection, Promise<Map<string, any>>>();
+
+function load(c: Collection): Promise<Map<string, any>> {
+  let loaded = collections.get(c);
+  if (!loaded) {
+    loaded = (async () => {
+      const records = new Map<string, any>();
+      try {
+        const raw = await AsyncStorage.getItem(indexKey(c));
+        const ids: string[] = raw ? JSON.parse(raw) : [];
+        if (ids.length) {
+          const pairs = await AsyncStorage.multiGet(ids.map((id) => recordKey(c, id)));
+          pairs.forEach(([, value], i) => {
+            if (!value) return;
+            try { records.set(ids[i], JSON.parse(value)); } catch {}
+          });
+        }
+      } catch (e) {
+        console.warn(`[Store] Failed to load ${c}:`, e);
+      }
+      return records;
+    })();
+    collections.set(c, loaded);
+  }
+  return loaded;
+}
+
+function writeIndex(c: Collection, records: Map<string, any>) {
+  return AsyncStorage.setItem(indexKey(c), JSON.stringify(Array.from(records.keys())));
+}
+
+export async function putRecord<T>(c: Collection, id: string, value: T): Promise<void> {
+  const records = await load(c);
+  const isNew = !records.has(id);
+  records.set(id, value);
+  await AsyncStorage.setItem(recordKey(c, id), JSON.stringify(value));
+  if (isNew) await writeIndex(c, records);
+}
+
+export async function getRecord<T>(c: Collection, id: string): Promise<T | undefined> {
+  return (await load(c)).get(id);
+}
+
+export async function removeRecord(c: Collection, id: string): Promise<void> {
+  const records = await load(c);
+  if (!records.delete(id)) return;
+  await AsyncStorage.removeItem(recordKey(c, id));
+  await writeIndex(c, records);
+}
+
+export async function listRecords<T>(c: Collection): Promise<T[]> {
+  return Array.from((await load(c)).values());
+}
+
+export async function clearCollection(c: Collection): Promise<void> {
+  const records = await load(c);
+  const keys = Array.from(records.keys()).map((id) => recordKey(c, id));
+  records.clear();
+  await AsyncStorage.multiRemove([...keys, indexKey(c)]);
+}
+
+// ---------------------------------------------------------------------------
+// Domain helpers
+
+/** Stored project header: risks are kept as separate records. */
+export type StoredProject = Omit<AnalysisProject, "risks">;
+export type StoredRisk = RiskItem & { project_id: string };
+
+const LOCAL_PREFIX = "local_";
+
+export function newLocalId(): string {
+  return `${LOCAL_PREFIX}${Date.now().toString(36)}_${Math.random().toString(36).slice(2, 8)}`;
+}
+
+export function isLocalId(id: string): boolean {
+  return id.startsWith(LOCAL_PREFIX);
+}
+
+const riskRecordId = (projectId: string, riskId: string) => `${projectId}/${riskId}`;
+
+/**
+ * Follow the local id -> server id mapping recorded once a locally created
+ * record has been synced (screens may still hold the local id).
+ */
+export async function resolveId(id: string): Promise<string> {
+  if (!isLocalId(id)) return id;
+  return (await getRecord<string>("aliases", id)) ?? id;
+}
+
+export async function saveProjectLocally(project: AnalysisProject): Promise<void> {
+  const { risks, ...header } = project;
+  await putRecord<StoredProject>("projects", project.id, header);
+  const keep = new Set(risks.map((r) => riskRecordId(project.id, r.id)));
+  for (const stored of await listProjectRisks(project.id)) {
+    const id = riskRecordId(project.id, stored.id);
+    // Risks created offline are not on the server yet: keep them.
+    if (!keep.has(id) && !isLocalId(stored.id)) await removeRecord("risks", id);
+  }
+  for (const r of risks) {
+    await saveRiskLocally(project.id, r);
+  }
+}
+
+export async function saveRiskLocally(projectId: string, risk: RiskItem): Promise<void> {
+  await putRecord<StoredRisk>("risks", riskRecordId(projectId, risk.id), { ...risk, project_id: projectId });
+}
+
+export async function removeRiskLocally(projectId: string, riskId: string): Promise<void> {
+  await removeRecord("risks", riskRecordId(projectId, riskId));
+}
+
+async function listProjectRisks(projectId: string): Promise<StoredRisk[]> {
+  return (await listRecords<StoredRisk>("risks")).filter((r) => r.project_id === projectId);
+}
+
+export async function getLocalProject(projectId: string): Promise<AnalysisProject | undefined> {
+  const header = await getRecord<StoredProject>("projects", projectId);
+  if (!header) return undefined;
+  const risks = (await listProjectRisks(projectId))
+    .sort((a, b) => a.created_at.localeCompare(b.created_at))
+    .map(({ project_id, ...r }) => r);
+  return { ...header, risks };
+}
+
+export async function listLocalProjects(): Promise<AnalysisProject[]> {
+  const headers = await listRecords<StoredProject>("projects");
+  const out: AnalysisProject[] = [];
+  for (const h of headers) {
+    const p = await getLocalProject(h.id);
+    if (p) out.push(p);
+  }
+  return out;
+}
+
+export async function removeProjectLocally(projectId: string): Promise<void> {
+  for (const r of await listProjectRisks(projectId)) {
+    await removeRiskLocally(projectId, r.id);
+  }
+  await removeRecord("projects", projectId);
+  await removeRecord("versions", projectId);
+}
+
+/**
+ * Server `updated_at` of the last server copy of a project seen by this
+ * device: the version local edits are based on. Undefined when unknown.
+ */
+export async function getServerVersion(projectId: string): Promise<string | undefined> {
+  return getRecord<string>("versions", projectId);
+}
+
+export async function setServerVersion(projectId: string, version: string | undefined): Promise<void> {
+  if (version) await putRecord("versions", projectId, version);
+  else await removeRecord("versions", projectId);
+}
+
+/**
+ * Move a locally created project to the id assigned by the server.
+ */
+export async function remapProjectId(localId: string, serverId: string): Promise<void> {
+  const local = await getLocalProject(localId);
+  await putRecord("aliases", localId, serverId);
+  if (!local) return;
+  await removeProjectLocally(localId);
+  await saveProjectLocally({ ...local, id: serverId });
+}
+
+export async function remapRiskId(projectId: string, localId: string, serverRisk: RiskItem): Promise<void> {
+  await putRecord("aliases", localId, serverRisk.id);
+  await removeRiskLocally(projectId, localId);
+  await saveRiskLocally(projectId, serverRisk);
+}
+
+export async function saveAnalysesLocally(analyses: UserAnalysis[]): Promise<void> {
+  for (const a of analyses) {
+    await putRecord<UserAnalysis>("analyses", a.id, a);
+  }
+}
+
+export async function listLocalAnalyses(): Promise<UserAnalysis[]> {
+  return (await listRecords<UserAnalysis>("analyses")).sort((a, b) => b.timestamp.localeCompare(a.timestamp));
+}
+
+/**
+ * Wipe every user-scoped collection (sign-out).
+ */
+export async function clearLocalStore(): Promise<void> {
+  const all: Collection[] = ["projects", "risks", "analyses", "aliases", "outbox", "draft", "draft_risks", "ai_comparisons", "versions", "meta"];
+  await Promise.all(all.map((c) => clearCollection(c).catch(() => {})));
+}
+
+/**
+ * Local records belong to one account. Called whenever a user is signed in:
+ * data left by another account (e.g. after a forced sign-out that could not
+ * clear it) is dropped before anything reads or replays it.
+ */
+export async function claimLocalStore(uid: string): Promise<void> {
+  const owner = await getRecord<string>("meta", "owner");
+  if (owner === uid) return;
+  if (owner) await clearLocalStore();
+  await putRecord("meta", "owner", uid);
+}
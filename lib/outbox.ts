@@ -0,0 +1,267 @@
+// Durable write-ahead outbox. Mutations are applied to the local store first,
+// recorded here, and replayed against the server by a background worker in
+// FIFO order with exponential backoff.
+
+import { AppState } from "react-native";
+import { emit } from "./events";
+import { listRecords, putRecord, removeRecord } from "./localStore";
+
+export type OutboxOpType =
+  | "createProject"
+  | "updateProject"
+  | "deleteProject"
+  | "addRisk"
+  | "updateRiskMitigation"
+  | "deleteRisk"
+  | "deleteUserAnalysis";
+
+export type OutboxOp = {
+  id: string;
+  seq: number;
+  type: OutboxOpType;
+  payload: any;
+  /**
+   * Server `updated_at` of the project copy the edit was made on. A newer
+   * server version on replay means someone else edited it in between.
+   * Undefined when unknown: the edit is then applied without a check.
+   */
+  base_version?: string;
+  attempts: number;
+  next_attempt_at: number;
+  last_error?: string;
+};
+
+export type OutboxResult = "done" | "superseded";
+export type OutboxHandler = (op: OutboxOp) => Promise<OutboxResult>;
+export type DiscardHandler = (op: OutboxOp) => Promise<void>;
+
+const BASE_DELAY = 2000;
+const MAX_DELAY = 5 * 60 * 1000;
+
+let handler: OutboxHandler | null = null;
+let discardHandler: DiscardHandler | null = null;
+let draining: Promise<void> | null = null;
+let drainAgain = false;
+let timer: ReturnType<typeof setTimeout> | null = null;
+let lastSeq = 0;
+
+export function setOutboxHandler(fn: OutboxHandler) {
+  handler = fn;
+}
+
+/**
+ * Called for an operation the server rejected and for every queued operation
+ * that depended on it, so the local records they created can be rolled back.
+ */
+export function setDiscardHandler(fn: DiscardHandler) {
+  discardHandler = fn;
+}
+
+async function pendingOps(): Promise<OutboxOp[]> {
+  return (await listRecords<OutboxOp>("outbox")).sort((a, b) => a.seq - b.seq);
+}
+
+export async function pendingCount(): Promise<number> {
+  return (await pendingOps()).length;
+}
+
+/**
+ * True when a queued operation still refers to `id` (project or risk).
+ */
+export async function hasPendingFor(id: string): Promise<boolean> {
+  return (await pendingOps()).some((op) => JSON.stringify(op.payload).includes(`"${id}"`));
+}
+
+export async function enqueue(type: OutboxOpType, payload: any, baseVersion?: string): Promise<OutboxOp> {
+  const ops = await pendingOps();
+  lastSeq = Math.max(lastSeq, ops.length ? ops[ops.length - 1].seq : 0) + 1;
+  const op: OutboxOp = {
+    id: `op_${lastSeq}_${Math.random().toString(36).slice(2, 8)}`,
+    seq: lastSeq,
+    type,
+    payload,
+    base_version: baseVersion,
+    attempts: 0,
+    next_attempt_at: 0,
+  };
+  await putRecord("outbox", op.id, op);
+  emit("outbox:changed", { pending: ops.length + 1 });
+  requestSync();
+  return op;
+}
+
+/**
+ * Rewrite queued payloads, e.g. to replace a local id by the server id.
+ */
+export async function rewritePending(fn: (payload: any) => any): Promise<void> {
+  for (const op of await pendingOps()) {
+    const next = fn(op.payload);
+    if (next !== op.payload) await putRecord("outbox", op.id, { ...op, payload: next });
+  }
+}
+
+/**
+ * Our own write moved the server copy of `projectId` to `version`: it is not
+ * a concurrent edit, so the queued edits of that project are now based on it.
+ * An undefined version (unknown) turns their conflict check off.
+ */
+export async function rebasePending(projectId: string, version: string | undefined): Promise<void> {
+  for (const op of await pendingOps()) {
+    if (op.payload?.project_id !== projectId || !op.base_version) continue;
+    await putRecord("outbox", op.id, { ...op, base_version: version });
+  }
+}
+
+/**
+ * HTTP status carried by errors thrown from lib/api.ts ("404 Not Found: ..."),
+ * or undefined for any other error.
+ */
+function errorStatus(e: any): number | undefined {
+  const m = String(e?.message || "").match(/^(\d{3}) /);
+  return m ? Number(m[1]) : undefined;
+}
+
+/**
+ * The request never reached the server: fetch rejects with a TypeError whose
+ * message depends on the platform ("Network request failed" on React Native,
+ * "Failed to fetch" / "NetworkError ..." / "Load failed" in browsers). Other
+ * errors without a status (bad JSON, bugs) are not worth retrying.
+ */
+export function isNetworkError(e: any): boolean {
+  return e instanceof TypeError && /Network request failed|Failed to fetch|NetworkError|Load failed/.test(e.message);
+}
+
+function isTransient(e: any): boolean {
+  const status = errorStatus(e);
+  if (status === undefined) return isNetworkError(e);
+  return status >= 500 || status === 408 || status === 429 || status === 401;
+}
+
+/**
+ * Queued operations that refer to a record created by `op` (e.g. risks and
+ * edits of a project whose creation was rejected), transitively.
+ */
+async function dependentsOf(op: OutboxOp): Promise<OutboxOp[]> {
+  const ids = op.payload?.local_id ? [op.payload.local_id as string] : [];
+  const out: OutboxOp[] = [];
+  for (const other of await pendingOps()) {
+    if (other.id === op.id) continue;
+    const json = JSON.stringify(other.payload);
+    if (!ids.some((id) => json.includes(`"${id}"`))) continue;
+    out.push(other);
+    if (other.payload?.local_id) ids.push(other.payload.local_id);
+  }
+  return out;
+}
+
+/** Remove a rejected operation and everything that depended on it. */
+async function discard(op: OutboxOp): Promise<OutboxOp[]> {
+  const dependents = await dependentsOf(op);
+  for (const o of [op, ...dependents]) {
+    await removeRecord("outbox", o.id);
+    await discardHandler?.(o).catch((e) => console.warn(`[Outbox] Rollback of ${o.type} failed:`, e));
+  }
+  return dependents;
+}
+
+function backoff(attempts: number): number {
+  const delay = Math.min(MAX_DELAY, BASE_DELAY * 2 ** (attempts - 1));
+  return delay / 2 + Math.random() * (delay / 2);
+}
+
+function schedule(delay: number) {
+  if (timer) clearTimeout(timer);
+  timer = setTimeout(() => {
+    timer = null;
+    requestSync();
+  }, delay);
+}
+
+async function drain(): Promise<void> {
+  if (!handler) return;
+  // Re-read the head on every pass: handlers rewrite queued payloads (local -> server ids).
+  for (let op = (await pendingOps())[0]; op; op = (await pendingOps())[0]) {
+    const now = Date.now();
+    // FIFO: later operations may depend on this one (e.g. a risk on a local project)
+    if (op.next_attempt_at > now) {
+      schedule(op.next_attempt_at - now);
+      return;
+    }
+    try {
+      const result = await handler(op);
+      await removeRecord("outbox", op.id);
+      if (result === "superseded") emit("outbox:conflict", { op });
+    } catch (e: any) {
+      if (isTransient(e)) {
+        const attempts = op.attempts + 1;
+        const delay = backoff(attempts);
+        await putRecord("outbox", op.id, { ...op, attempts, next_attempt_at: Date.now() + delay, last_error: e?.message });
+        console.warn(`[Outbox] ${op.type} failed (attempt ${attempts}), retrying in ${Math.round(delay / 1000)}s`);
+        schedule(delay);
+        return;
+      }
+      // The server rejected the operation: replaying it would fail forever.
+      console.error(`[Outbox] Dropping ${op.type}:`, e);
+      const dependents = await discard(op);
+      emit("outbox:failed", { op, error: e?.message, dependents: dependents.length });
+    }
+    emit("outbox:changed", { pending: await pendingCount() });
+  }
+}
+
+/**
+ * Replay the outbox now (coalesced with a drain already in progress).
+ */
+export function requestSync(): Promise<void> {
+  if (draining) {
+    // Operations enqueued mid-drain are picked up by a second pass.
+    drainAgain = true;
+    return draining;
+  }
+  drainAgain = false;
+  draining = drain()
+    .catch((e) => console.warn("[Outbox] Sync error:", e))
+    .finally(() => {
+      draining = null;
+      if (drainAgain) requestSync();
+    });
+  return draining;
+}
+
+/** Make every queued operation due now, cancelling its backoff. */
+async function resetBackoff(): Promise<void> {
+  for (const op of await pendingOps()) {
+    if (op.next_attempt_at) await putRecord("outbox", op.id, { ...op, next_attempt_at: 0 });
+  }
+}
+
+/**
+ * Replay the whole outbox now, ignoring backoff. Resolves with the number of
+ * operations still queued (e.g. offline, or the server is unavailable).
+ */
+export async function syncNow(): Promise<number> {
+  await resetBackoff();
+  await requestSync();
+  // A second pass may have been started for operations enqueued meanwhile
+  while (draining) await draining;
+  return pendingCount();
+}
+
+/**
+ * Start replaying on launch and whenever the app returns to the foreground.
+ * Returns a function that stops the worker.
+ */
+export function startSyncWorker(): () => void {
+  requestSync();
+  const sub = AppState.addEventListener("change", (s) => {
+    if (s === "active") {
+      // Coverage may be back: retry immediately instead of waiting out the backoff.
+      resetBackoff().then(() => requestSync());
+    }
+  });
+  return () => {
+    sub.remove();
+    if (timer) clearTimeout(timer);
+    timer = null;
+  };
+}
@@ -0,0 +1,295 @@
+// On-device Kinney scoring. Mirrors the server's questionnaire computation so
+// screens can show G/F/P, score and classification as soon as answers change;
+// the server response stays authoritative and is checked against the local
+// result when it arrives.
+
+import type { AnswerItem, ConstantsResponse, Question, RiskEvaluation } from "./types";
+
+export type Dim = "G" | "F" | "P";
+export type Classification = "Faible" | "Modéré" | "Élevé";
+
+export type LocalScore = {
+  G: number;
+  F: number;
+  P: number;
+  /** Raw G×F×P, 1..125 */
+  score: number;
+  normalized_score_100: number;
+  classification: Classification;
+};
+
+/** Upper bounds (inclusive) on the raw G×F×P score. */
+export type KinneyThresholds = { faible: number; modere: number };
+
+export const MAX_RAW_SCORE = 125;
+export const DEFAULT_THRESHOLDS: KinneyThresholds = { faible: 25, modere: 50 };
+
+const CLASSES: Classification[] = ["Faible", "Modéré", "Élevé"];
+const LEVELS: RiskEvaluation["level"][] = ["Faible", "Moyen", "Élevé"];
+
+/** Normalise a raw score (G×F×P, max 125) to 0..100. */
+export function to100(raw: number): number {
+  return Math.round((raw / MAX_RAW_SCORE) * 100);
+}
+
+function bound(v: any): number | undefined {
+  const n = typeof v === "object" && v ? Number(v.max ?? v.upper ?? v.value) : Number(v);
+  return Number.isFinite(n) && n > 0 ? n : undefined;
+}
+
+/**
+ * Read `kinney_thresholds` from /constants. Keys are matched loosely
+ * ("faible"/"low", "modere"/"moyen"/"medium") and values are raw-score upper
+ * bounds, either plain numbers or `{ max }`. Falls back to 25/50.
+ */
+export function thresholdsFrom(constants?: Pick<ConstantsResponse, "kinney_thresholds"> | null): KinneyThresholds {
+  const raw = constants?.kinney_thresholds;
+  if (!raw) return DEFAULT_THRESHOLDS;
+  let faible: number | undefined;
+  let modere: number | undefined;
+  for (const [key, value] of Object.entries(raw)) {
+    const k = key.normalize("NFD").replace(/[\u0300-\u036f]/g, "").toLowerCase();
+    if (k.startsWith("faible") || k.startsWith("low")) faible = bound(value);
+    else if (k.startsWith("mod") || k.startsWith("moyen") || k.startsWith("medium")) modere = bound(value);
+  }
+  if (!faible || !modere || faible >= modere) return DEFAULT_THRESHOLDS;
+  return { faible, modere };
+}
+
+function classIndex(raw: number, t: KinneyThresholds): 0 | 1 | 2 {
+  return raw <= t.faible ? 0 : raw <= t.modere ? 1 : 2;
+}
+
+/** Questionnaire classification of a raw G×F×P score. */
+export function classify(raw: number, t: KinneyThresholds = DEFAULT_THRESHOLDS): Classification {
+  return CLASSES[classIndex(raw, t)];
+}
+
+/** Project risk level ("Moyen" rather than "Modéré") of a raw G×F×P score. */
+export function riskLevel(raw: number, t: KinneyThresholds = DEFAULT_THRESHOLDS): RiskEvaluation["level"] {
+  return LEVELS[classIndex(raw, t)];
+}
+
+export function evaluate(G: number, F: number, P: number, t: KinneyThresholds = DEFAULT_THRESHOLDS): RiskEvaluation {
+  const score = G * F * P;
+  return { G, F, P, score, level: riskLevel(score, t) };
+}
+
+// ---------------------------------------------------------------------------
+// Precomputed 5×5×5 grid
+
+const cellOf = (G: number, F: number, P: number) => (G - 1) * 25 + (F - 1) * 5 + (P - 1);
+
+export type ScoreGrid = {
+  thresholds: KinneyThresholds;
+  /** Normalised 0..100 score per cell */
+  score100: Uint8Array;
+  /** 0 = Faible, 1 = Modéré/Moyen, 2 = Élevé */
+  klass: Uint8Array;
+};
+
+const grids = new Map<string, ScoreGrid>();
+
+/** Lookup tables for every G/F/P combination, built once per thresholds. */
+export function scoreGrid(t: KinneyThresholds = DEFAULT_THRESHOLDS): ScoreGrid {
+  const key = `${t.faible}/${t.modere}`;
+  let grid = grids.get(key);
+  if (!grid) {
+    const score100 = new Uint8Array(125);
+    const klass = new Uint8Array(125);
+    for (let G = 1; G <= 5; G++)
+      for (let F = 1; F <= 5; F++)
+        for (let P = 1; P <= 5; P++) {
+          const i = cellOf(G, F, P);
+          score100[i] = to100(G * F * P);
+          klass[i] = classIndex(G * F * P, t);
+        }
+    grid = { thresholds: t, score100, klass };
+    grids.set(key, grid);
+  }
+  return grid;
+}
+
+const clampDim = (v: number) => Math.max(1, Math.min(5, Math.round(v) || 1));
+
+export function scoreDims(G: number, F: number, P: number, t: KinneyThresholds = DEFAULT_THRESHOLDS): LocalScore {
+  G = clampDim(G); F = clampDim(F); P = clampDim(P);
+  const grid = scoreGrid(t);
+  const i = cellOf(G, F, P);
+  return { G, F, P, score: G * F * P, normalized_score_100: grid.score100[i], classification: CLASSES[grid.klass[i]] };
+}
+
+// ---------------------------------------------------------------------------
+// Questionnaire answers
+
+type CompiledQuestion = { dim: 0 | 1 | 2; weight: number; options: Map<string, number> };
+
+/** Questions indexed by id, compiled once per question bank. */
+export type QuestionBank = Map<string, CompiledQuestion>;
+
+const DIMS: Dim[] = ["G", "F", "P"];
+const banks = new WeakMap<Question[], QuestionBank>();
+
+export function compileQuestions(questions: Question[]): QuestionBank {
+  let bank = banks.get(questions);
+  if (!bank) {
+    bank = new Map();
+    for (const q of questions) {
+      const dim = DIMS.indexOf(q.dimension);
+      if (dim < 0) continue;
+      bank.set(q.id, {
+        dim: dim as 0 | 1 | 2,
+        weight: Number(q.poids || 1),
+        options: new Map(q.reponses_possibles.map((o) => [o.id, o.contribution])),
+      });
+    }
+    banks.set(questions, bank);
+  }
+  return bank;
+}
+
+/**
+ * Value of each dimension: mean of the chosen options' contributions weighted
+ * by `poids`, rounded and clamped to 1..5. Null for a dimension with no
+ * recognised answer.
+ */
+export function dimensionValues(bank: QuestionBank, answers: AnswerItem[]): Record<Dim, number | null> {
+  const sums = [0, 0, 0];
+  const weights = [0, 0, 0];
+  for (const a of answers) {
+    const q = bank.get(a.question_id);
+    const contribution = q?.options.get(a.option_id);
+    if (!q || contribution === undefined) continue;
+    sums[q.dim] += contribution * q.weight;
+    weights[q.dim] += q.weight;
+  }
+  const value = (d: number) => (weights[d] > 0 ? clampDim(sums[d] / weights[d]) : null);
+  return { G: value(0), F: value(1), P: value(2) };
+}
+
+/** Score a completed questionnaire, or null while a dimension is unanswered. */
+export function scoreAnswers(
+  questions: Question[] | QuestionBank,
+  answers: AnswerItem[],
+  t: KinneyThresholds = DEFAULT_THRESHOLDS,
+): LocalScore | null {
+  const bank = questions instanceof Map ? questions : compileQuestions(questions);
+  const { G, F, P } = dimensionValues(bank, answers);
+  if (!G || !F || !P) return null;
+  return scoreDims(G, F, P, t);
+}
+
+export type BatchScores = {
+  G: Uint8Array;
+  F: Uint8Array;
+  P: Uint8Array;
+  /** Raw G×F×P */
+  score: Uint8Array;
+  score100: Uint8Array;
+  /** 0 = Faible, 1 = Modéré/Moyen, 2 = Élevé, 255 = incomplete */
+  klass: Uint8Array;
+  /** Count per class index */
+  counts: [number, number, number];
+};
+
+export const INCOMPLETE = 255;
+
+/**
+ * Score many risks in one pass (a whole project or portfolio). Each entry is
+ * either a questionnaire answer list or already known G/F/P values.
+ */
+export function scoreBatch(
+  items: Array<AnswerItem[] | { G: number; F: number; P: number } | null | undefined>,
+  questions: Question[] | QuestionBank = [],
+  t: KinneyThresholds = DEFAULT_THRESHOLDS,
+): BatchScores {
+  const n = items.length;
+  const out: BatchScores = {
+    G: new Uint8Array(n),
+    F: new Uint8Array(n),
+    P: new Uint8Array(n),
+    score: new Uint8Array(n),
+    score100: new Uint8Array(n),
+    klass: new Uint8Array(n).fill(INCOMPLETE),
+    counts: [0, 0, 0],
+  };
+  const bank = questions instanceof Map ? questions : compileQuestions(questions);
+  const grid = scoreGrid(t);
+  for (let k = 0; k < n; k++) {
+    const item = items[k];
+    if (!item) continue;
+    const dims = Array.isArray(item) ? dimensionValues(bank, item) : item;
+    if (!dims.G || !dims.F || !dims.P) continue;
+    const G = clampDim(dims.G), F = clampDim(dims.F), P = clampDim(dims.P);
+    const i = cellOf(G, F, P);
+    out.G[k] = G; out.F[k] = F; out.P[k] = P;
+    out.score[k] = G * F * P;
+    out.score100[k] = grid.score100[i];
+    out.klass[k] = grid.klass[i];
+    out.counts[grid.klass[i]]++;
+  }
+  return out;
+}
+
+// ---------------------------------------------------------------------------
+// What-if simulation of residual measures
+
+export type WhatIf = LocalScore & {
+  /** Raw points removed compared with the initial evaluation (negative if worse) */
+  reduction: number;
+  /** Relative reduction in percent */
+  reductionPct: number;
+  classChanged: boolean;
+};
+
+/**
+ * Residual score if the given dimensions were changed by a measure. Pure and
+ * table-driven, so it can be called on every slider move.
+ */
+export function simulateResidual(
+  initial: { G: number; F: number; P: number },
+  residual: Partial<Record<Dim, number | null>>,
+  t: KinneyThresholds = DEFAULT_THRESHOLDS,
+): WhatIf {
+  const before = scoreDims(initial.G, initial.F, initial.P, t);
+  const after = scoreDims(residual.G ?? before.G, residual.F ?? before.F, residual.P ?? before.P, t);
+  const reduction = before.score - after.score;
+  return {
+    ...after,
+    reduction,
+    reductionPct: Math.round((reduction / before.score) * 100),
+    classChanged: after.classification !== before.classification,
+  };
+}
+
+// ---------------------------------------------------------------------------
+// Consistency with the server
+
+const LABELS: Record<string, Classification> = { Faible: "Faible", Modéré: "Modéré", Moyen: "Modéré", Élevé: "Élevé" };
+
+export type ScoreMismatch = { field: string; local: any; server: any };
+
+/**
+ * Compare a local score with the server's result for the same answers. The
+ * server is the source of truth: mismatches are logged (they mean the bank or
+ * thresholds drifted) and returned so the caller can keep the server values.
+ */
+export function checkConsistency(
+  local: LocalScore | null,
+  server: { G: number; F: number; P: number; score?: number; normalized_score_100?: number; classification?: string },
+  context = "score",
+): ScoreMismatch[] {
+  if (!local) return [];
+  const mismatches: ScoreMismatch[] = [];
+  const check = (field: string, a: any, b: any) => {
+    if (b !== undefined && b !== null && a !== b) mismatches.push({ field, local: a, server: b });
+  };
+  check("G", local.G, server.G);
+  check("F", local.F, server.F);
+  check("P", local.P, server.P);
+  check("score", local.score, server.score);
+  check("normalized_score_100", local.normalized_score_100, server.normalized_score_100);
+  check("classification", local.classification, server.classification && (LABELS[server.classification] ?? server.classification));
+  if (mismatches.length) console.warn(`[Scoring] Local ${context} differs from server:`, mismatches);
+  return mismatches;
+}
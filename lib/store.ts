@@ -0,0 +1,77 @@
+// Minimal external store with selector subscriptions. Components subscribe to
+// the slice they read and re-render only when that slice changes, instead of
+// on every update of the whole state.
+
+import { useCallback, useRef, useSyncExternalStore } from "react";
+
+export type Store<S> = {
+  getState(): S;
+  /** Replace the state; listeners are skipped when `update` returns `prev`. */
+  setState(update: (prev: S) => S): void;
+  subscribe(listener: () => void): () => void;
+};
+
+export function createStore<S>(initial: S): Store<S> {
+  let state = initial;
+  const listeners = new Set<() => void>();
+  return {
+    getState: () => state,
+    setState(update) {
+      const next = update(state);
+      if (next === state) return;
+      state = next;
+      listeners.forEach((l) => l());
+    },
+    subscribe(listener) {
+      listeners.add(listener);
+      return () => {
+        listeners.delete(listener);
+      };
+    },
+  };
+}
+
+export type Equality<T> = (a: T, b: T) => boolean;
+
+export function shallowEqual<T>(a: T, b: T): boolean {
+  if (Object.is(a, b)) return true;
+  if (typeof a !== "object" || typeof b !== "object" || !a || !b) return false;
+  if (Array.isArray(a) !== Array.isArray(b)) return false;
+  const ka = Object.keys(a) as Array<keyof T>;
+  if (ka.length !== Object.keys(b).length) return false;
+  return ka.every((k) => Object.prototype.hasOwnProperty.call(b, k) && Object.is(a[k], b[k]));
+}
+
+/**
+ * Memoized read of `selector(store.getState())`: returns the previous
+ * selection while it is `isEqual` to the new one, so a consumer comparing
+ * by identity (useSyncExternalStore) sees no change.
+ */
+export function createSelection<S, T>(store: Store<S>, selector: (s: S) => T, isEqual: Equality<T> = Object.is) {
+  let hasValue = false;
+  let lastState: S;
+  let lastValue: T;
+  const read = (sel: (s: S) => T = selector): T => {
+    const state = store.getState();
+    if (hasValue && state === lastState && sel === selector) return lastValue;
+    const next = sel(state);
+    selector = sel;
+    lastState = state;
+    if (!hasValue || !isEqual(lastValue, next)) lastValue = next;
+    hasValue = true;
+    return lastValue;
+  };
+  return read;
+}
+
+/**
+ * Subscribe a component to `selector(state)`. Inline selectors are fine: the
+ * result, not the function, decides whether the component re-renders.
+ */
+export function useStore<S, T>(store: Store<S>, selector: (s: S) => T, isEqual: Equality<T> = Object.is): T {
+  const selection = useRef<ReturnType<typeof createSelection<S, T>> | null>(null);
+  if (!selection.current) selection.current = createSelection(store, selector, isEqual);
+  const read = selection.current;
+  const getSnapshot = useCallback(() => read(selector), [read, selector]);
+  return useSyncExternalStore(store.subscribe, getSnapshot, getSnapshot);
+}
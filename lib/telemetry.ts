@@ -0,0 +1,322 @@
+// Client instrumentation: per-endpoint latency histograms, payload sizes and
+// cache hit rate, time spent waiting for an auth token, screen
+// time-to-interactive, and levelled logging.
+//
+// Metrics are a handful of counter updates per event and stay on in release
+// builds, so the debug overlay and the JSON export describe real sessions.
+// Logging is gated on __DEV__, which the bundler inlines as `false` in
+// production: debug/info become no-ops and the minifier drops those branches.
+//
+// No React Native imports: scripts under Node can use this module as is.
+
+const DEV: boolean = typeof __DEV__ === "undefined" ? true : __DEV__;
+
+/** Milliseconds from the performance clock (navigation start on web). */
+export const now = (): number => (typeof performance !== "undefined" ? performance.now() : Date.now());
+
+// Taken when the module is first evaluated, i.e. while the root layout loads
+const jsStartMs = now();
+
+// ---------------------------------------------------------------------------
+// Logging
+
+export type LogLevel = "debug" | "info" | "warn" | "error";
+
+const LEVELS: Record<LogLevel, number> = { debug: 10, info: 20, warn: 30, error: 40 };
+let minLevel = LEVELS[DEV ? "debug" : "warn"];
+
+export function setLogLevel(level: LogLevel) {
+  minLevel = LEVELS[level];
+}
+
+export type LogEntry = { at: string; level: LogLevel; message: string };
+
+// Recent warnings and errors, included in the export
+const MAX_LOG_ENTRIES = 50;
+const recentLogs: LogEntry[] = [];
+
+function format(arg: unknown): string {
+  if (typeof arg === "string") return arg;
+  if (arg instanceof Error) return arg.message;
+  try {
+    return JSON.stringify(arg);
+  } catch {
+    return String(arg);
+  }
+}
+
+function logger(level: LogLevel, sink: (...args: unknown[]) => void) {
+  return (...args: unknown[]) => {
+    if (LEVELS[level] < minLevel) return;
+    sink(...args);
+    if (LEVELS[level] >= LEVELS.warn) {
+      recentLogs.push({ at: new Date().toISOString(), level, message: args.map(format).join(" ") });
+      if (recentLogs.length > MAX_LOG_ENTRIES) recentLogs.shift();
+    }
+  };
+}
+
+const noop = (..._args: unknown[]) => {};
+
+export const log = {
+  debug: DEV ? logger("debug", (...a) => console.log(...a)) : noop,
+  info: DEV ? logger("info", (...a) => console.info(...a)) : noop,
+  warn: logger("warn", (...a) => console.warn(...a)),
+  error: logger("error", (...a) => console.error(...a)),
+};
+
+// ---------------------------------------------------------------------------
+// Histograms
+
+// Upper bounds (ms) of the latency buckets; the last bucket is unbounded
+const BOUNDS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000];
+
+export type Histogram = { count: number; sum: number; min: number; max: number; buckets: number[] };
+
+function histogram(): Histogram {
+  return { count: 0, sum: 0, min: Infinity, max: 0, buckets: new Array(BOUNDS.length + 1).fill(0) };
+}
+
+function observe(h: Histogram, value: number) {
+  h.count++;
+  h.sum += value;
+  if (value < h.min) h.min = value;
+  if (value > h.max) h.max = value;
+  let i = 0;
+  while (i < BOUNDS.length && value > BOUNDS[i]) i++;
+  h.buckets[i]++;
+}
+
+/** Quantile estimated by linear interpolation inside the bucket that holds it. */
+export function quantile(h: Histogram, q: number): number {
+  if (!h.count) return 0;
+  const rank = q * h.count;
+  let seen = 0;
+  for (let i = 0; i < h.buckets.length; i++) {
+    const n = h.buckets[i];
+    if (seen + n >= rank && n > 0) {
+      const lower = Math.max(i ? BOUNDS[i - 1] : 0, h.min);
+      const upper = Math.min(i < BOUNDS.length ? BOUNDS[i] : h.max, h.max);
+      return lower + ((upper - lower) * (rank - seen)) / n;
+    }
+    seen += n;
+  }
+  return h.max;
+}
+
+export type HistogramSummary = { count: number; mean: number; p50: number; p95: number; max: number; buckets: Record<string, number> };
+
+const round = (v: number) => Math.round(v * 10) / 10;
+
+function summarize(h: Histogram): HistogramSummary {
+  const buckets: Record<string, number> = {};
+  h.buckets.forEach((n, i) => {
+    if (n) buckets[i < BOUNDS.length ? `<=${BOUNDS[i]}` : `>${BOUNDS[BOUNDS.length - 1]}`] = n;
+  });
+  return {
+    count: h.count,
+    mean: h.count ? round(h.sum / h.count) : 0,
+    p50: round(quantile(h, 0.5)),
+    p95: round(quantile(h, 0.95)),
+    max: round(h.max),
+    buckets,
+  };
+}
+
+// ---------------------------------------------------------------------------
+// Endpoints
+
+export type CacheOutcome = "hit" | "stale" | "miss";
+
+type EndpointStats = {
+  latency: Histogram;
+  errors: number;
+  sentBytes: number;
+  responses: number;
+  receivedBytes: number;
+  largestResponse: number;
+  notModified: number;
+  cache: Record<CacheOutcome, number>;
+};
+
+const endpoints = new Map<string, EndpointStats>();
+
+/**
+ * UTF-8 size of a string, counted without encoding it (a surrogate pair is
+ * two code units of 2 bytes each: 4 bytes).
+ */
+export function utf8Length(text: string): number {
+  let bytes = text.length;
+  for (let i = 0; i < text.length; i++) {
+    const c = text.charCodeAt(i);
+    if (c >= 0x800 && (c < 0xd800 || c > 0xdfff)) bytes += 2;
+    else if (c >= 0x80) bytes += 1;
+  }
+  return bytes;
+}
+
+/**
+ * Metric key for a request: method plus path without the query string, with
+ * id-like segments (containing a digit, or 20+ characters) collapsed to `:id`.
+ */
+export function endpointKey(method: string, path: string): string {
+  const pathname = path.split("?")[0];
+  const shape = pathname
+    .split("/")
+    .map((seg) => (/\d/.test(seg) || seg.length >= 20 ? ":id" : seg))
+    .join("/");
+  return `${method.toUpperCase()} ${shape || "/"}`;
+}
+
+function statsFor(key: string): EndpointStats {
+  let stats = endpoints.get(key);
+  if (!stats) {
+    stats = {
+      latency: histogram(),
+      errors: 0,
+      sentBytes: 0,
+      responses: 0,
+      receivedBytes: 0,
+      largestResponse: 0,
+      notModified: 0,
+      cache: { hit: 0, stale: 0, miss: 0 },
+    };
+    endpoints.set(key, stats);
+  }
+  return stats;
+}
+
+/** One network round trip. `status` is 0 when the request never got a response. */
+export function recordRequest(key: string, sample: { ms: number; status: number; sentBytes?: number }) {
+  const stats = statsFor(key);
+  observe(stats.latency, sample.ms);
+  if (sample.status === 0 || sample.status >= 400) stats.errors++;
+  if (sample.status === 304) stats.notModified++;
+  stats.sentBytes += sample.sentBytes ?? 0;
+}
+
+/** Size of a response body, in UTF-8 bytes of the decoded text (see utf8Length). */
+export function recordResponseSize(key: string, size: number) {
+  const stats = statsFor(key);
+  stats.responses++;
+  stats.receivedBytes += size;
+  if (size > stats.largestResponse) stats.largestResponse = size;
+}
+
+export function recordCache(key: string, outcome: CacheOutcome, count = 1) {
+  statsFor(key).cache[outcome] += count;
+}
+
+// ---------------------------------------------------------------------------
+// Auth
+
+export type TokenSource = "cache" | "refresh" | "none";
+
+const authWait = histogram();
+const tokenSources: Record<TokenSource, number> = { cache: 0, refresh: 0, none: 0 };
+
+/** Time a caller waited for an ID token, and where the token came from. */
+export function recordAuthWait(ms: number, source: TokenSource) {
+  observe(authWait, ms);
+  tokenSources[source]++;
+}
+
+// ---------------------------------------------------------------------------
+// Screens
+
+const screens = new Map<string, Histogram>();
+// The first screen is timed from the start of the JS bundle
+let navigationStart: number | null = jsStartMs;
+let firstScreen: { route: string; ms: number } | null = null;
+
+/** A navigation action was dispatched; the next screen is timed from here. */
+export function markNavigation() {
+  navigationStart = now();
+}
+
+/** `route` has rendered and its pending interactions have run. */
+export function markInteractive(route: string) {
+  if (navigationStart === null) return;
+  const end = now();
+  const ms = end - navigationStart;
+  navigationStart = null;
+  let h = screens.get(route);
+  if (!h) {
+    h = histogram();
+    screens.set(route, h);
+  }
+  observe(h, ms);
+  if (!firstScreen) firstScreen = { route, ms: end };
+  log.debug(`[Perf] ${route} interactive in ${Math.round(ms)}ms`);
+}
+
+// ---------------------------------------------------------------------------
+// Snapshot / export
+
+export type EndpointSummary = {
+  calls: number;
+  errors: number;
+  latency: HistogramSummary;
+  avgResponseSize: number;
+  largestResponse: number;
+  sentBytes: number;
+  notModified: number;
+  cache: Record<CacheOutcome, number> & { hitRate: number | null };
+};
+
+export type TelemetrySnapshot = {
+  collectedAt: string;
+  startup: {
+    /** Performance clock when the instrumentation module was evaluated. */
+    jsStartMs: number;
+    /** First screen to become interactive, on the same clock. */
+    firstScreen: { route: string; ms: number } | null;
+  };
+  endpoints: Record<string, EndpointSummary>;
+  auth: { wait: HistogramSummary; sources: Record<TokenSource, number> };
+  screens: Record<string, HistogramSummary>;
+  logs: LogEntry[];
+};
+
+export function getTelemetry(): TelemetrySnapshot {
+  const byEndpoint: Record<string, EndpointSummary> = {};
+  for (const [key, s] of Array.from(endpoints.entries()).sort(([a], [b]) => a.localeCompare(b))) {
+    const lookups = s.cache.hit + s.cache.stale + s.cache.miss;
+    const calls = s.latency.count;
+    byEndpoint[key] = {
+      calls,
+      errors: s.errors,
+      latency: summarize(s.latency),
+      avgResponseSize: s.responses ? Math.round(s.receivedBytes / s.responses) : 0,
+      largestResponse: s.largestResponse,
+      sentBytes: s.sentBytes,
+      notModified: s.notModified,
+      cache: { ...s.cache, hitRate: lookups ? Math.round(((s.cache.hit + s.cache.stale) / lookups) * 100) / 100 : null },
+    };
+  }
+  const byScreen: Record<string, HistogramSummary> = {};
+  screens.forEach((h, route) => {
+    byScreen[route] = summarize(h);
+  });
+  return {
+    collectedAt: new Date().toISOString(),
+    startup: { jsStartMs: round(jsStartMs), firstScreen: firstScreen && { ...firstScreen, ms: round(firstScreen.ms) } },
+    endpoints: byEndpoint,
+    auth: { wait: summarize(authWait), sources: { ...tokenSources } },
+    screens: byScreen,
+    logs: recentLogs.slice(),
+  };
+}
+
+export function exportTelemetry(): string {
+  return JSON.stringify(getTelemetry(), null, 2);
+}
+
+/** Drop collected metrics (startup figures are kept: they only happen once). */
+export function resetTelemetry() {
+  endpoints.clear();
+  screens.clear();
+  Object.assign(authWait, histogram());
+  tokenSources.cache = tokenSources.refresh = tokenSources.none = 0;
+  recentLogs.length = 0;
+}
@@ -83,6 +83,26 @@ export type CompareResponse = {
   };
 };
 
+/** One entry of /projects/{id}/ai-analysis: a /compare result tied to a project risk. */
+export type ProjectAIComparison = CompareResponse & {
+  risk_id: string;
+  risk_description: string;
+};
+
+export type ProjectAIAnalysisResponse = {
+  project_id: string;
+  comparisons: ProjectAIComparison[];
+};
+
+/**
+ * One NDJSON line (or SSE `data:` block) of /projects/{id}/ai-analysis?stream=1.
+ * Servers without streaming answer a plain ProjectAIAnalysisResponse instead.
+ */
+export type ProjectAIStreamEvent =
+  | { type: "comparison"; data: ProjectAIComparison }
+  | { type: "error"; risk_id?: string; message: string }
+  | { type: "done"; project_id: string };
+
 export type TraceListResponse = {
   total: number;
   limit: number;
@@ -142,6 +162,7 @@ export type UserAnalysisListResponse = {
   limit: number;
   offset: number;
   analyses: UserAnalysis[];
+  next_cursor?: string | null;
 };
 
 // Project-based analysis types
@@ -228,4 +249,38 @@ export type ProjectSummaryListResponse = {
   limit: number;
   offset: number;
   projects: ProjectSummary[];
+  next_cursor?: string | null;
+};
+
+// Cursor-based page used by infinite lists. The cursor is opaque to screens:
+// either the server's next_cursor or an offset when the server has none.
+export type Page<T> = {
+  items: T[];
+  nextCursor: string | null;
+  total?: number;
+};
+
+// Bulk project persistence (single batched save of a whole analysis)
+export type BulkRiskPayload = {
+  client_id: string; // id local du risque (RiskInProgress.id)
+  description: string;
+  category: Category;
+  type: RiskType;
+  G: number;
+  F: number;
+  P: number;
+  mitigation_measure?: string;
+  residual_G?: number;
+  residual_F?: number;
+  residual_P?: number;
+};
+
+export type BulkSaveProjectRequest = {
+  project: CreateProjectRequest;
+  risks: BulkRiskPayload[];
+};
+
+export type BulkSaveProgress = {
+  completed: number;
+  total: number;
 };
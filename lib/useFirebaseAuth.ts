@@ -1,6 +1,8 @@
 import { useEffect, useState } from "react";
 import { getFirebaseAuth, initFirebaseApp } from "./firebase";
 import { clearTokenCache } from "./auth";
+import { clearResponseCache } from "./cache";
+import { requestSync } from "./outbox";
 
 /**
  * Hook to listen to Firebase auth state changes and keep token cache in sync
@@ -25,8 +27,13 @@ export function useFirebaseAuth() {
           setLoading(false);
 
           if (!currentUser) {
-            // User is signed out, clear the cache
+            // User is signed out, clear the cache. The local store is kept:
+            // its queued edits are replayed if the same account signs back
+            // in, and cleared when another one does (claimLocalStore, lib/auth.ts).
             clearTokenCache();
+            clearResponseCache();
+          } else {
+            requestSync();
           }
         });
       } catch (err) {
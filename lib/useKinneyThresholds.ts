@@ -0,0 +1,33 @@
+import { useEffect, useState } from "react";
+import { getConstants, onConstantsRevalidated } from "./api";
+import { DEFAULT_THRESHOLDS, thresholdsFrom, type KinneyThresholds } from "./scoring";
+
+let known: KinneyThresholds | null = null;
+
+/**
+ * Kinney thresholds from /constants (cached), with the default 25/50 bounds
+ * until they are loaded so local scoring never waits on the network.
+ */
+export function useKinneyThresholds(): KinneyThresholds {
+  const [thresholds, setThresholds] = useState<KinneyThresholds>(known ?? DEFAULT_THRESHOLDS);
+
+  useEffect(() => {
+    let cancelled = false;
+    getConstants()
+      .then((c) => {
+        known = thresholdsFrom(c);
+        if (!cancelled) setThresholds(known);
+      })
+      .catch(() => {});
+    const off = onConstantsRevalidated((c) => {
+      known = thresholdsFrom(c);
+      setThresholds(known);
+    });
+    return () => {
+      cancelled = true;
+      off();
+    };
+  }, []);
+
+  return thresholds;
+}
@@ -0,0 +1,74 @@
+import { useCallback, useRef, useState } from "react";
+import type { Page } from "./types";
+
+/**
+ * Infinite-scroll state over a cursor-paginated fetcher.
+ * `refresh()` reloads the first page; `loadMore()` is safe to call from
+ * FlatList.onEndReached (ignored while a page is loading or at the end).
+ * A failed `loadMore()` keeps the loaded items and sets `error`; calling it
+ * again retries the same page.
+ */
+export function usePaginatedList<T>(
+  fetchPage: (cursor: string | null) => Promise<Page<T>>,
+  onPage?: (items: T[], reset: boolean) => void,
+) {
+  const [items, setItems] = useState<T[]>([]);
+  const [total, setTotal] = useState<number | undefined>(undefined);
+  const [loading, setLoading] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [error, setError] = useState<string | null>(null);
+  const cursor = useRef<string | null>(null);
+  const hasMore = useRef(true);
+  const busy = useRef(false);
+  // Each refresh starts a new generation; pages from an older one are ignored
+  const generation = useRef(0);
+
+  const refresh = useCallback(async () => {
+    const gen = ++generation.current;
+    busy.current = true;
+    setLoading(true);
+    setError(null);
+    try {
+      const page = await fetchPage(null);
+      if (gen !== generation.current) return;
+      cursor.current = page.nextCursor;
+      hasMore.current = !!page.nextCursor;
+      setItems(page.items);
+      setTotal(page.total);
+      onPage?.(page.items, true);
+    } catch (e: any) {
+      if (gen === generation.current) setError(e?.message || "Erreur de chargement");
+    } finally {
+      if (gen === generation.current) {
+        busy.current = false;
+        setLoading(false);
+      }
+    }
+  }, [fetchPage, onPage]);
+
+  const loadMore = useCallback(async () => {
+    if (busy.current || !hasMore.current) return;
+    const gen = generation.current;
+    busy.current = true;
+    setLoadingMore(true);
+    setError(null);
+    try {
+      const page = await fetchPage(cursor.current);
+      if (gen !== generation.current) return;
+      cursor.current = page.nextCursor;
+      hasMore.current = !!page.nextCursor;
+      setItems((prev) => [...prev, ...page.items]);
+      if (page.total !== undefined) setTotal(page.total);
+      onPage?.(page.items, false);
+    } catch (e: any) {
+      if (gen === generation.current) setError(e?.message || "Erreur de chargement");
+    } finally {
+      if (gen === generation.current) {
+        busy.current = false;
+        setLoadingMore(false);
+      }
+    }
+  }, [fetchPage, onPage]);
+
+  return { items, setItems, total, loading, loadingMore, error, refresh, loadMore, hasMore: hasMore.current };
+}
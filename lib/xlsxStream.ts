@@ -0,0 +1,321 @@
+// Streaming XLSX writer. Rows are pulled lazily from (async) iterables,
+// serialised a chunk at a time and written to a byte sink as STORE entries of
+// a ZIP archive with trailing data descriptors, so neither the workbook model
+// nor the finished file has to be held in memory. Free of React Native
+// imports so the export benchmark can run it under Node.
+
+export type ByteSink = {
+  write(chunk: Uint8Array): Promise<void> | void;
+};
+
+export type CellValue = string | number | boolean | null | undefined;
+export type CellStyle = "headerBlue" | "headerGreen" | "bold" | "title" | "wrap";
+export type Row = CellValue[] | { cells: CellValue[]; style: CellStyle };
+type RowSource = Iterable<Row> | AsyncIterable<Row>;
+
+export type SheetSpec = {
+  name: string;
+  /** Column widths in characters */
+  widths?: number[];
+  rows: RowSource | (() => RowSource);
+  /**
+   * Tab position, when it differs from the order sheets are written in (a
+   * summary sheet built from data gathered while streaming a later sheet).
+   */
+  tab?: number;
+};
+
+export type XlsxOptions = {
+  creator?: string;
+  /** Rows serialised per chunk written to the sink */
+  chunkRows?: number;
+  /** Awaited between chunks, e.g. to give the UI thread a frame */
+  pause?: () => Promise<void>;
+  signal?: AbortSignal;
+  onProgress?: (rows: number) => void;
+};
+
+export type XlsxResult = { bytes: number; rows: number };
+
+const DEFAULT_CHUNK_ROWS = 200;
+
+// ---------------------------------------------------------------------------
+// ZIP (STORE + data descriptors)
+
+let crcTable: Uint32Array | null = null;
+
+function crc32(crc: number, bytes: Uint8Array): number {
+  if (!crcTable) {
+    crcTable = new Uint32Array(256);
+    for (let n = 0; n < 256; n++) {
+      let c = n;
+      for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+      crcTable[n] = c >>> 0;
+    }
+  }
+  let c = ~crc;
+  for (let i = 0; i < bytes.length; i++) c = crcTable[(c ^ bytes[i]) & 0xff] ^ (c >>> 8);
+  return ~c >>> 0;
+}
+
+type ZipEntry = { name: Uint8Array; crc: number; size: number; offset: number };
+
+const encoder = new TextEncoder();
+// 1980-01-01 00:00, the DOS epoch: entries carry no meaningful timestamp
+const DOS_DATE = 0x21;
+const DOS_TIME = 0;
+// Bit 3: sizes/CRC follow the data; bit 11: UTF-8 names
+const FLAGS = 0x0808;
+
+function header(size: number, fill: (v: DataView) => void): Uint8Array {
+  const bytes = new Uint8Array(size);
+  fill(new DataView(bytes.buffer));
+  return bytes;
+}
+
+function createZip(sink: ByteSink) {
+  const entries: ZipEntry[] = [];
+  let offset = 0;
+
+  const put = async (bytes: Uint8Array) => {
+    await sink.write(bytes);
+    offset += bytes.length;
+  };
+
+  return {
+    get offset() {
+      return offset;
+    },
+
+    /** Stream one entry; `body` receives a writer and returns once done. */
+    async entry(path: string, body: (write: (chunk: Uint8Array) => Promise<void>) => Promise<void>) {
+      const name = encoder.encode(path);
+      const entry: ZipEntry = { name, crc: 0, size: 0, offset };
+      await put(header(30, (v) => {
+        v.setUint32(0, 0x04034b50, true);
+        v.setUint16(4, 20, true);
+        v.setUint16(6, FLAGS, true);
+        v.setUint16(8, 0, true); // STORE
+        v.setUint16(10, DOS_TIME, true);
+        v.setUint16(12, DOS_DATE, true);
+        v.setUint16(26, name.length, true);
+      }));
+      await put(name);
+      await body(async (chunk) => {
+        entry.crc = crc32(entry.crc, chunk);
+        entry.size += chunk.length;
+        await put(chunk);
+      });
+      await put(header(16, (v) => {
+        v.setUint32(0, 0x08074b50, true);
+        v.setUint32(4, entry.crc, true);
+        v.setUint32(8, entry.size, true);
+        v.setUint32(12, entry.size, true);
+      }));
+      entries.push(entry);
+    },
+
+    async finish() {
+      const start = offset;
+      for (const e of entries) {
+        await put(header(46, (v) => {
+          v.setUint32(0, 0x02014b50, true);
+          v.setUint16(4, 20, true);
+          v.setUint16(6, 20, true);
+          v.setUint16(8, FLAGS, true);
+          v.setUint16(10, 0, true);
+          v.setUint16(12, DOS_TIME, true);
+          v.setUint16(14, DOS_DATE, true);
+          v.setUint32(16, e.crc, true);
+          v.setUint32(20, e.size, true);
+          v.setUint32(24, e.size, true);
+          v.setUint16(28, e.name.length, true);
+          v.setUint32(42, e.offset, true);
+        }));
+        await put(e.name);
+      }
+      const size = offset - start;
+      await put(header(22, (v) => {
+        v.setUint32(0, 0x06054b50, true);
+        v.setUint16(8, entries.length, true);
+        v.setUint16(10, entries.length, true);
+        v.setUint32(12, size, true);
+        v.setUint32(16, start, true);
+      }));
+    },
+  };
+}
+
+// ---------------------------------------------------------------------------
+// SpreadsheetML
+
+const STYLE_INDEX: Record<CellStyle, number> = { headerBlue: 1, headerGreen: 2, bold: 3, title: 4, wrap: 5 };
+
+const STYLES_XML =
+  '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>' +
+  '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">' +
+  '<fonts count="4">' +
+  '<font><sz val="11"/><name val="Calibri"/></font>' +
+  '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/></font>' +
+  '<font><b/><sz val="11"/><name val="Calibri"/></font>' +
+  '<font><b/><sz val="16"/><name val="Calibri"/></font>' +
+  "</fonts>" +
+  '<fills count="4">' +
+  '<fill><patternFill patternType="none"/></fill>' +
+  '<fill><patternFill patternType="gray125"/></fill>' +
+  '<fill><patternFill patternType="solid"><fgColor rgb="FF4472C4"/></patternFill></fill>' +
+  '<fill><patternFill patternType="solid"><fgColor rgb="FF70AD47"/></patternFill></fill>' +
+  "</fills>" +
+  '<borders count="1"><border/></borders>' +
+  '<cellStyleXfs count="1"><xf/></cellStyleXfs>' +
+  '<cellXfs count="6">' +
+  "<xf/>" +
+  '<xf fontId="1" fillId="2" applyFont="1" applyFill="1" applyAlignment="1"><alignment horizontal="center" vertical="center" wrapText="1"/></xf>' +
+  '<xf fontId="1" fillId="3" applyFont="1" applyFill="1" applyAlignment="1"><alignment horizontal="center" vertical="center" wrapText="1"/></xf>' +
+  '<xf fontId="2" applyFont="1"/>' +
+  '<xf fontId="3" applyFont="1"/>' +
+  '<xf applyAlignment="1"><alignment vertical="top" wrapText="1"/></xf>' +
+  "</cellXfs>" +
+  "</styleSheet>";
+
+// Characters XML 1.0 does not allow, even escaped
+const INVALID_XML = /[\u0000-\u0008\u000B\u000C\u000E-\u001F\uFFFE\uFFFF]/g;
+
+function escapeXml(s: string): string {
+  return s
+    .replace(INVALID_XML, "")
+    .replace(/&/g, "&amp;")
+    .replace(/</g, "&lt;")
+    .replace(/>/g, "&gt;")
+    .replace(/"/g, "&quot;");
+}
+
+function cellXml(value: CellValue, s: string): string {
+  if (value === null || value === undefined || value === "") return s ? `<c${s}/>` : "<c/>";
+  if (typeof value === "number") return Number.isFinite(value) ? `<c${s}><v>${value}</v></c>` : `<c${s}/>`;
+  if (typeof value === "boolean") return `<c${s} t="b"><v>${value ? 1 : 0}</v></c>`;
+  // Inline strings: no shared-string table to accumulate while streaming
+  return `<c${s} t="inlineStr"><is><t xml:space="preserve">${escapeXml(value)}</t></is></c>`;
+}
+
+function rowXml(row: Row, r: number): string {
+  const cells = Array.isArray(row) ? row : row.cells;
+  const s = Array.isArray(row) ? "" : ` s="${STYLE_INDEX[row.style]}"`;
+  let xml = `<row r="${r}">`;
+  for (const v of cells) xml += cellXml(v, s);
+  return xml + "</row>";
+}
+
+/** Sheet names: at most 31 characters, none of : \ / ? * [ ] */
+function sheetName(name: string, used: Set<string>): string {
+  const base = name.replace(/[:\\/?*[\]]/g, " ").slice(0, 31).trim() || "Feuille";
+  let out = base;
+  for (let i = 2; used.has(out.toLowerCase()); i++) out = `${base.slice(0, 31 - String(i).length - 1)} ${i}`;
+  used.add(out.toLowerCase());
+  return out;
+}
+
+const XML_HEAD = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>';
+const NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main";
+const NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships";
+const NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships";
+
+function throwIfAborted(signal?: AbortSignal) {
+  if (signal?.aborted) throw new Error("Export annulé");
+}
+
+/**
+ * Write an .xlsx workbook to `sink`, streaming each sheet's rows.
+ */
+export async function writeXlsx(sink: ByteSink, sheets: SheetSpec[], options: XlsxOptions = {}): Promise<XlsxResult> {
+  const { chunkRows = DEFAULT_CHUNK_ROWS, pause, signal, onProgress } = options;
+  const zip = createZip(sink);
+  const used = new Set<string>();
+  const names = sheets.map((s) => sheetName(s.name, used));
+  let total = 0;
+
+  for (let i = 0; i < sheets.length; i++) {
+    const sheet = sheets[i];
+    await zip.entry(`xl/worksheets/sheet${i + 1}.xml`, async (write) => {
+      let xml = `${XML_HEAD}<worksheet xmlns="${NS_MAIN}" xmlns:r="${NS_REL}">`;
+      if (sheet.widths?.length) {
+        xml += "<cols>";
+        sheet.widths.forEach((w, c) => (xml += `<col min="${c + 1}" max="${c + 1}" width="${w}" customWidth="1"/>`));
+        xml += "</cols>";
+      }
+      xml += "<sheetData>";
+      let r = 0;
+      let pending = 0;
+      const source = typeof sheet.rows === "function" ? sheet.rows() : sheet.rows;
+      for await (const row of source as AsyncIterable<Row>) {
+        xml += rowXml(row, ++r);
+        if (++pending >= chunkRows) {
+          await write(encoder.encode(xml));
+          xml = "";
+          pending = 0;
+          total += chunkRows;
+          onProgress?.(total);
+          throwIfAborted(signal);
+          if (pause) await pause();
+        }
+      }
+      total += pending;
+      await write(encoder.encode(xml + "</sheetData></worksheet>"));
+    });
+    onProgress?.(total);
+    throwIfAborted(signal);
+  }
+
+  // Tab order can differ from the order the sheets were streamed in
+  const tabs = sheets.map((s, i) => ({ i, tab: s.tab ?? i })).sort((a, b) => a.tab - b.tab);
+  const parts: Array<[string, string]> = [
+    [
+      "[Content_Types].xml",
+      `${XML_HEAD}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">` +
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>' +
+        '<Default Extension="xml" ContentType="application/xml"/>' +
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>' +
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>' +
+        '<Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>' +
+        sheets
+          .map((_, i) => `<Override PartName="/xl/worksheets/sheet${i + 1}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>`)
+          .join("") +
+        "</Types>",
+    ],
+    [
+      "_rels/.rels",
+      `${XML_HEAD}<Relationships xmlns="${NS_PKG_REL}">` +
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>' +
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>' +
+        "</Relationships>",
+    ],
+    [
+      "docProps/core.xml",
+      `${XML_HEAD}<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">` +
+        `<dc:creator>${escapeXml(options.creator || "")}</dc:creator>` +
+        `<dcterms:created xsi:type="dcterms:W3CDTF">${new Date().toISOString().replace(/\.\d+Z$/, "Z")}</dcterms:created>` +
+        "</cp:coreProperties>",
+    ],
+    [
+      "xl/workbook.xml",
+      `${XML_HEAD}<workbook xmlns="${NS_MAIN}" xmlns:r="${NS_REL}"><sheets>` +
+        tabs.map(({ i }, pos) => `<sheet name="${escapeXml(names[i])}" sheetId="${pos + 1}" r:id="rId${i + 1}"/>`).join("") +
+        "</sheets></workbook>",
+    ],
+    [
+      "xl/_rels/workbook.xml.rels",
+      `${XML_HEAD}<Relationships xmlns="${NS_PKG_REL}">` +
+        sheets
+          .map((_, i) => `<Relationship Id="rId${i + 1}" Type="${NS_REL}/worksheet" Target="worksheets/sheet${i + 1}.xml"/>`)
+          .join("") +
+        `<Relationship Id="rId${sheets.length + 1}" Type="${NS_REL}/styles" Target="styles.xml"/>` +
+        "</Relationships>",
+    ],
+    ["xl/styles.xml", STYLES_XML],
+  ];
+  for (const [path, xml] of parts) {
+    await zip.entry(path, (write) => write(encoder.encode(xml)));
+  }
+  await zip.finish();
+  return { bytes: zip.offset, rows: total };
+}
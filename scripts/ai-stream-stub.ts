@@ -0,0 +1,198 @@
+/**
+ * Serveur bouchon pour /projects/{id}/ai-analysis en flux, et contrôle du
+ * lecteur lib/aiStream.ts contre ce serveur.
+ *
+ * Le serveur renvoie une comparaison par risque demandé (risk_ids du corps),
+ * espacées de DELAY ms, au format NDJSON, SSE ou JSON classique selon l'en-tête
+ * Accept ou le paramètre ?format=. Vérifie :
+ *   - l'arrivée progressive (première comparaison bien avant la fin) ;
+ *   - les trois formats, y compris des morceaux coupés au milieu d'une ligne ;
+ *   - l'annulation par AbortController en cours de flux ;
+ *   - la remontée des erreurs HTTP au format de lib/api.ts.
+ *
+ * Usage: npx tsx scripts/ai-stream-stub.ts [--serve] [port=8787]
+ *   --serve : garde le serveur ouvert (pointer API_BASE_URL dessus pour tester l'app)
+ */
+
+import { createServer, type IncomingMessage, type ServerResponse } from "http";
+import type { AddressInfo } from "net";
+import { createStreamParser, isAbortError, streamJson, type StreamFormat } from "../lib/aiStream";
+import type { ProjectAIComparison } from "../lib/types";
+
+const serve = process.argv.includes("--serve");
+const PORT = Number(process.argv.find((a) => /^\d+$/.test(a)) || (serve ? 8787 : 0));
+const DELAY = 150;
+const RISKS = 5;
+
+const wait = (ms: number) => new Promise((r) => setTimeout(r, ms));
+
+function fakeComparison(riskId: string, i: number): ProjectAIComparison {
+  const G = 1 + (i % 5), F = 1 + ((i * 2) % 5), P = 1 + ((i * 3) % 5);
+  const level = (s: number) => (s <= 25 ? "Faible" : s <= 50 ? "Modéré" : "Élevé");
+  return {
+    risk_id: riskId,
+    risk_description: `Risque ${riskId}`,
+    human_analysis: { G, F, P, score: G * F * P, classification: level(G * F * P) },
+    ia_analysis: { G, F, P: Math.min(5, P + 1), score: G * F * Math.min(5, P + 1), classification: level(G * F * Math.min(5, P + 1)), justification: "Bouchon" },
+    comparison: { agreement_level: i % 2 ? "Élevé" : "Moyen", classifications_match: i % 2 === 1 },
+  };
+}
+
+async function readBody(req: IncomingMessage): Promise<any> {
+  let raw = "";
+  for await (const chunk of req) raw += chunk;
+  try {
+    return raw ? JSON.parse(raw) : {};
+  } catch {
+    return {};
+  }
+}
+
+async function handle(req: IncomingMessage, res: ServerResponse) {
+  const url = new URL(req.url || "/", "http://stub");
+  const match = url.pathname.match(/^\/projects\/([^/]+)\/ai-analysis$/);
+  if (req.method !== "POST" || !match) {
+    res.writeHead(404, { "Content-Type": "application/json" }).end(JSON.stringify({ detail: "Not found" }));
+    return;
+  }
+  if (match[1] === "forbidden") {
+    res.writeHead(403, { "Content-Type": "application/json" }).end(JSON.stringify({ detail: "Accès refusé" }));
+    return;
+  }
+  const body = await readBody(req);
+  const ids: string[] = body.risk_ids?.length ? body.risk_ids : Array.from({ length: RISKS }, (_, i) => `r${i}`);
+  const accept = String(req.headers.accept || "");
+  const format = (url.searchParams.get("format") as StreamFormat) ||
+    (accept.includes("ndjson") ? "ndjson" : accept.includes("event-stream") ? "sse" : "json");
+
+  if (format === "json") {
+    await wait(DELAY * ids.length);
+    res.writeHead(200, { "Content-Type": "application/json" });
+    res.end(JSON.stringify({ project_id: match[1], comparisons: ids.map(fakeComparison) }));
+    return;
+  }
+
+  res.writeHead(200, {
+    "Content-Type": format === "sse" ? "text/event-stream" : "application/x-ndjson",
+    "Cache-Control": "no-cache",
+  });
+  let closed = false;
+  res.on("close", () => (closed = true));
+  const send = (event: object, name?: string) => {
+    const json = JSON.stringify(event);
+    if (format === "sse") {
+      res.write(`${name ? `event: ${name}\n` : ""}data: ${json}\n\n`);
+    } else {
+      // Ligne coupée en deux écritures : le lecteur doit recoller les morceaux
+      const cut = Math.floor(json.length / 2);
+      res.write(json.slice(0, cut));
+      res.write(json.slice(cut) + "\n");
+    }
+  };
+  if (format === "sse") res.write(": flux ouvert\n\n");
+  for (let i = 0; i < ids.length && !closed; i++) {
+    await wait(DELAY);
+    if (format === "sse" && i === 0) send(fakeComparison(ids[i], i), "comparison");
+    else send({ type: "comparison", data: fakeComparison(ids[i], i) });
+  }
+  if (!closed) send({ type: "done", project_id: match[1] });
+  res.end();
+}
+
+// ---------------------------------------------------------------------------
+// Contrôles
+
+let failures = 0;
+function check(label: string, ok: boolean, detail = "") {
+  if (!ok) failures++;
+  console.log(`${ok ? "OK  " : "ÉCHEC"} ${label}${detail ? ` (${detail})` : ""}`);
+}
+
+function parserChecks() {
+  const ndjson: any[] = [];
+  const p = createStreamParser("ndjson", (v) => ndjson.push(v));
+  p.push('{"a":1}\n{"b"');
+  p.push(':2}\r\n\n{"c":3}');
+  p.end();
+  check("parser NDJSON (morceaux coupés, CRLF, dernière ligne sans \\n)", JSON.stringify(ndjson) === '[{"a":1},{"b":2},{"c":3}]');
+
+  const sse: any[] = [];
+  const s = createStreamParser("sse", (v) => sse.push(v));
+  s.push(": commentaire\n\nevent: comparison\ndata: {\"x\":");
+  s.push("1}\n\ndata: {\"type\":\"done\"}\n\ndata: [DONE]\n\n");
+  s.end();
+  check("parser SSE (event:, commentaires, [DONE])", JSON.stringify(sse) === '[{"type":"comparison","data":{"x":1}},{"type":"done"}]');
+}
+
+async function run(base: string, format: StreamFormat, signal?: AbortSignal) {
+  const t0 = performance.now();
+  const arrivals: number[] = [];
+  const values: any[] = [];
+  await streamJson(
+    {
+      url: `${base}/projects/p1/ai-analysis?format=${format}`,
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ risk_ids: ["r0", "r1", "r2", "r3", "r4"] }),
+      signal,
+    },
+    (v) => {
+      arrivals.push(performance.now() - t0);
+      values.push(v);
+    }
+  );
+  return { arrivals, values, total: performance.now() - t0 };
+}
+
+async function streamChecks(base: string) {
+  for (const format of ["ndjson", "sse"] as const) {
+    const { arrivals, values, total } = await run(base, format);
+    const comparisons = values.filter((v) => v.type === "comparison").length;
+    check(`${format} : 5 comparaisons + fin`, comparisons === 5 && values[values.length - 1]?.type === "done");
+    check(`${format} : première comparaison avant la fin`, arrivals[0] < total / 2, `${Math.round(arrivals[0])} ms / ${Math.round(total)} ms`);
+  }
+
+  const json = await run(base, "json");
+  check("json : réponse unique (serveur sans flux)", json.values.length === 1 && json.values[0].comparisons?.length === 5);
+
+  const controller = new AbortController();
+  const received: any[] = [];
+  setTimeout(() => controller.abort(), DELAY * 2.5);
+  try {
+    await streamJson(
+      { url: `${base}/projects/p1/ai-analysis?format=ndjson`, method: "POST", body: "{}", signal: controller.signal },
+      (v) => received.push(v)
+    );
+    check("annulation", false, "le flux est allé au bout");
+  } catch (e) {
+    check("annulation : AbortError après 2 comparaisons", isAbortError(e) && received.length === 2, `${received.length} reçues`);
+  }
+
+  try {
+    await streamJson({ url: `${base}/projects/forbidden/ai-analysis`, method: "POST" }, () => {});
+    check("erreur HTTP", false, "aucune erreur levée");
+  } catch (e: any) {
+    check("erreur HTTP au format « 403 Forbidden: … »", /^403 /.test(e?.message || ""), e?.message);
+  }
+}
+
+async function main() {
+  const server = createServer((req, res) => {
+    handle(req, res).catch((e) => {
+      console.error(e);
+      res.destroy();
+    });
+  });
+  await new Promise<void>((r) => server.listen(PORT, "127.0.0.1", r));
+  const base = `http://127.0.0.1:${(server.address() as AddressInfo).port}`;
+  if (serve) {
+    console.log(`Serveur bouchon sur ${base} (Ctrl+C pour arrêter)`);
+    return;
+  }
+  parserChecks();
+  await streamChecks(base);
+  server.close();
+  if (failures) process.exitCode = 1;
+}
+
+main();
@@ -0,0 +1,180 @@
+/**
+ * Benchmark des rendus du parcours d'analyse : projet de 50 risques.
+ *
+ * Rejoue le parcours complet (création du projet, saisie de chaque risque,
+ * réponses au questionnaire, résultats, mesures et évaluations résiduelles)
+ * sur lib/analysisStore.ts et compte, pour chaque écran de la pile, le nombre
+ * de rendus déclenchés :
+ *   - ancien contexte : tout consommateur de useAnalysis() se re-rendait à
+ *     chaque modification de l'état (valeur du contexte recréée) ;
+ *   - store à sélecteurs : un rendu seulement quand la tranche lue change,
+ *     avec la même mémoïsation que useStore (createSelection).
+ * Les écrans d'une pile expo-router restent montés : ils sont tous comptés.
+ *
+ * Affiche aussi le coût d'une mise à jour de risque dans le store et vérifie
+ * le partage structurel et snapshot / restore.
+ *
+ * Usage: npx tsx scripts/bench-analysis-renders.ts [risques=50] [questions=12]
+ */
+
+import {
+  analysisActions,
+  analysisStore,
+  restoreAnalysis,
+  selectCurrentRisk,
+  selectRisks,
+  snapshotAnalysis,
+  type AnalysisStoreState,
+  type RiskInProgress,
+} from "../lib/analysisStore";
+import { createSelection, shallowEqual, type Equality } from "../lib/store";
+import type { QuestionnaireAnalyzeResponse } from "../lib/types";
+
+const RISKS = Number(process.argv[2] || 50);
+const QUESTIONS = Number(process.argv[3] || 12);
+
+// Index local (useState) du risque affiché par project-measures
+let measuresIndex = 0;
+
+type Consumer = { name: string; selector: (s: AnalysisStoreState) => unknown; isEqual?: Equality<any> };
+
+// Mêmes sélecteurs que les écrans (app/*.tsx)
+const screens: Consumer[] = [
+  {
+    name: "questionnaire",
+    selector: (s) => {
+      const risk = s.analysisTitle ? selectCurrentRisk(s) : undefined;
+      return { isProjectMode: !!s.analysisTitle, currentRiskIndex: s.currentRiskIndex, sector: s.sector, description: risk?.description, category: risk?.category, type: risk?.type };
+    },
+    isEqual: shallowEqual,
+  },
+  {
+    name: "result",
+    selector: (s) => ({ analysisTitle: s.analysisTitle, currentRiskIndex: s.currentRiskIndex, currentRiskDescription: selectCurrentRisk(s)?.description, currentRiskResult: selectCurrentRisk(s)?.userResult, userResult: s.userResult }),
+    isEqual: shallowEqual,
+  },
+  {
+    name: "risk",
+    selector: (s) => ({ analysisTitle: s.analysisTitle, currentRiskIndex: s.currentRiskIndex, riskCount: s.riskIds.length, description: s.description, category: s.category, type: s.type }),
+    isEqual: shallowEqual,
+  },
+  {
+    name: "project-risks-list",
+    selector: (s) => ({ analysisTitle: s.analysisTitle, riskIds: s.riskIds, allEvaluated: s.riskIds.every((id) => !!s.risksById[id].userResult) }),
+    isEqual: shallowEqual,
+  },
+  {
+    name: "project-measures",
+    selector: (s) => ({
+      analysisTitle: s.analysisTitle,
+      sector: s.sector,
+      riskCount: s.riskIds.length,
+      completedCount: s.riskIds.filter((id) => s.risksById[id].residualResult).length,
+      currentRisk: s.risksById[s.riskIds[measuresIndex]],
+    }),
+    isEqual: shallowEqual,
+  },
+];
+
+function fakeResult(i: number): QuestionnaireAnalyzeResponse {
+  const G = 1 + (i % 5), F = 1 + ((i * 2) % 5), P = 1 + ((i * 3) % 5);
+  return { id: `a${i}`, G, F, P, score: G * F * P, classification: "Modéré" } as QuestionnaireAnalyzeResponse;
+}
+
+/** Parcours complet ; `onUpdate` est appelé après chaque action. */
+function workflow(onUpdate: () => void) {
+  const act = (fn: () => void) => {
+    fn();
+    onUpdate();
+  };
+  act(() => analysisActions.resetProject());
+  act(() => analysisActions.setProjectInfo("project", "Benchmark", "Projet 50 risques", "Industrie"));
+  for (let i = 0; i < RISKS; i++) {
+    act(() => analysisActions.setCurrentRiskIndex(i));
+    const risk: RiskInProgress = { id: `risk_${i}`, description: `Risque ${i}`, category: "Industriel" as any, type: "Opérationnel" as any, answers: [] };
+    act(() => analysisActions.addRisk(risk));
+    for (let q = 0; q < QUESTIONS; q++) {
+      const current = selectCurrentRisk(analysisStore.getState())!;
+      const answers = [...current.answers.filter((a) => a.question_id !== `q${q}`), { question_id: `q${q}`, option_id: "o1" }];
+      act(() => analysisActions.updateRisk(i, { answers }));
+    }
+    act(() => analysisActions.updateRisk(i, { userResult: fakeResult(i) }));
+  }
+  for (let i = 0; i < RISKS; i++) {
+    measuresIndex = i;
+    act(() => analysisActions.updateRisk(i, { mitigation: `Mesure ${i}` }));
+    act(() => analysisActions.updateRisk(i, { residualResult: fakeResult(i + 1) }));
+  }
+}
+
+function renderCounts() {
+  const consumers: Consumer[] = [
+    ...screens,
+    // Lignes de project-risks-list : une par risque, abonnée à son seul risque
+    ...Array.from({ length: RISKS }, (_, i) => ({ name: "RiskRow", selector: (s: AnalysisStoreState) => s.risksById[`risk_${i}`] })),
+  ];
+  const legacy = new Map<string, number>();
+  const selective = new Map<string, number>();
+  const reads = consumers.map((c) => createSelection(analysisStore, c.selector, c.isEqual));
+  const last = reads.map((read) => read());
+  let lastState = analysisStore.getState();
+
+  workflow(() => {
+    const state = analysisStore.getState();
+    if (state === lastState) return;
+    lastState = state;
+    consumers.forEach((c, i) => {
+      legacy.set(c.name, (legacy.get(c.name) ?? 0) + 1);
+      const value = reads[i]();
+      if (value !== last[i]) {
+        last[i] = value;
+        selective.set(c.name, (selective.get(c.name) ?? 0) + 1);
+      }
+    });
+  });
+
+  console.log(`Rendus pour un projet de ${RISKS} risques × ${QUESTIONS} questions\n`);
+  console.log(["composant", "contexte", "sélecteurs"].map((h, i) => (i ? h.padStart(12) : h.padEnd(24))).join(""));
+  let totalLegacy = 0, totalSelective = 0;
+  for (const name of Array.from(legacy.keys())) {
+    const l = legacy.get(name) ?? 0, s = selective.get(name) ?? 0;
+    totalLegacy += l;
+    totalSelective += s;
+    console.log([name.padEnd(24), String(l).padStart(12), String(s).padStart(12)].join(""));
+  }
+  console.log(["total".padEnd(24), String(totalLegacy).padStart(12), String(totalSelective).padStart(12)].join(""));
+}
+
+// Meilleur de plusieurs passes : la première paie la compilation JIT
+function best(run: () => void, passes = 5): number {
+  let min = Infinity;
+  for (let p = 0; p < passes; p++) {
+    const t0 = performance.now();
+    run();
+    min = Math.min(min, performance.now() - t0);
+  }
+  return min;
+}
+
+function updateCost() {
+  const N = 10_000;
+  const risks = selectRisks(analysisStore.getState());
+  const tStore = best(() => {
+    for (let k = 0; k < N; k++) analysisActions.updateRisk(k % risks.length, { mitigation: `m${k}` });
+  });
+
+  const s = analysisStore.getState();
+  const before = snapshotAnalysis();
+  analysisActions.updateRisk(0, { mitigation: "modifiée" });
+  const untouched = s.riskIds.slice(1).every((id) => analysisStore.getState().risksById[id] === before.risksById[id]);
+  restoreAnalysis(before);
+  const restored = analysisStore.getState() === before;
+
+  console.log(`\nMise à jour d'un risque : ${((tStore / N) * 1000).toFixed(1)} µs (${N} mises à jour en ${tStore.toFixed(1)} ms)`);
+  console.log(`Partage structurel (autres risques inchangés) : ${untouched ? "OK" : "ÉCHEC"}`);
+  console.log(`Snapshot / restore : ${restored ? "OK" : "ÉCHEC"}`);
+  if (!untouched || !restored) process.exitCode = 1;
+}
+
+renderCounts();
+updateCost();
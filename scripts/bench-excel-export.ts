@@ -0,0 +1,152 @@
+/**
+ * Benchmark de l'export Excel : temps et pic mémoire pour 10, 1 000 et
+ * 10 000 risques.
+ *
+ * Compare le moteur en flux (lib/xlsxStream.ts + lib/excelSheets.ts, écrit
+ * directement dans un fichier) à l'ancienne chaîne ExcelJS (classeur complet
+ * en mémoire, writeBuffer puis conversion base64 pour expo-file-system).
+ * ExcelJS n'est plus une dépendance du projet : la colonne de comparaison
+ * n'est remplie que s'il est installé à part (npm i --no-save exceljs).
+ *
+ * Usage: node --expose-gc node_modules/.bin/tsx scripts/bench-excel-export.ts
+ */
+
+import { closeSync, openSync, unlinkSync, writeSync } from "fs";
+import { tmpdir } from "os";
+import { join } from "path";
+import { writeXlsx } from "../lib/xlsxStream";
+import { portfolioSheets, projectSheets } from "../lib/excelSheets";
+import type { AnalysisProject, RiskItem } from "../lib/types";
+
+const RISK_COUNTS = [10, 1_000, 10_000];
+const RISKS_PER_PROJECT = 25;
+
+const dim = (i: number, k: number) => 1 + ((i * k) % 5);
+
+function makeRisk(i: number): RiskItem {
+  const G = dim(i, 3), F = dim(i, 7), P = dim(i, 11);
+  return {
+    id: `risk_${i}`,
+    description: `Risque ${i} : défaillance du processus de sauvegarde des données clients & fournisseurs`,
+    category: "Industriel" as any,
+    type: "Opérationnel" as any,
+    initial_evaluation: { G, F, P, score: G * F * P, level: "Moyen" },
+    mitigation_measure: i % 2 ? "Sauvegarde automatique quotidienne avec réplication hors site" : "",
+    residual_evaluation: i % 2 ? { G: 1, F, P, score: F * P, level: "Faible" } : null,
+    created_at: new Date().toISOString(),
+  };
+}
+
+function makeProject(id: number, risks: RiskItem[]): AnalysisProject {
+  const now = new Date().toISOString();
+  return {
+    id: `project_${id}`,
+    project_type: "project",
+    project_description: "Benchmark",
+    analysis_title: `Projet ${id}`,
+    sector: "Industrie",
+    risks,
+    user_uid: "bench",
+    created_at: now,
+    updated_at: now,
+    status: "draft",
+  };
+}
+
+// Projets générés à la demande : le portefeuille n'existe jamais en entier
+function* portfolio(riskCount: number): Generator<AnalysisProject> {
+  for (let start = 0, p = 0; start < riskCount; start += RISKS_PER_PROJECT, p++) {
+    const n = Math.min(RISKS_PER_PROJECT, riskCount - start);
+    yield makeProject(p, Array.from({ length: n }, (_, k) => makeRisk(start + k)));
+  }
+}
+
+const gc = (globalThis as any).gc as (() => void) | undefined;
+
+/** Temps et pic de mémoire (tas JS + ArrayBuffers) au-dessus de la base. */
+async function measure(run: (sample: () => void) => Promise<number>) {
+  gc?.();
+  const used = () => {
+    const m = process.memoryUsage();
+    return m.heapUsed + m.arrayBuffers;
+  };
+  const base = used();
+  let peak = base;
+  const sample = () => {
+    peak = Math.max(peak, used());
+  };
+  const timer = setInterval(sample, 5);
+  const t0 = performance.now();
+  const bytes = await run(sample);
+  const ms = performance.now() - t0;
+  clearInterval(timer);
+  sample();
+  return { ms: Math.round(ms), peakMb: ((peak - base) / 1024 / 1024).toFixed(1), kb: Math.round(bytes / 1024) };
+}
+
+async function streaming(riskCount: number, sample: () => void): Promise<number> {
+  const path = join(tmpdir(), `bench_${riskCount}.xlsx`);
+  const fd = openSync(path, "w");
+  try {
+    const sheets = riskCount <= RISKS_PER_PROJECT
+      ? projectSheets(portfolio(riskCount).next().value as AnalysisProject)
+      : portfolioSheets(portfolio(riskCount));
+    const { bytes } = await writeXlsx(
+      { write: (chunk) => { writeSync(fd, chunk); sample(); } },
+      sheets,
+      { pause: () => new Promise((r) => setImmediate(r)) },
+    );
+    return bytes;
+  } finally {
+    closeSync(fd);
+    unlinkSync(path);
+  }
+}
+
+// Ancienne chaîne : lib/excelExportAdvanced.ts avant le moteur en flux
+async function legacyExcelJS(riskCount: number, sample: () => void): Promise<number> {
+  const ExcelJS = (await import("exceljs")).default;
+  const wb = new ExcelJS.Workbook();
+  const ws = wb.addWorksheet("Rapport");
+  for (const project of portfolio(riskCount)) {
+    project.risks.forEach((r, i) => {
+      ws.addRow([
+        i + 1, r.category, r.type, r.description,
+        r.initial_evaluation.G, r.initial_evaluation.F, r.initial_evaluation.P, Math.round((r.initial_evaluation.score / 125) * 100),
+        r.mitigation_measure || "",
+        r.residual_evaluation?.G || "", r.residual_evaluation?.F || "", r.residual_evaluation?.P || "",
+        r.residual_evaluation ? Math.round((r.residual_evaluation.score / 125) * 100) : "",
+      ]);
+    });
+  }
+  sample();
+  const buffer = (await wb.xlsx.writeBuffer()) as ArrayBuffer;
+  sample();
+  const bytes = new Uint8Array(buffer);
+  let binary = "";
+  for (let i = 0; i < bytes.length; i += 0x8000) {
+    binary += String.fromCharCode.apply(null, Array.from(bytes.subarray(i, i + 0x8000)) as any);
+  }
+  sample();
+  const base64 = Buffer.from(binary, "binary").toString("base64");
+  sample();
+  return base64.length;
+}
+
+async function main() {
+  if (!gc) console.log("(lancer avec --expose-gc pour des mesures mémoire plus stables)\n");
+  let hasExcelJS = true;
+  try {
+    await import("exceljs");
+  } catch {
+    hasExcelJS = false;
+  }
+  console.log(["risques", "flux ms", "flux Mo", "flux Ko", "ExcelJS ms", "ExcelJS Mo"].map((h) => h.padStart(12)).join(""));
+  for (const n of RISK_COUNTS) {
+    const s = await measure((sample) => streaming(n, sample));
+    const l = hasExcelJS ? await measure((sample) => legacyExcelJS(n, sample)) : null;
+    console.log([n, s.ms, s.peakMb, s.kb, l?.ms ?? "-", l?.peakMb ?? "-"].map((v) => String(v).padStart(12)).join(""));
+  }
+}
+
+main();
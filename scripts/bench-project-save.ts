@@ -0,0 +1,76 @@
+/**
+ * Benchmark de la sauvegarde d'un projet : latence en fonction du nombre de risques.
+ *
+ * Compare l'ancienne boucle séquentielle et le pipeline à concurrence bornée
+ * (lib/bulkSave.ts), sur un réseau simulé. L'appel groupé /projects/bulk
+ * (saveProjectBulk) n'est pas mesuré : lib/api.ts dépend de React Native et
+ * ne se charge pas sous Node.
+ *
+ * Usage: npx tsx scripts/bench-project-save.ts [rtt_ms=150]
+ */
+
+import { runSavePipeline, newIdempotencyKey, type SaveOperations } from "../lib/bulkSave";
+import type { BulkSaveProjectRequest } from "../lib/types";
+
+const RTT = Number(process.argv[2] || 150);
+const RISK_COUNTS = [4, 10, 20, 50, 100];
+
+const sleep = (ms: number) => new Promise((r) => setTimeout(r, ms));
+// Gigue de ±20% autour du RTT pour ne pas favoriser un scénario parfait
+const roundTrip = () => sleep(RTT * (0.8 + Math.random() * 0.4));
+
+function makeRequest(riskCount: number): BulkSaveProjectRequest {
+  return {
+    project: {
+      project_type: "project",
+      project_description: "Benchmark",
+      analysis_title: `Bench ${riskCount}`,
+    },
+    risks: Array.from({ length: riskCount }, (_, i) => ({
+      client_id: `risk_${i}`,
+      description: `Risque ${i}`,
+      category: "Industriel" as const,
+      type: "Technique" as const,
+      G: 3, F: 3, P: 3,
+      mitigation_measure: "Mesure de réduction",
+      residual_G: 2, residual_F: 2, residual_P: 2,
+    })),
+  };
+}
+
+let seq = 0;
+const simulatedOps: SaveOperations = {
+  createProject: async (data) => {
+    await roundTrip();
+    return { id: `p_${++seq}`, ...data } as any;
+  },
+  addRisk: async (data) => {
+    await roundTrip();
+    return { id: `r_${++seq}`, ...data } as any;
+  },
+  updateMitigation: async (data) => {
+    await roundTrip();
+    return { id: data.risk_id } as any;
+  },
+};
+
+async function time(fn: () => Promise<unknown>): Promise<number> {
+  const t0 = performance.now();
+  await fn();
+  return Math.round(performance.now() - t0);
+}
+
+async function main() {
+  console.log(`RTT simulé: ${RTT} ms\n`);
+  console.log(["risques", "séquentiel", "pipeline x4", "pipeline x8"].map((h) => h.padStart(12)).join(""));
+  for (const n of RISK_COUNTS) {
+    const req = makeRequest(n);
+    const fresh = () => ({ riskIds: {}, mitigated: {} });
+    const sequential = await time(() => runSavePipeline(req, simulatedOps, newIdempotencyKey(), fresh(), { concurrency: 1 }));
+    const x4 = await time(() => runSavePipeline(req, simulatedOps, newIdempotencyKey(), fresh(), { concurrency: 4 }));
+    const x8 = await time(() => runSavePipeline(req, simulatedOps, newIdempotencyKey(), fresh(), { concurrency: 8 }));
+    console.log([n, sequential, x4, x8].map((v) => String(v).padStart(12)).join(""));
+  }
+}
+
+main();
@@ -0,0 +1,285 @@
+/**
+ * Budget de démarrage : imports lourds, taille du bundle et démarrage à froid.
+ *
+ * 1. Parcourt le graphe des imports statiques depuis les modules évalués au
+ *    lancement (layouts et écrans index de app/) et signale chaque module lourd
+ *    (exceljs, xlsx, firebase…) importé de façon eager, avec la chaîne
+ *    d'imports qui l'amène : il doit passer en import() dynamique. Les mêmes
+ *    imports depuis un autre écran sont signalés comme avertissements.
+ * 2. Mesure le bundle JS d'un export Expo (dist/ par défaut, ou un export
+ *    lancé par le script avec --export).
+ * 3. Mesure le démarrage à froid : `am start -W` sur un appareil Android
+ *    (--android), et/ou le rapport JSON exporté depuis l'overlay de debug
+ *    (--telemetry) pour le chargement du JS et le premier écran interactif.
+ *
+ * Les résultats sont écrits dans --out ; une mesure plus de 10 % au-dessus du
+ * rapport précédent, ou un import lourd au démarrage, fait échouer le script.
+ *
+ * Usage: npx tsx scripts/bench-startup.ts [--export] [--platform android|ios|web]
+ *          [--dist dist] [--android] [--runs 5] [--telemetry fichier.json]
+ *          [--out startup-report.json]
+ */
+
+import { execFileSync } from "child_process";
+import { existsSync, mkdtempSync, readFileSync, readdirSync, rmSync, statSync, writeFileSync } from "fs";
+import { tmpdir } from "os";
+import { dirname, join, relative, resolve } from "path";
+
+// Lancé depuis la racine du projet (npx tsx scripts/…)
+const ROOT = process.cwd();
+const APP_DIR = join(ROOT, "app");
+
+function arg(name: string, fallback?: string): string | undefined {
+  const i = process.argv.indexOf(`--${name}`);
+  if (i < 0) return fallback;
+  const value = process.argv[i + 1];
+  return value && !value.startsWith("--") ? value : "true";
+}
+
+const PLATFORM = arg("platform", "android")!;
+const OUT = resolve(ROOT, arg("out", "startup-report.json")!);
+const RUNS = Number(arg("runs", "5"));
+// Tolérance avant de considérer une mesure comme une régression
+const REGRESSION = 0.1;
+
+// Paquets dont l'évaluation coûte cher au lancement
+const HEAVY = [/^exceljs$/, /^xlsx(\/|$)/, /^firebase(\/|$)/, /^@react-native-firebase\//, /^file-saver$/, /^jszip$/];
+const isHeavy = (spec: string) => HEAVY.some((re) => re.test(spec));
+
+// ---------------------------------------------------------------------------
+// 1. Graphe des imports
+
+type ModuleInfo = {
+  /** Imports statiques (évalués avec le module). */
+  eager: string[];
+  /** import() et require() : évalués au premier appel. */
+  lazy: string[];
+};
+
+const EXTENSIONS = [".tsx", ".ts", ".jsx", ".js"];
+const graph = new Map<string, ModuleInfo>();
+
+function stripComments(source: string): string {
+  return source.replace(/\/\*[\s\S]*?\*\//g, "").replace(/(^|[^:"'`])\/\/.*$/gm, "$1");
+}
+
+function parseImports(source: string): ModuleInfo {
+  const code = stripComments(source);
+  const eager: string[] = [];
+  const lazy: string[] = [];
+  // import x from "y", import { a } from "y", export { a } from "y", import "y" (pas `import type`)
+  const staticRe = /^\s*(?:import|export)\s+(?!type\s)(?:[\s\S]*?\sfrom\s+)?["']([^"']+)["']/gm;
+  for (const m of Array.from(code.matchAll(staticRe))) eager.push(m[1]);
+  for (const m of Array.from(code.matchAll(/\b(?:import|require)\(\s*["']([^"']+)["']\s*\)/g))) lazy.push(m[1]);
+  return { eager, lazy };
+}
+
+function resolveLocal(from: string, spec: string): string | null {
+  let base: string;
+  if (spec.startsWith("@/")) base = join(ROOT, spec.slice(2));
+  else if (spec.startsWith(".")) base = resolve(dirname(from), spec);
+  else return null;
+  for (const candidate of [base, ...EXTENSIONS.map((e) => base + e), ...EXTENSIONS.map((e) => join(base, "index" + e))]) {
+    if (existsSync(candidate) && statSync(candidate).isFile()) return candidate;
+  }
+  return null;
+}
+
+function moduleInfo(file: string): ModuleInfo {
+  let info = graph.get(file);
+  if (!info) {
+    info = parseImports(readFileSync(file, "utf8"));
+    graph.set(file, info);
+  }
+  return info;
+}
+
+type Finding = { spec: string; chain: string[] };
+
+/** Paquets lourds atteints par des imports statiques depuis `entries`. */
+function eagerHeavyImports(entries: string[]): { findings: Finding[]; modules: Set<string> } {
+  const findings: Finding[] = [];
+  const seen = new Set<string>();
+  const reported = new Set<string>();
+  const queue: { file: string; chain: string[] }[] = entries.map((file) => ({ file, chain: [file] }));
+  while (queue.length) {
+    const { file, chain } = queue.shift()!;
+    if (seen.has(file)) continue;
+    seen.add(file);
+    for (const spec of moduleInfo(file).eager) {
+      const local = resolveLocal(file, spec);
+      if (local) {
+        queue.push({ file: local, chain: [...chain, local] });
+      } else if (isHeavy(spec) && !reported.has(spec)) {
+        reported.add(spec);
+        findings.push({ spec, chain });
+      }
+    }
+  }
+  return { findings, modules: seen };
+}
+
+function listFiles(dir: string, filter: (f: string) => boolean): string[] {
+  if (!existsSync(dir)) return [];
+  return readdirSync(dir, { withFileTypes: true }).flatMap((d) => {
+    const p = join(dir, d.name);
+    return d.isDirectory() ? listFiles(p, filter) : filter(p) ? [p] : [];
+  });
+}
+
+const rel = (f: string) => relative(ROOT, f);
+const showChain = (f: Finding) => [...f.chain.map(rel), f.spec].join(" → ");
+
+function checkImports() {
+  const routes = listFiles(APP_DIR, (f) => EXTENSIONS.some((e) => f.endsWith(e)));
+  // expo-router évalue les layouts et l'écran initial au lancement, les autres écrans à la navigation
+  const startupEntries = routes.filter((f) => /(^|\/)(_layout|index)\.[jt]sx?$/.test(f));
+  const startup = eagerHeavyImports(startupEntries);
+
+  console.log(`Modules évalués au lancement : ${startup.modules.size} (${startupEntries.map(rel).join(", ")})`);
+  if (startup.findings.length) {
+    console.log("\n✗ Imports lourds chargés au démarrage (à passer en import() dynamique) :");
+    startup.findings.forEach((f) => console.log(`  ${f.spec}\n    ${showChain(f)}`));
+  } else {
+    console.log("✓ Aucun module lourd importé au démarrage");
+  }
+
+  const onNavigation: Finding[] = [];
+  for (const route of routes.filter((f) => !startupEntries.includes(f))) {
+    for (const f of eagerHeavyImports([route]).findings) {
+      if (!startup.findings.some((s) => s.spec === f.spec)) onNavigation.push(f);
+    }
+  }
+  if (onNavigation.length) {
+    console.log("\n! Imports lourds évalués à l'ouverture d'un écran :");
+    onNavigation.forEach((f) => console.log(`  ${f.spec}\n    ${showChain(f)}`));
+  }
+
+  // Dépendances lourdes déclarées mais jamais importées
+  const pkg = JSON.parse(readFileSync(join(ROOT, "package.json"), "utf8"));
+  const used = new Set(Array.from(graph.values()).flatMap((m) => [...m.eager, ...m.lazy]));
+  listFiles(join(ROOT, "lib"), (f) => EXTENSIONS.some((e) => f.endsWith(e))).forEach((f) => {
+    const info = moduleInfo(f);
+    [...info.eager, ...info.lazy].forEach((s) => used.add(s));
+  });
+  const unused = Object.keys(pkg.dependencies ?? {}).filter(
+    (dep) => isHeavy(dep) && !Array.from(used).some((s) => s === dep || s.startsWith(dep + "/"))
+  );
+  if (unused.length) console.log(`\n! Dépendances lourdes jamais importées : ${unused.join(", ")}`);
+
+  return startup.findings.map((f) => ({ module: f.spec, chain: f.chain.map(rel) }));
+}
+
+// ---------------------------------------------------------------------------
+// 2. Taille du bundle
+
+function bundleSize() {
+  let dist = resolve(ROOT, arg("dist", "dist")!);
+  let exportDir: string | null = null;
+  if (arg("export")) {
+    exportDir = mkdtempSync(join(tmpdir(), "safeqore-export-"));
+    dist = exportDir;
+    console.log(`\nExport ${PLATFORM} en cours…`);
+    const t0 = Date.now();
+    execFileSync("npx", ["expo", "export", "--platform", PLATFORM, "--output-dir", dist], { cwd: ROOT, stdio: "inherit" });
+    console.log(`Export terminé en ${((Date.now() - t0) / 1000).toFixed(1)} s`);
+  }
+  const files = listFiles(dist, (f) => /\.(js|hbc)$/.test(f));
+  if (!files.length) {
+    console.log(`\nTaille du bundle : aucun bundle dans ${rel(dist)} (lancer avec --export ou \`npx expo export\`)`);
+    return null;
+  }
+  const sized = files.map((f) => ({ file: relative(dist, f), bytes: statSync(f).size })).sort((a, b) => b.bytes - a.bytes);
+  const total = sized.reduce((sum, f) => sum + f.bytes, 0);
+  console.log(`\nTaille du bundle : ${(total / 1024).toFixed(0)} ko (${sized.length} fichier(s))`);
+  sized.slice(0, 5).forEach((f) => console.log(`  ${(f.bytes / 1024).toFixed(0).padStart(8)} ko  ${f.file}`));
+  if (exportDir) rmSync(exportDir, { recursive: true, force: true });
+  return { totalBytes: total, largest: sized.slice(0, 5) };
+}
+
+// ---------------------------------------------------------------------------
+// 3. Démarrage à froid
+
+const median = (values: number[]) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)];
+};
+
+function androidColdStart() {
+  if (!arg("android")) return null;
+  const appJson = JSON.parse(readFileSync(join(ROOT, "app.json"), "utf8"));
+  const pkg: string = appJson.expo.android.package;
+  const adb = (...args: string[]) => execFileSync("adb", ["shell", ...args], { encoding: "utf8" });
+  const samples: number[] = [];
+  for (let i = 0; i < RUNS; i++) {
+    adb("am", "force-stop", pkg);
+    const out = adb("am", "start", "-W", "-n", `${pkg}/.MainActivity`);
+    const total = /TotalTime:\s*(\d+)/.exec(out);
+    if (total) samples.push(Number(total[1]));
+  }
+  if (!samples.length) {
+    console.log("\nDémarrage à froid : `am start -W` n'a renvoyé aucune mesure");
+    return null;
+  }
+  console.log(`\nDémarrage à froid (${pkg}, ${samples.length} lancements) : médiane ${median(samples)} ms [${samples.join(", ")}]`);
+  return { medianMs: median(samples), samples };
+}
+
+function telemetryStartup() {
+  const file = arg("telemetry");
+  if (!file) return null;
+  const report = JSON.parse(readFileSync(resolve(file), "utf8"));
+  const { jsStartMs, firstScreen } = report.startup ?? {};
+  console.log(
+    `\nTélémétrie : JS chargé à ${jsStartMs} ms` +
+      (firstScreen ? `, ${firstScreen.route} interactif à ${firstScreen.ms} ms` : ", aucun écran interactif mesuré")
+  );
+  return { jsStartMs: jsStartMs as number, firstScreenMs: (firstScreen?.ms ?? null) as number | null };
+}
+
+// ---------------------------------------------------------------------------
+
+type Report = {
+  recordedAt: string;
+  platform: string;
+  eagerHeavyImports: { module: string; chain: string[] }[];
+  bundle: ReturnType<typeof bundleSize>;
+  coldStart: ReturnType<typeof androidColdStart>;
+  telemetry: ReturnType<typeof telemetryStartup>;
+};
+
+function compare(label: string, current: number | null | undefined, previous: number | null | undefined, unit: string): boolean {
+  if (current == null || previous == null || !previous) return true;
+  const delta = (current - previous) / previous;
+  const ok = delta <= REGRESSION;
+  console.log(`  ${ok ? "✓" : "✗"} ${label} : ${previous} → ${current} ${unit} (${delta >= 0 ? "+" : ""}${(delta * 100).toFixed(1)} %)`);
+  return ok;
+}
+
+function main() {
+  const report: Report = {
+    recordedAt: new Date().toISOString(),
+    platform: PLATFORM,
+    eagerHeavyImports: checkImports(),
+    bundle: bundleSize(),
+    coldStart: androidColdStart(),
+    telemetry: telemetryStartup(),
+  };
+
+  let ok = report.eagerHeavyImports.length === 0;
+  if (existsSync(OUT)) {
+    const previous: Report = JSON.parse(readFileSync(OUT, "utf8"));
+    if (previous.platform === report.platform) {
+      console.log(`\nComparaison avec ${rel(OUT)} (${previous.recordedAt}) :`);
+      ok = compare("bundle", report.bundle && Math.round(report.bundle.totalBytes / 1024), previous.bundle && Math.round(previous.bundle.totalBytes / 1024), "ko") && ok;
+      ok = compare("démarrage à froid", report.coldStart?.medianMs, previous.coldStart?.medianMs, "ms") && ok;
+      ok = compare("premier écran interactif", report.telemetry?.firstScreenMs, previous.telemetry?.firstScreenMs, "ms") && ok;
+    }
+  }
+
+  writeFileSync(OUT, JSON.stringify(report, null, 2));
+  console.log(`\nRapport écrit dans ${rel(OUT)}`);
+  if (!ok) process.exitCode = 1;
+}
+
+main();
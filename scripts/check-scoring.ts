@@ -0,0 +1,90 @@
+/**
+ * Contrôle du moteur de scoring local (lib/scoring.ts).
+ *
+ * 1. Benchmark : score de N risques via scoreBatch (tables 5×5×5) comparé au
+ *    calcul ad hoc historique (to100(G*F*P) + seuils codés en dur).
+ * 2. Cohérence : si API_BASE_URL et ID_TOKEN sont fournis, envoie des jeux de
+ *    réponses aléatoires à /questionnaire/analyze et compare au score local.
+ *    Le serveur fait foi ; tout écart est listé.
+ *
+ * Usage: [API_BASE_URL=… ID_TOKEN=… SECTOR=…] npx tsx scripts/check-scoring.ts [samples=20]
+ */
+
+import { checkConsistency, scoreAnswers, scoreBatch, thresholdsFrom } from "../lib/scoring";
+import type { AnswerItem, ConstantsResponse, Question, QuestionnaireAnalyzeResponse } from "../lib/types";
+
+const SAMPLES = Number(process.argv[2] || 20);
+const RISK_COUNTS = [100, 10_000, 1_000_000];
+
+const randomDim = () => 1 + Math.floor(Math.random() * 5);
+
+function adHoc(G: number, F: number, P: number) {
+  const score100 = Math.round(((G * F * P) / 125) * 100);
+  return { score100, classification: score100 <= 20 ? "Faible" : score100 <= 40 ? "Modéré" : "Élevé" };
+}
+
+function bench() {
+  console.log(["risques", "ad hoc (ms)", "scoreBatch (ms)"].map((h) => h.padStart(16)).join(""));
+  for (const n of RISK_COUNTS) {
+    const risks = Array.from({ length: n }, () => ({ G: randomDim(), F: randomDim(), P: randomDim() }));
+    let t0 = performance.now();
+    const naive = risks.map((r) => adHoc(r.G, r.F, r.P));
+    const tNaive = performance.now() - t0;
+    t0 = performance.now();
+    const batch = scoreBatch(risks);
+    const tBatch = performance.now() - t0;
+    // Les deux calculs doivent donner exactement les mêmes scores
+    const diff = naive.findIndex((r, i) => r.score100 !== batch.score100[i]);
+    if (diff !== -1) throw new Error(`Écart au risque ${diff}`);
+    console.log([n, tNaive.toFixed(1), tBatch.toFixed(1)].map((v) => String(v).padStart(16)).join(""));
+  }
+}
+
+async function api<T>(path: string, init?: RequestInit): Promise<T> {
+  const res = await fetch(`${process.env.API_BASE_URL}${path}`, {
+    ...init,
+    headers: { "Content-Type": "application/json", Authorization: `Bearer ${process.env.ID_TOKEN}`, ...(init?.headers || {}) },
+  });
+  if (!res.ok) throw new Error(`${res.status} ${res.statusText}: ${await res.text()}`);
+  return res.json();
+}
+
+async function consistency() {
+  if (!process.env.API_BASE_URL || !process.env.ID_TOKEN) {
+    console.log("\nCohérence serveur ignorée (API_BASE_URL / ID_TOKEN absents)");
+    return;
+  }
+  const sector = process.env.SECTOR || "";
+  const constants = await api<ConstantsResponse>("/constants");
+  const thresholds = thresholdsFrom(constants);
+  const { questions } = await api<{ questions: Question[] }>(
+    `/questionnaire/questions${sector ? `?sector=${encodeURIComponent(sector)}` : ""}`
+  );
+  let mismatched = 0;
+  for (let i = 0; i < SAMPLES; i++) {
+    const answers: AnswerItem[] = questions.map((q) => ({
+      question_id: q.id,
+      option_id: q.reponses_possibles[Math.floor(Math.random() * q.reponses_possibles.length)].id,
+    }));
+    const server = await api<QuestionnaireAnalyzeResponse>("/questionnaire/analyze", {
+      method: "POST",
+      body: JSON.stringify({
+        description: `Contrôle scoring ${i}`,
+        category: constants.categories[0],
+        type: constants.types[0],
+        sector: sector || undefined,
+        answers,
+      }),
+    });
+    if (checkConsistency(scoreAnswers(questions, answers, thresholds), server, `sample ${i}`).length) mismatched++;
+  }
+  console.log(`\nCohérence serveur : ${SAMPLES - mismatched}/${SAMPLES} identiques (seuils ${thresholds.faible}/${thresholds.modere})`);
+  if (mismatched) process.exitCode = 1;
+}
+
+async function main() {
+  bench();
+  await consistency();
+}
+
+main();